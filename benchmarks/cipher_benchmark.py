@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Замер производительности системы шифрования THE-VOIDER-DOS
+
+Для каждого включенного шифра измеряются шифрование и дешифрование на
+текстах разного размера (от имени директории до содержимого файла) и
+алфавита (ASCII, кириллица), а также brute_force_caesar и
+get_random_cipher. Результат выводится в JSON: операций в секунду и
+МБ/с по размеру открытого текста в UTF-8.
+
+Замеряется сам движок шифров (без LRU-кэша CipherSystem), иначе
+повторные вызовы с одинаковыми аргументами измеряли бы только кэш.
+
+Запуск:
+    python benchmarks/cipher_benchmark.py
+    python benchmarks/cipher_benchmark.py --sizes 8 1024 --min-time 0.1 -o bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+# Добавляем путь для импорта пакета из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from voider_dos.core import cipher_registry
+from voider_dos.core.cipher_system import CipherSystem
+
+# Размеры открытого текста в байтах UTF-8: имя директории ... содержимое файла
+DEFAULT_SIZES = [8, 64, 1024, 64 * 1024, 1024 * 1024]
+
+ALPHABETS = {
+    'ascii': "The Voider DOS 0123456789 System_Config DATA_V3 ",
+    'cyrillic': "Пустота поглощает всё Система Конфигурация ",
+}
+
+# Фиксированный сдвиг для Caesar, чтобы замеры были сравнимы
+CAESAR_SHIFT = 7
+
+# Фиксированные ключи шифров с ключом (остальным - один случайный ключ на замер)
+CIPHER_KEYS = {
+    'caesar': CAESAR_SHIFT,
+    'vigenere': 'VOID',
+    'xor': 'K3Y',
+}
+
+
+def make_text(alphabet: str, size: int) -> str:
+    """
+    Построить текст заданного размера в байтах UTF-8 (обрезается по границе символа)
+
+    Args:
+        alphabet: Повторяемый фрагмент текста
+        size: Размер в байтах
+
+    Returns:
+        Текст, занимающий не больше size байтов
+    """
+    chunk = alphabet.encode('utf-8')
+    raw = (chunk * (size // len(chunk) + 1))[:size]
+    return raw.decode('utf-8', errors='ignore')
+
+
+def measure(func: Callable[[], Any], min_time: float) -> Dict[str, float]:
+    """
+    Замерить функцию: количество повторов растет, пока замер не займет min_time
+
+    Args:
+        func: Замеряемая функция без аргументов
+        min_time: Минимальное время замера в секундах
+
+    Returns:
+        Словарь с количеством вызовов, общим временем и операциями в секунду
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+
+        if elapsed >= min_time:
+            return {
+                'loops': loops,
+                'seconds': round(elapsed, 6),
+                'ops_per_sec': round(loops / elapsed, 2),
+            }
+        # Оцениваем, сколько повторов нужно до min_time (с запасом)
+        loops = max(loops * 2, int(loops * min_time * 1.2 / max(elapsed, 1e-9)))
+
+
+def bench_ciphers(sizes: List[int], min_time: float) -> List[Dict[str, Any]]:
+    """Замер шифрования и дешифрования для всех шифров, размеров и алфавитов"""
+    results = []
+
+    for cipher in cipher_registry.enabled_ciphers():
+        key = CIPHER_KEYS.get(cipher.name, cipher.random_key()) if cipher.keyed else None
+
+        for alphabet_name, alphabet in ALPHABETS.items():
+            for size in sizes:
+                text = make_text(alphabet, size)
+                nbytes = len(text.encode('utf-8'))
+                encrypted = cipher.encode(text, key)
+
+                for operation, func in (('encrypt', lambda: cipher.encode(text, key)),
+                                        ('decrypt', lambda: cipher.decode(encrypted, key))):
+                    stats = measure(func, min_time)
+                    stats.update({
+                        'cipher': cipher.name,
+                        'operation': operation,
+                        'alphabet': alphabet_name,
+                        'size': nbytes,
+                        'mb_per_sec': round(stats['ops_per_sec'] * nbytes / (1024 * 1024), 3),
+                    })
+                    results.append(stats)
+                    print(f"  {cipher.name:<7} {operation:<8} {alphabet_name:<9} {nbytes:>8} B "
+                          f"{stats['ops_per_sec']:>14.1f} оп/с {stats['mb_per_sec']:>10.3f} МБ/с",
+                          file=sys.stderr)
+
+    return results
+
+
+def bench_helpers(min_time: float) -> List[Dict[str, Any]]:
+    """Замер вспомогательных функций CipherSystem"""
+    results = []
+    name = make_text(ALPHABETS['ascii'], 16)
+    encrypted = cipher_registry.get_cipher('caesar').encode(name, CAESAR_SHIFT)
+
+    def brute_force():
+        # Кэш очищается, чтобы замерять перебор, а не повторные попадания
+        CipherSystem.clear_cache()
+        CipherSystem.brute_force_caesar(encrypted)
+
+    for operation, func in (('brute_force_caesar', brute_force),
+                            ('get_random_cipher', CipherSystem.get_random_cipher)):
+        stats = measure(func, min_time)
+        stats['operation'] = operation
+        results.append(stats)
+        print(f"  {operation:<26} {stats['ops_per_sec']:>14.1f} оп/с", file=sys.stderr)
+
+    return results
+
+
+def main() -> None:
+    """Точка входа: замеры и вывод JSON"""
+    parser = argparse.ArgumentParser(description="Замер производительности шифров THE-VOIDER-DOS")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Размеры открытого текста в байтах")
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="Минимальное время одного замера в секундах")
+    parser.add_argument('-o', '--output', help="Файл для JSON (по умолчанию - stdout)")
+    args = parser.parse_args()
+
+    print("Замер шифров...", file=sys.stderr)
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'min_time': args.min_time,
+        'ciphers': bench_ciphers(args.sizes, args.min_time),
+        'helpers': bench_helpers(args.min_time),
+    }
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"Результаты сохранены в {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
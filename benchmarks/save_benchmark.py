@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Замер производительности сохранений THE-VOIDER-DOS
+
+Сравниваются двоичный формат (core.save_format) и JSON в том виде, в
+каком его писали старые версии (indent=2, ensure_ascii=False), на
+сохранениях с историей разной длины: упаковка, распаковка, размер и
+чтение общего счета для меню (только заголовок против разбора всего
+JSON). Результат выводится в JSON.
+
+Запуск:
+    python benchmarks/save_benchmark.py
+    python benchmarks/save_benchmark.py --history 10 10000 --min-time 0.1 -o bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+# Добавляем путь для импорта пакета из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from voider_dos.core import save_format
+from cipher_benchmark import measure
+
+# Количество записей в истории сессий
+DEFAULT_HISTORY = [0, 100, 1000, 10000, 100000]
+
+
+def make_save(history_length: int) -> Dict[str, Any]:
+    """
+    Построить данные сохранения с историей заданной длины
+
+    Args:
+        history_length: Количество сессий в истории
+
+    Returns:
+        Словарь снимка
+    """
+    rng = random.Random(history_length)
+    history = [{
+        'seed': rng.randint(0, 2 ** 31),
+        'started': 1700000000.0 + index * 600,
+        'minutes': rng.random() * 30,
+        'score': rng.randint(0, 2000),
+        'decrypted': rng.randint(0, 20),
+        'files': rng.randint(0, 50),
+        'commands': rng.randint(0, 300),
+    } for index in range(history_length)]
+
+    return {
+        'total_score': sum(record['score'] for record in history),
+        'score': sum(record['score'] for record in history),
+        'sessions_played': history_length,
+        'play_time': sum(record['minutes'] for record in history),
+        'directories_decrypted': sum(record['decrypted'] for record in history),
+        'files_opened': sum(record['files'] for record in history),
+        'easter_eggs_found': 3,
+        'special_dirs_found': 5,
+        'achievements': {'first_decryption': True, 'easter_egg_hunter': True,
+                         'void_explorer': True, 'master_decryptor': False},
+        'session_history': history,
+        'last_played': '2024-01-01T12:00:00',
+        'last_session_seed': history[-1]['seed'] if history else None,
+        'first_play_date': '2023-01-01T12:00:00',
+        'journal_seq': history_length * 10,
+    }
+
+
+def bench_formats(history_lengths: List[int], min_time: float, directory: str) -> List[Dict[str, Any]]:
+    """Замер упаковки, распаковки и чтения счета для обоих форматов"""
+    results = []
+
+    for length in history_lengths:
+        data = make_save(length)
+        binary = save_format.encode_save(data)
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+
+        binary_path = os.path.join(directory, f'save_{length}.dat')
+        json_path = os.path.join(directory, f'save_{length}.json')
+        with open(binary_path, 'wb') as f:
+            f.write(binary)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+        def json_total_score():
+            with open(json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)['total_score']
+
+        operations = (
+            ('binary', 'save', len(binary), lambda: save_format.encode_save(data)),
+            ('binary', 'load', len(binary), lambda: save_format.decode_save(binary)),
+            ('binary', 'total_score', len(binary), lambda: save_format.read_header(binary_path)['total_score']),
+            ('json', 'save', len(text.encode('utf-8')), lambda: json.dumps(data, indent=2, ensure_ascii=False)),
+            ('json', 'load', len(text.encode('utf-8')), lambda: json.loads(text)),
+            ('json', 'total_score', len(text.encode('utf-8')), json_total_score),
+        )
+
+        for format_name, operation, size, func in operations:
+            stats = measure(func, min_time)
+            stats.update({
+                'format': format_name,
+                'operation': operation,
+                'history': length,
+                'size': size,
+            })
+            results.append(stats)
+            print(f"  {format_name:<6} {operation:<11} {length:>7} сессий {size:>10} B "
+                  f"{stats['ops_per_sec']:>12.1f} оп/с", file=sys.stderr)
+
+    return results
+
+
+def main() -> None:
+    """Точка входа: замеры и вывод JSON"""
+    parser = argparse.ArgumentParser(description="Замер производительности сохранений THE-VOIDER-DOS")
+    parser.add_argument('--history', type=int, nargs='+', default=DEFAULT_HISTORY,
+                        help="Длины истории сессий")
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="Минимальное время одного замера в секундах")
+    parser.add_argument('-o', '--output', help="Файл для JSON (по умолчанию - stdout)")
+    args = parser.parse_args()
+
+    print("Замер форматов сохранения...", file=sys.stderr)
+    with tempfile.TemporaryDirectory() as directory:
+        report = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'min_time': args.min_time,
+            'format_version': save_format.FORMAT_VERSION,
+            'results': bench_formats(args.history, args.min_time, directory),
+        }
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"Результаты сохранены в {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -36,18 +36,63 @@ SCORING = {
     'completion_bonus': 500,        # Бонус за полное исследование
 }
 
+# ==================== ДОСТИЖЕНИЯ ====================
+# Достижение открывается, когда счетчик stat (атрибут GameState) достигает threshold
+ACHIEVEMENTS = {
+    'first_decryption': {
+        'name': 'Первая расшифровка',
+        'description': 'расшифрована первая директория',
+        'stat': 'directories_decrypted',
+        'threshold': 1,
+    },
+    'easter_egg_hunter': {
+        'name': 'Охотник за пасхалками',
+        'description': 'найдено 3 пасхалки',
+        'stat': 'easter_eggs_found',
+        'threshold': 3,
+    },
+    'void_explorer': {
+        'name': 'Исследователь пустоты',
+        'description': 'открыто 20 файлов',
+        'stat': 'files_opened',
+        'threshold': 20,
+    },
+    'master_decryptor': {
+        'name': 'Мастер дешифровки',
+        'description': 'расшифровано 10 директорий',
+        'stat': 'directories_decrypted',
+        'threshold': 10,
+    },
+}
+
 # ==================== СИСТЕМА ШИФРОВАНИЯ ====================
 CIPHERS = {
-    'enabled': ['hex', 'ascii', 'binary', 'base64', 'rot13', 'caesar'],
+    'enabled': ['hex', 'ascii', 'binary', 'base64', 'rot13', 'caesar', 'vigenere', 'xor'],
     'weights': {
-        'hex': 30,      # 30% вероятность
+        'hex': 25,      # 25% вероятность
         'ascii': 25,    # 25% вероятность
         'binary': 20,   # 20% вероятность
         'base64': 15,   # 15% вероятность
         'rot13': 5,     # 5% вероятность
         'caesar': 5,    # 5% вероятность
+        'vigenere': 3,  # 3% вероятность
+        'xor': 2,       # 2% вероятность
+    },
+    'min_depth': {
+        'vigenere': 4,  # Сложные шифры появляются только в глубоких директориях
+        'xor': 4,
+    },
+    'caesar_shift_range': (1, 25), # Диапазон сдвига для шифра Цезаря
+    'vigenere_key_length': (3, 5), # Диапазон длины ключа Vigenère
+    'xor_key_length': (2, 4),      # Диапазон длины ключа XOR
+    'solver_max_key_length': 8,    # Максимальная длина ключа при взломе Vigenère/XOR
+    'solver_crib_length': 32,      # До этой длины ключ подбирается по известным словам имен
+    'cache_size': 1024,            # Размер LRU-кэша шифрования/дешифрования
+    'chain': {
+        'depth_step': 3,           # Каждые N уровней глубины добавляют слой шифра
+        'max_layers': 5,           # Максимальное количество слоев
+        'max_length': 256,         # Максимальная длина зашифрованного имени
     },
-    'caesar_shift_range': (1, 25)  # Диапазон сдвига для шифра Цезаря
 }
 
 # ==================== НАСТРОЙКИ ИНТЕРФЕЙСА ====================
@@ -56,7 +101,8 @@ UI = {
     'prompt_symbol': '>',           # Символ приглашения
     'path_separator': '\\',         # Разделитель пути (Windows-стиль)
     'root_name': 'VOID:',           # Название корневой директории
-    'max_history_size': 50,         # Максимальный размер истории команд
+    'history_preload': 1000,        # Сколько последних команд загружать при старте (стрелки, Ctrl-R)
+    'command_cache_size': 256,      # Размер кэша разбора строк команд
     'show_hidden_by_default': False,# Показывать скрытые файлы по умолчанию
 }
 
@@ -84,9 +130,35 @@ COLORS = {
 # ==================== ФАЙЛЫ СОХРАНЕНИЯ ====================
 SAVES = {
     'save_dir': 'saves',
-    'save_file': 'voider_save.json',
-    'backup_count': 3,              # Количество резервных копий
+    'backend': 'file',              # 'file' (двоичный снимок + журнал) или 'sqlite' (профили и рекорды)
+    'sqlite_file': 'voider.db',     # База SQLite-хранилища (в save_dir)
+    'profile': None,                # Профиль игрока в SQLite (None - имя пользователя ОС)
+    'save_file': 'voider_save.dat',
+    'legacy_save_file': 'voider_save.json',  # JSON-сохранение старых версий (импортируется при загрузке)
+    'journal_file': 'voider_save.journal',
+    'lock_file': 'voider_save.lock',  # Блокировка сохранений между процессами (fcntl.flock)
+    'journal_compact_events': 200,  # После стольких записей журнал сворачивается в снимок
+    'fsync': True,                  # Сбрасывать сохранения на диск (fsync)
+    'backup_count': 3,              # Количество резервных копий (слотов кольца backup.0..N-1)
+    'history_limit': 1000,          # Сколько последних сессий хранить в истории
     'auto_save_interval': 300,      # Автосохранение каждые 5 минут (в сек)
+    'quick_slots': 10,              # Слотов быстрого сохранения в сессии (qsave/qload)
+    'command_history_file': 'voider_commands.txt',  # История введенных команд (в save_dir)
+    'command_history_limit': 10000, # Сколько команд хранить в файле истории
+}
+
+# ==================== СТАТИСТИКА ====================
+STATS = {
+    'minute_buckets': 60,           # Поминутные корзины: динамика за последний час
+    'day_buckets': 35,              # Посуточные корзины: динамика за последние 5 недель
+}
+
+# ==================== ЖУРНАЛИРОВАНИЕ ====================
+LOGGING = {
+    'level': 'WARNING',             # Уровень вывода в консоль (stderr)
+    'file': None,                   # Файл журнала, например 'saves/voider.log' (None - без файла)
+    'file_level': 'DEBUG',          # Уровень записи в файл
+    'format': '%(asctime)s %(levelname)s %(name)s: %(message)s',
 }
 
 # ==================== ПУТИ К ФАЙЛАМ ДАННЫХ ====================
@@ -111,6 +183,8 @@ DATA_PATHS = {
 DEFAULT_DATA = {
     'directory_names': ['System', 'User', 'Program', 'Data', 'Config', 'Temp', 
                        'Backup', 'Archive', 'Secret', 'Public', 'Logs', 'Cache'],
+    'directory_prefixes': ['DIR', 'FOLDER', 'CAT', 'MOD', 'SEC', 'DATA'],
+    'directory_suffixes': ['ALPHA', 'BETA', 'RC', 'FINAL'],
     'file_names': ['README', 'CONFIG', 'SETUP', 'INSTALL', 'HELP', 'INFO',
                   'DATA', 'TEMP', 'LOG', 'ERROR', 'DEBUG', 'BACKUP', 'NOTE'],
     'file_extensions': ['.txt', '.dat', '.cfg', '.sys', '.bin', '.log', '.tmp'],
@@ -140,15 +214,21 @@ DEFAULT_DATA = {
   
 Шифрование:
   decode <шифр> <текст> - Расшифровать директорию
+  decode auto <шифр>    - Расшифровать с автоопределением шифра
+  hint <шифр>           - Показать цепочку шифров директории
+  analyze <текст|файл>  - Частотный анализ шифротекста
   ciphers      - Показать доступные шифры
   encrypt <текст> <тип> - Зашифровать текст (для тренировки)
   
 Системные команды:
   score        - Показать текущий счет
   stats        - Подробная статистика
-  history      - История команд
+  history [текст] - История команд (с текстом - поиск по всей истории)
+  qsave [слот] - Быстрое сохранение (например, перед рискованной расшифровкой)
+  qload [слот] - Вернуться к быстрому сохранению
+  qslots       - Список быстрых сохранений
   clear/cls    - Очистить экран
-  help         - Эта справка
+  help         - Эта справка (help <команда> - описание одной команды)
   exit         - Выйти в главное меню
 """,
     'about_text': """
@@ -2,23 +2,80 @@
 """
 THE-VOIDER-DOS - Консольная игра с процедурной генерацией файловой системы
 Автор: Prunt (Yuki_Sempai)
+
+Пакетный режим (боты, автотесты): команды из файла или stdin выполняются
+подряд, результаты печатаются строками JSON:
+
+    python main.py --script commands.txt --seed 42
+    printf 'dir\ncd Users\n' | python main.py --script -
 """
 
+import argparse
 import sys
 import os
+from contextlib import redirect_stdout
 from colorama import init, Fore, Style
 
 # Инициализация colorama для цветного вывода в Windows/Linux/Mac
 init(autoreset=True)
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """Разобрать аргументы командной строки"""
+    parser = argparse.ArgumentParser(description="THE-VOIDER-DOS")
+    parser.add_argument('--script', nargs='?', const='-', metavar='FILE',
+                        help="выполнить команды из файла ('-' или без значения - из stdin) и выйти")
+    parser.add_argument('--seed', type=int, help="seed файловой системы для пакетного режима")
+    parser.add_argument('--continue', dest='continue_game', action='store_true',
+                        help="пакетный режим: продолжить сохраненную игру вместо новой")
+    return parser.parse_args(argv)
+
+
+def run_script(path: str, seed=None, continue_game: bool = False) -> int:
+    """
+    Пакетный режим: без меню, приглашений, очистки экрана и пауз
+    
+    Args:
+        path: Файл со скриптом команд ('-' - stdin)
+        seed: Seed новой файловой системы
+        continue_game: Продолжить сохраненную игру
+        
+    Returns:
+        Код выхода: 0, если все команды выполнены без ошибок
+    """
+    from voider_dos.utils.log import setup_logging
+    setup_logging()
+    
+    from voider_dos.core.game_states import GameState
+    from voider_dos.core.session_manager import GameSession
+    
+    # stdout занят результатами JSON: сообщения загрузки уходят в stderr
+    with redirect_stdout(sys.stderr):
+        game_state = GameState()
+        game_state.load()
+        session = GameSession(game_state, new_game=not continue_game, seed=seed, interactive=False)
+    
+    # Исходный stdout, а не обертка colorama: она дописывает сброс цвета к каждой записи
+    out = sys.__stdout__
+    if path == '-':
+        errors = session.run_script(sys.stdin, out)
+    else:
+        with open(path, encoding='utf-8') as f:
+            errors = session.run_script(f, out)
+    return 1 if errors else 0
+
+
 def main():
     """Главная функция запуска игры"""
     try:
         print(f"{Fore.CYAN}Загрузка THE-VOIDER-DOS...{Style.RESET_ALL}")
         
+        # Диагностика идет в logging (уровень и файл журнала - config.LOGGING)
+        from voider_dos.utils.log import setup_logging
+        setup_logging()
+        
         # Динамический импорт для избежания циклических зависимостей
         # Эти модули нужно будет создать следующими
-        from voider_dos.core.game_state import GameState
+        from voider_dos.core.game_states import GameState
         from voider_dos.ui.main_menu import MainMenu
         from voider_dos.core.session_manager import GameSession
         
@@ -102,5 +159,9 @@ if __name__ == "__main__":
     os.makedirs("voider_dos/data/name_lists", exist_ok=True)
     os.makedirs("voider_dos/data/help_texts", exist_ok=True)
     
+    args = parse_args()
+    if args.script is not None:
+        sys.exit(run_script(args.script, seed=args.seed, continue_game=args.continue_game))
+    
     # Запуск игры
     main()
\ No newline at end of file
@@ -0,0 +1,355 @@
+"""
+Класс CommandHandler: реестр команд на префиксном дереве
+
+Команды (с псевдонимами: cls/clear, exit/quit) регистрируются в
+префиксное дерево по буквам имени. Разбор ввода проходит дерево за
+O(длины имени команды) и раскрывает однозначные префиксы ('hi' -> 'hint'
+не сработает, если есть 'history'; 'ver' -> 'version'). Аргументы каждой
+команды описываются строкой вида '<шифр> [текст...]', которая
+компилируется один раз при регистрации. Результаты разбора строк ввода
+кэшируются (повторы команд не разбираются заново).
+
+Модули команд (navigation, file_operations, decryption, system_commands)
+подключаются функцией register(registry). Обработчики возвращают
+структурированный вывод из voider_dos.core.results, без цветов.
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import UI
+from voider_dos.core.persistent import PSet
+from voider_dos.core.results import error
+from voider_dos.utils.log import get_logger
+
+logger = get_logger('commands')
+
+# Преобразования типов аргументов: '<seed:int>'
+ARG_TYPES: Dict[str, Callable[[str], Any]] = {
+    'str': str,
+    'int': int,
+}
+
+# Метка узла дерева, под которым больше одной команды
+_AMBIGUOUS = object()
+
+
+@dataclass(frozen=True)
+class _Arg:
+    """Скомпилированный аргумент команды"""
+    name: str
+    convert: Callable[[str], Any]
+    optional: bool
+    rest: bool
+
+
+class ArgSpec:
+    """
+    Описание аргументов команды, скомпилированное при регистрации
+
+    Синтаксис: '<имя>' - обязательный, '[имя]' - необязательный,
+    '<имя:int>' - с типом, '<имя...>' - остаток строки как есть
+    (с пробелами и регистром).
+    """
+
+    def __init__(self, text: str = ''):
+        """
+        Args:
+            text: Описание аргументов (например, '<шифр> [текст...]')
+        """
+        self.text = text
+        self.args: Tuple[_Arg, ...] = tuple(self._compile(token) for token in text.split())
+        self.required = sum(1 for arg in self.args if not arg.optional)
+        self.rest = bool(self.args) and self.args[-1].rest
+
+        for index, arg in enumerate(self.args):
+            if arg.rest and index != len(self.args) - 1:
+                raise ValueError(f"Аргумент '{arg.name}...' должен быть последним: {text}")
+            if not arg.optional and index >= self.required:
+                raise ValueError(f"Обязательный аргумент '{arg.name}' после необязательного: {text}")
+
+    @staticmethod
+    def _compile(token: str) -> _Arg:
+        """Разобрать описание одного аргумента"""
+        if len(token) < 3 or (token[0], token[-1]) not in (('<', '>'), ('[', ']')):
+            raise ValueError(f"Неверное описание аргумента: {token}")
+
+        name = token[1:-1]
+        rest = name.endswith('...')
+        if rest:
+            name = name[:-3]
+        name, _, type_name = name.partition(':')
+        if type_name and type_name not in ARG_TYPES:
+            raise ValueError(f"Неизвестный тип аргумента: {token}")
+        return _Arg(name, ARG_TYPES[type_name or 'str'], token[0] == '[', rest)
+
+    def parse(self, text: str) -> Tuple[Any, ...]:
+        """
+        Разобрать строку аргументов
+
+        Args:
+            text: Все, что введено после имени команды
+
+        Returns:
+            Значения аргументов по порядку (None для пропущенных необязательных)
+        """
+        if self.rest:
+            tokens = text.split(None, len(self.args) - 1)
+        else:
+            tokens = text.split()
+
+        if len(tokens) < self.required:
+            missing = self.args[len(tokens)].name
+            raise ValueError(f"Не указан аргумент <{missing}>")
+        if len(tokens) > len(self.args):
+            raise ValueError(f"Лишние аргументы: {' '.join(tokens[len(self.args):])}")
+
+        values = []
+        for arg, token in zip(self.args, tokens):
+            try:
+                values.append(arg.convert(token))
+            except ValueError:
+                raise ValueError(f"Неверное значение <{arg.name}>: {token}") from None
+        values.extend(None for _ in range(len(self.args) - len(tokens)))
+        return tuple(values)
+
+
+@dataclass(frozen=True)
+class Command:
+    """Зарегистрированная команда"""
+    name: str
+    func: Callable[..., Any]
+    spec: ArgSpec
+    aliases: Tuple[str, ...] = ()
+    group: str = 'system'
+    help: str = ''
+
+    @property
+    def usage(self) -> str:
+        """Строка использования: 'decode <шифр> [текст...]'"""
+        return f"{self.name} {self.spec.text}".strip()
+
+
+class _TrieNode:
+    """Узел префиксного дерева имен"""
+
+    __slots__ = ('children', 'command', 'below')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.command: Optional[Command] = None   # Команда с именем, оканчивающимся здесь
+        self.below: Any = None                   # Единственная команда под префиксом или _AMBIGUOUS
+
+
+class CommandRegistry:
+    """Реестр команд: префиксное дерево имен и кэш разбора ввода"""
+
+    def __init__(self, cache_size: Optional[int] = None):
+        """
+        Args:
+            cache_size: Размер кэша разбора строк (по умолчанию UI['command_cache_size'])
+        """
+        self._root = _TrieNode()
+        self.commands: List[Command] = []
+        self.parse = lru_cache(maxsize=cache_size or UI['command_cache_size'])(self._parse)
+
+    def register(self, name: str, func: Callable[..., Any], args: str = '',
+                 aliases: Tuple[str, ...] = (), group: str = 'system', help: str = '') -> Command:
+        """
+        Зарегистрировать команду
+
+        Args:
+            name: Имя команды
+            func: Обработчик: func(handler, *аргументы)
+            args: Описание аргументов (см. ArgSpec)
+            aliases: Другие имена команды
+            group: Группа (navigation, files, decryption, system, session)
+            help: Краткое описание для help
+
+        Returns:
+            Зарегистрированная команда
+        """
+        command = Command(name.lower(), func, ArgSpec(args), tuple(a.lower() for a in aliases), group, help)
+        for word in (command.name,) + command.aliases:
+            if self.get(word) is not None:
+                raise ValueError(f"Команда '{word}' уже зарегистрирована")
+
+        for word in (command.name,) + command.aliases:
+            node = self._root
+            for char in word:
+                node = node.children.setdefault(char, _TrieNode())
+                if node.below is None:
+                    node.below = command
+                elif node.below is not command:
+                    node.below = _AMBIGUOUS
+            node.command = command
+
+        self.commands.append(command)
+        # Новая команда может сделать однозначный префикс неоднозначным
+        self.parse.cache_clear()
+        return command
+
+    def _walk(self, word: str) -> Optional[_TrieNode]:
+        """Узел дерева для префикса (None, если такого префикса нет)"""
+        node = self._root
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def get(self, word: str) -> Optional[Command]:
+        """Команда по точному имени или псевдониму"""
+        node = self._walk(word.lower())
+        return node.command if node is not None else None
+
+    def matches(self, prefix: str) -> List[Command]:
+        """Все команды, имя или псевдоним которых начинается с prefix"""
+        node = self._walk(prefix.lower())
+        found: List[Command] = []
+        stack = [node] if node is not None else []
+        while stack:
+            node = stack.pop()
+            if node.command is not None and node.command not in found:
+                found.append(node.command)
+            stack.extend(node.children.values())
+        return sorted(found, key=lambda command: command.name)
+
+    def resolve(self, word: str) -> Command:
+        """
+        Команда по имени, псевдониму или однозначному префиксу
+
+        Args:
+            word: Первое слово ввода
+
+        Returns:
+            Команда
+        """
+        word = word.lower()
+        node = self._walk(word)
+        if node is None or node is self._root:
+            raise ValueError(f"Неизвестная команда: {word}. Введите 'help' для списка команд.")
+        if node.command is not None:
+            return node.command
+        if node.below is _AMBIGUOUS:
+            names = ', '.join(command.name for command in self.matches(word))
+            raise ValueError(f"Неоднозначная команда '{word}': {names}")
+        return node.below
+
+    def _parse(self, line: str) -> Tuple[Command, Tuple[Any, ...]]:
+        """Разобрать строку ввода: (команда, аргументы); результат кэшируется в parse"""
+        parts = line.strip().split(None, 1)
+        if not parts:
+            raise ValueError("Пустая команда")
+        command = self.resolve(parts[0])
+        return command, command.spec.parse(parts[1] if len(parts) > 1 else '')
+
+    def cache_info(self) -> Dict[str, int]:
+        """Статистика кэша разбора (как CipherSystem.get_cache_stats)"""
+        info = self.parse.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
+
+
+class CommandHandler:
+    """Выполнение команд игрока над VFS и состоянием игры"""
+
+    def __init__(self, vfs, game_state):
+        """
+        Args:
+            vfs: Виртуальная файловая система (VirtualFileSystem)
+            game_state: Состояние игры (GameState)
+        """
+        self.vfs = vfs
+        self.game_state = game_state
+        self.show_hidden = UI['show_hidden_by_default']
+        # id открытых в сессии файлов: очки начисляются один раз. Постоянное
+        # множество: быстрое сохранение запоминает его ссылкой, qload возвращает
+        self.opened_files = PSet()
+        self.last_command: Optional[Command] = None
+
+        from voider_dos.commands import navigation, file_operations, decryption, system_commands
+        self.registry = CommandRegistry()
+        for module in (navigation, file_operations, decryption, system_commands):
+            module.register(self.registry)
+
+    def parse(self, line: str) -> Tuple[Command, Tuple[Any, ...]]:
+        """Разобрать строку ввода (с кэшем), ValueError при ошибке"""
+        return self.registry.parse(line)
+
+    def execute(self, line: str) -> Any:
+        """
+        Выполнить команду
+
+        Args:
+            line: Строка ввода
+
+        Returns:
+            Вывод команды (класс из voider_dos.core.results) или None
+        """
+        self.last_command = None
+        line = line.strip()
+        if not line:
+            return None
+
+        # Имя файла текущей директории открывает файл, если это не имя команды
+        word = line.split(None, 1)[0]
+        if self.registry.get(word) is None:
+            from voider_dos.commands.file_operations import find_file, open_file
+            if find_file(self.vfs, line) is not None:
+                return open_file(self, line)
+
+        try:
+            command, args = self.parse(line)
+        except ValueError as e:
+            return error(str(e))
+
+        logger.debug("Команда %s%s", command.name, args)
+        self.last_command = command
+        return command.func(self, *args)
+
+
+# Тестирование модуля (если файл запущен напрямую)
+if __name__ == "__main__":
+    import time
+
+    print("Тестирование CommandRegistry...")
+
+    registry = CommandRegistry()
+    calls = []
+    registry.register('history', lambda h: calls.append('history'))
+    registry.register('hint', lambda h, text: calls.append(text), args='<шифр...>')
+    registry.register('clear', lambda h: calls.append('clear'), aliases=('cls',))
+    registry.register('seed', lambda h, action, value: calls.append(value), args='[действие] [значение:int]')
+
+    tests = [
+        ('histo', 'history', ()),
+        ('CLS', 'clear', ()),
+        ('hin 4A 6F', 'hint', ('4A 6F',)),
+        ('seed set 42', 'seed', ('set', 42)),
+    ]
+    for line, name, args in tests:
+        command, parsed = registry.parse(line)
+        status = "✓" if command.name == name and parsed == args else "✗"
+        print(f"  {status} '{line}' -> {command.name}{parsed}")
+
+    for line in ('h', 'seed set x', 'unknown'):
+        try:
+            registry.parse(line)
+            print(f"  ✗ '{line}' разобрана")
+        except ValueError as e:
+            print(f"  ✓ '{line}': {e}")
+
+    # Разбор повторяющихся команд идет из кэша
+    start = time.perf_counter()
+    for _ in range(100000):
+        registry.parse('hin 4A 6F')
+    elapsed = time.perf_counter() - start
+    info = registry.cache_info()
+    print(f"  ✓ 100000 разборов за {elapsed * 1000:.1f} мс (попаданий в кэш: {info['hits']})")
+
+    print("\nТестирование завершено!")
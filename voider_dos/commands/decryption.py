@@ -0,0 +1,221 @@
+"""
+Команды расшифровки: decode, hint, analyze (частотный анализ), ciphers, encrypt
+
+Частоты букв считаются за один проход в core.frequency (numpy.bincount
+или collections.Counter), поэтому анализ остается мгновенным даже для
+целых зашифрованных файлов.
+"""
+
+import os
+import sys
+from typing import Any, Dict, List, Union
+
+from colorama import Fore, Style
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from voider_dos.core.cipher_system import CipherSystem
+from voider_dos.core.frequency import (
+    ALPHABET, HAS_NUMPY, IOC_ENGLISH, IOC_RANDOM, IOC_THRESHOLD,
+    letter_counts, index_of_coincidence, shift_scores
+)
+from voider_dos.commands.command_handler import CommandRegistry
+from voider_dos.core.results import Analysis, Decryption, Listing, Message, error
+
+# Сколько символов расшифровки показывать в кандидатах сдвига
+PREVIEW_LENGTH = 48
+
+# Тип шифра определяется по началу длинного текста: форма групп видна сразу
+DETECT_SAMPLE = 4096
+
+
+def _detection_sample(text: str) -> str:
+    """Начало длинного текста для определения шифра (обрезается по границе группы)"""
+    if len(text) <= DETECT_SAMPLE:
+        return text
+    cut = text.rfind(' ', 0, DETECT_SAMPLE)
+    return text[:cut] if cut > 0 else text[:DETECT_SAMPLE]
+
+
+def analyze_text(text: str, top_shifts: int = 3) -> Dict[str, Any]:
+    """
+    Частотный анализ шифротекста
+
+    Args:
+        text: Анализируемый текст
+        top_shifts: Сколько лучших сдвигов вернуть
+
+    Returns:
+        Словарь с частотами букв, индексом совпадений, вероятными
+        шифрами и лучшими сдвигами
+    """
+    counts = letter_counts(text)
+    letters = sum(counts)
+    ioc = index_of_coincidence(counts)
+
+    if letters < 20:
+        ioc_class = "мало букв для вывода"
+    elif ioc >= IOC_THRESHOLD:
+        ioc_class = "моноалфавитный: сдвиг (Caesar/ROT13) или открытый текст"
+    else:
+        ioc_class = "полиалфавитный или не буквенный шифр"
+
+    shifts = []
+    preview = text[:PREVIEW_LENGTH]
+    for score in shift_scores(counts)[:top_shifts]:
+        shift = score['shift']
+        score['cipher'] = 'rot13' if shift == 13 else 'caesar'
+        # Превью - то, что вернет decode этим шифром (ROT13 не сдвигает цифры)
+        score['preview'] = CipherSystem.decrypt(preview, score['cipher'], shift) if shift else preview
+        shifts.append(score)
+
+    return {
+        'length': len(text),
+        'letters': letters,
+        'frequencies': dict(zip(ALPHABET, counts)),
+        'ioc': round(ioc, 4),
+        'ioc_class': ioc_class,
+        'ciphers': CipherSystem.detect_cipher(_detection_sample(text))[:3],
+        'shifts': shifts,
+    }
+
+
+def format_analysis(analysis: Dict[str, Any], bar_width: int = 30) -> List[str]:
+    """
+    Оформить результат анализа для вывода в консоль
+
+    Args:
+        analysis: Результат analyze_text
+        bar_width: Ширина самой длинной полосы гистограммы
+
+    Returns:
+        Список строк
+    """
+    lines = [f"{Fore.CYAN}Частотный анализ: {analysis['length']} символов, "
+             f"{analysis['letters']} латинских букв{Style.RESET_ALL}"]
+
+    frequencies = analysis['frequencies']
+    letters = analysis['letters']
+    if letters:
+        # Гистограмма самых частых букв
+        peak = max(frequencies.values())
+        top = sorted(frequencies.items(), key=lambda x: x[1], reverse=True)[:10]
+        for letter, count in top:
+            if not count:
+                break
+            bar = '█' * max(1, round(count / peak * bar_width))
+            lines.append(f"  {letter.upper()} {Fore.GREEN}{bar:<{bar_width}}{Style.RESET_ALL} "
+                         f"{count:>6} ({count / letters:6.1%})")
+
+    lines.append(f"{Fore.YELLOW}Индекс совпадений: {analysis['ioc']:.4f} "
+                 f"(английский ≈ {IOC_ENGLISH}, шум ≈ {IOC_RANDOM:.3f}) - {analysis['ioc_class']}{Style.RESET_ALL}")
+
+    if analysis['ciphers']:
+        candidates = ', '.join(f"{CipherSystem.get_cipher_info(c['type'])['name']} ({c['confidence']:.0%})"
+                               for c in analysis['ciphers'])
+        lines.append(f"{Fore.YELLOW}Вероятный шифр: {candidates}{Style.RESET_ALL}")
+    else:
+        lines.append(f"{Fore.YELLOW}Вероятный шифр: не определен{Style.RESET_ALL}")
+
+    if analysis['shifts']:
+        lines.append(f"{Fore.CYAN}Лучшие сдвиги (хи-квадрат, меньше - лучше):{Style.RESET_ALL}")
+        for score in analysis['shifts']:
+            label = 'ROT13' if score['cipher'] == 'rot13' else f"Caesar {score['shift']:>2}"
+            lines.append(f"  {label:<9} χ²={score['chi_squared']:>10.2f}  {Fore.WHITE}{score['preview']}{Style.RESET_ALL}")
+
+    return lines
+
+
+def _decryption_result(success: bool, dir_node, message: str) -> Union[Decryption, Message]:
+    """Результат decode (очки начисляет GameEngine)"""
+    if not success:
+        return error(message)
+    return Decryption(dir_node.name, dir_node.score_value, message)
+
+
+def cmd_decode(handler, text: str) -> Union[Decryption, Message]:
+    """
+    decode <шифр> <текст> - проверить расшифровку имени директории,
+    decode auto <шифр> - подобрать цепочку шифров автоматически
+
+    Шифр может содержать пробелы (binary, hex), поэтому попытка - последнее слово.
+    """
+    if text.lower().startswith('auto '):
+        # Регистр важен для Base64: берем исходный ввод
+        return _decryption_result(*handler.vfs.auto_decode_directory(text.split(None, 1)[1]))
+
+    parts = text.rsplit(None, 1)
+    if len(parts) < 2:
+        return error("Использование: decode <шифр> <текст> или decode auto <шифр>")
+    return _decryption_result(*handler.vfs.decode_directory(parts[0], parts[1]))
+
+
+def cmd_hint(handler, cipher_text: str) -> Message:
+    """Подсказка по цепочке шифров (открытое имя не раскрывается)"""
+    success, message = handler.vfs.hint_directory(cipher_text)
+    return Message(message, 'notice') if success else error(message)
+
+
+def cmd_analyze(handler, target: str) -> Analysis:
+    """Частотный анализ: аргумент - файл текущей директории или сам шифротекст (оформляет format_analysis)"""
+    file_node = handler.vfs.current_dir.find_child(target, search_type="file")
+    return Analysis(analyze_text(file_node.content if file_node else target))
+
+
+def cmd_ciphers(handler) -> Listing:
+    """Список включенных шифров"""
+    return Listing([f"  {info['type']:<10} {info['name']} - {info['description']}"
+                    for info in CipherSystem.get_all_ciphers_info()], title="Доступные шифры:")
+
+
+def cmd_encrypt(handler, text: str) -> Message:
+    """encrypt <текст> <тип> - зашифровать текст для тренировки"""
+    parts = text.rsplit(None, 1)
+    if len(parts) < 2 or parts[1].lower() not in CipherSystem.get_enabled_ciphers():
+        return error(f"Использование: encrypt <текст> <тип>. Типы: {', '.join(CipherSystem.get_enabled_ciphers())}")
+
+    encrypted, key = CipherSystem.encrypt(parts[0], parts[1].lower())
+    key_info = f" (ключ: {key})" if key is not None else ""
+    return Message(f"{encrypted}{key_info}", 'success')
+
+
+def register(registry: CommandRegistry) -> None:
+    """Подключить команды расшифровки к реестру"""
+    registry.register('decode', cmd_decode, args='<шифр...>', group='decryption',
+                      help='Расшифровать директорию (decode auto <шифр> - автоопределение)')
+    registry.register('hint', cmd_hint, args='<шифр...>', group='decryption',
+                      help='Показать цепочку шифров директории')
+    registry.register('analyze', cmd_analyze, args='<текст...>', group='decryption',
+                      help='Частотный анализ шифротекста или файла')
+    registry.register('ciphers', cmd_ciphers, group='decryption', help='Показать доступные шифры')
+    registry.register('encrypt', cmd_encrypt, args='<текст...>', group='decryption',
+                      help='Зашифровать текст (для тренировки)')
+
+
+# Тестирование модуля (если файл запущен напрямую)
+if __name__ == "__main__":
+    import time
+
+    print("Тестирование частотного анализа...")
+    print(f"numpy: {'доступен' if HAS_NUMPY else 'не установлен, используется Counter'}")
+
+    plain = ("The quick brown fox jumps over the lazy dog while the void "
+             "listens to every secret hidden in the system directories ")
+    encrypted, shift = CipherSystem.encrypt(plain, 'caesar', 11)
+
+    analysis = analyze_text(encrypted)
+    for line in format_analysis(analysis):
+        print(line)
+
+    status = "✓" if analysis['shifts'][0]['shift'] == 11 else "✗"
+    print(f"\n{status} Лучший сдвиг: {analysis['shifts'][0]['shift']} (ожидается 11)")
+
+    # Длинный текст - целый зашифрованный файл
+    long_text = CipherSystem.encrypt(plain * 20000, 'rot13')[0]
+    start = time.perf_counter()
+    analysis = analyze_text(long_text)
+    elapsed = time.perf_counter() - start
+    status = "✓" if analysis['shifts'][0]['shift'] == 13 else "✗"
+    print(f"{status} {len(long_text)} символов за {elapsed * 1000:.1f} мс, сдвиг {analysis['shifts'][0]['shift']}")
+
+    print("\nТестирование завершено!")
@@ -0,0 +1,75 @@
+"""
+Команды работы с файлами: type (открыть файл), find (поиск по имени)
+"""
+
+import os
+import sys
+from typing import Union
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import SCORING
+from voider_dos.commands.command_handler import CommandRegistry
+from voider_dos.core.results import FileView, Listing, Message, error
+
+# Сколько результатов find выводить
+FIND_LIMIT = 20
+
+
+def find_file(vfs, filename: str):
+    """Файл текущей директории по полному имени или имени без расширения (None, если нет)"""
+    file_node, _ = vfs.open_file(filename)
+    return file_node
+
+
+def open_file(handler, filename: str) -> Union[FileView, Message]:
+    """
+    Открыть файл текущей директории
+
+    Очки за файл начисляются один раз за сессию.
+
+    Args:
+        handler: CommandHandler
+        filename: Имя файла
+
+    Returns:
+        Содержимое файла или ошибка
+    """
+    file_node, message = handler.vfs.open_file(filename)
+    if file_node is None:
+        return error(message)
+
+    result = FileView(file_node.get_full_name(), file_node.content, file_node.is_easter_egg)
+
+    if id(file_node) not in handler.opened_files:
+        handler.opened_files = handler.opened_files.add(id(file_node))
+        handler.game_state.record_file_opened(is_easter_egg=file_node.is_easter_egg,
+                                              is_special=file_node.is_special)
+        if file_node.is_easter_egg:
+            result.points, result.reason = SCORING['easter_egg_found'], 'за пасхалку'
+        elif file_node.is_special:
+            result.points, result.reason = SCORING['special_dir_found'], 'за особый файл'
+        else:
+            result.points, result.reason = SCORING['file_opened'], 'за открытие файла'
+    return result
+
+
+def cmd_find(handler, text: str) -> Union[Listing, Message]:
+    """Поиск файлов и директорий по имени во всей VFS"""
+    found = handler.vfs.find_item(text)
+    if not found:
+        return error(f"Ничего не найдено: {text}", warning=True)
+
+    # Путь строится из отображаемых имен: зашифрованные директории не раскрываются
+    lines = [f"  {item['type']:<5} {item['path']}" for item in found[:FIND_LIMIT]]
+    if len(found) > FIND_LIMIT:
+        lines.append(f"... и еще {len(found) - FIND_LIMIT}")
+    return Listing(lines, title=f"Найдено: {len(found)}")
+
+
+def register(registry: CommandRegistry) -> None:
+    """Подключить команды работы с файлами к реестру"""
+    registry.register('type', open_file, args='<файл...>', aliases=('cat', 'open'), group='files',
+                      help='Показать содержимое файла')
+    registry.register('find', cmd_find, args='<текст...>', group='files',
+                      help='Поиск файлов и директорий по имени')
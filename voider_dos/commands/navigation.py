@@ -0,0 +1,42 @@
+"""
+Команды навигации: dir, cd, pwd
+"""
+
+import os
+import sys
+from typing import Optional
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from voider_dos.commands.command_handler import CommandRegistry
+from voider_dos.core.results import Listing, Message, error
+
+
+def cmd_dir(handler, option: Optional[str]) -> Listing:
+    """Содержимое текущей директории ('dir /a' - со скрытыми)"""
+    show_hidden = handler.show_hidden or (option or '').lower() in ('/a', '-a')
+    return Listing(handler.vfs.list_directory(show_hidden=show_hidden),
+                   title=f"Содержимое {handler.vfs.get_current_path_str()}")
+
+
+def cmd_cd(handler, target: Optional[str]) -> Message:
+    """Перейти в директорию (без аргумента - показать путь)"""
+    if target is None:
+        return cmd_pwd(handler)
+
+    success, message = handler.vfs.change_directory(target)
+    return Message(message, 'success') if success else error(message)
+
+
+def cmd_pwd(handler) -> Message:
+    """Текущий путь"""
+    return Message(handler.vfs.get_current_path_str())
+
+
+def register(registry: CommandRegistry) -> None:
+    """Подключить команды навигации к реестру"""
+    registry.register('dir', cmd_dir, args='[ключ]', aliases=('ls',), group='navigation',
+                      help='Показать содержимое текущей директории')
+    registry.register('cd', cmd_cd, args='[папка...]', aliases=('chdir',), group='navigation',
+                      help='Перейти в указанную папку (cd .. - на уровень выше)')
+    registry.register('pwd', cmd_pwd, group='navigation', help='Показать текущий путь')
@@ -0,0 +1,57 @@
+"""
+Системные команды: help, score, version
+"""
+
+import os
+import sys
+from typing import Optional, Union
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import DEFAULT_DATA, VERSION_STRING
+from voider_dos.commands.command_handler import CommandRegistry
+from voider_dos.core.results import Listing, Message, Scores, error
+
+# Заголовки групп команд в справке
+GROUP_TITLES = {
+    'navigation': 'Навигация',
+    'files': 'Работа с файлами',
+    'decryption': 'Шифрование',
+    'system': 'Системные команды',
+    'session': 'Сессия',
+    'ui': 'Терминал',
+}
+
+
+def cmd_help(handler, name: Optional[str]) -> Union[Listing, Message]:
+    """Справка: общая или по одной команде (help decode)"""
+    if name is None:
+        return Listing(DEFAULT_DATA['help_text'].strip('\n').split('\n'))
+
+    try:
+        command = handler.registry.resolve(name)
+    except ValueError as e:
+        return error(str(e))
+
+    lines = [f"{command.usage} - {command.help}"]
+    if command.aliases:
+        lines.append(f"Псевдонимы: {', '.join(command.aliases)}")
+    lines.append(f"Группа: {GROUP_TITLES.get(command.group, command.group)}")
+    return Listing(lines)
+
+
+def cmd_score(handler) -> Scores:
+    """Счет сессии и общий счет"""
+    return Scores(handler.game_state.session_score, handler.game_state.total_score)
+
+
+def cmd_version(handler) -> Message:
+    """Версия игры"""
+    return Message(VERSION_STRING)
+
+
+def register(registry: CommandRegistry) -> None:
+    """Подключить системные команды к реестру"""
+    registry.register('help', cmd_help, args='[команда]', aliases=('?',), help='Справка по командам')
+    registry.register('score', cmd_score, help='Показать текущий счет')
+    registry.register('version', cmd_version, aliases=('ver',), help='Версия игры')
@@ -0,0 +1,142 @@
+"""
+Класс AchievementEngine: достижения по порогам счетчиков
+
+Достижения описываются данными (config.ACHIEVEMENTS: счетчик, порог,
+название). Для каждого счетчика хранится очередь еще не открытых порогов
+по возрастанию, поэтому обновление счетчика проверяет только ближайший
+порог - O(1) в среднем независимо от числа достижений. Открытия
+рассылаются подписчикам как события.
+"""
+
+import os
+import sys
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import ACHIEVEMENTS
+
+# Подписчик получает ключ достижения и его описание из конфигурации
+AchievementListener = Callable[[str, Dict[str, Any]], None]
+
+
+class AchievementEngine:
+    """Проверка достижений по очередям порогов"""
+
+    def __init__(self, definitions: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Args:
+            definitions: Описания достижений (по умолчанию config.ACHIEVEMENTS)
+        """
+        self.definitions = ACHIEVEMENTS if definitions is None else definitions
+        self._pending: Dict[str, Deque[Tuple[float, str]]] = {}
+        self._listeners: List[AchievementListener] = []
+        self.reset()
+
+    def subscribe(self, listener: AchievementListener) -> None:
+        """Подписаться на открытие достижений"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: AchievementListener) -> None:
+        """Отписаться от открытия достижений (неизвестный подписчик игнорируется)"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def reset(self, unlocked: Optional[Dict[str, bool]] = None) -> None:
+        """
+        Перестроить очереди порогов, пропустив уже открытые достижения
+
+        Args:
+            unlocked: Состояние достижений {ключ: открыто}
+        """
+        unlocked = unlocked or {}
+        thresholds: Dict[str, List[Tuple[float, str]]] = {}
+        for key, definition in self.definitions.items():
+            if not unlocked.get(key):
+                thresholds.setdefault(definition['stat'], []).append((definition['threshold'], key))
+
+        self._pending = {stat: deque(sorted(items)) for stat, items in thresholds.items()}
+
+    def update(self, stat: str, value: float) -> List[str]:
+        """
+        Сообщить новое значение счетчика
+
+        Args:
+            stat: Имя счетчика
+            value: Новое значение
+
+        Returns:
+            Ключи открытых этим обновлением достижений
+        """
+        queue = self._pending.get(stat)
+        if not queue or queue[0][0] > value:
+            return []
+
+        unlocked = []
+        while queue and queue[0][0] <= value:
+            unlocked.append(queue.popleft()[1])
+
+        for key in unlocked:
+            for listener in self._listeners:
+                listener(key, self.definitions[key])
+        return unlocked
+
+    def catch_up(self, stats: Dict[str, float]) -> List[str]:
+        """
+        Проверить сразу все счетчики (после загрузки или смены описаний)
+
+        Args:
+            stats: Текущие значения счетчиков
+
+        Returns:
+            Ключи открытых достижений
+        """
+        unlocked = []
+        for stat in list(self._pending):
+            unlocked.extend(self.update(stat, stats.get(stat, 0)))
+        return unlocked
+
+    @property
+    def stats(self) -> List[str]:
+        """Счетчики, у которых остались неоткрытые пороги"""
+        return [stat for stat, queue in self._pending.items() if queue]
+
+    def name(self, key: str) -> str:
+        """Читаемое название достижения"""
+        definition = self.definitions.get(key)
+        return definition['name'] if definition else key
+
+
+# Тестирование класса (если файл запущен напрямую)
+if __name__ == "__main__":
+    import time
+
+    print("Тестирование AchievementEngine...")
+
+    engine = AchievementEngine()
+    events = []
+    engine.subscribe(lambda key, definition: events.append(key))
+
+    for value in range(1, 12):
+        engine.update('directories_decrypted', value)
+    status = "✓" if events == ['first_decryption', 'master_decryptor'] else "✗"
+    print(f"  {status} Открыты по порядку: {events}")
+
+    engine.reset({'first_decryption': True})
+    events.clear()
+    engine.catch_up({'directories_decrypted': 5, 'files_opened': 25})
+    print(f"  {'✓' if events == ['void_explorer'] else '✗'} После загрузки: {events}")
+
+    # 400 достижений на одном счетчике: стоимость обновления не растет
+    many = {f'level_{i}': {'name': f'Уровень {i}', 'description': '', 'stat': 'files_opened', 'threshold': i * 10}
+            for i in range(1, 401)}
+    for definitions in (dict(list(many.items())[:4]), many):
+        engine = AchievementEngine(definitions)
+        start = time.perf_counter()
+        for value in range(100000):
+            engine.update('files_opened', value)
+        elapsed = time.perf_counter() - start
+        print(f"  {len(definitions):>3} достижений: 100000 обновлений за {elapsed * 1000:.1f} мс")
+
+    print("\nТестирование завершено!")
@@ -0,0 +1,109 @@
+"""
+Класс AutoSaver: фоновое автосохранение состояния игры
+
+Поток просыпается раз в SAVES['auto_save_interval'] секунд (или по
+request_save) и сохраняет GameState, только если с прошлого сохранения
+были изменения. Несколько запросов подряд сливаются в одно сохранение,
+а игровой цикл никогда не ждет записи на диск.
+"""
+
+import os
+import sys
+import threading
+from typing import Optional
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import SAVES
+
+
+class AutoSaver:
+    """Фоновое автосохранение с отслеживанием изменений"""
+
+    def __init__(self, game_state, interval: Optional[float] = None):
+        """
+        Args:
+            game_state: Состояние игры (GameState)
+            interval: Интервал автосохранения в секундах (по умолчанию из SAVES)
+        """
+        self.game_state = game_state
+        self.interval = SAVES['auto_save_interval'] if interval is None else interval
+        self.saves_done = 0
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Запустить фоновый поток (повторный вызов ничего не делает)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='voider-autosave', daemon=True)
+        self._thread.start()
+
+    def request_save(self) -> None:
+        """Попросить сохранить как можно скорее (запросы до сохранения сливаются)"""
+        self._wake.set()
+
+    def stop(self, flush: bool = True) -> None:
+        """
+        Остановить поток
+
+        Args:
+            flush: Сохранить оставшиеся изменения перед выходом
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if flush and self.game_state.dirty:
+            self._save()
+
+    def _run(self) -> None:
+        """Цикл потока: ждем интервал или запрос, сохраняем при изменениях"""
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            if self.game_state.dirty:
+                self._save()
+
+    def _save(self) -> None:
+        """Сохранить без вывода в консоль (поток не должен портить ввод игрока)"""
+        if self.game_state.save(verbose=False):
+            self.saves_done += 1
+
+
+# Тестирование класса (если файл запущен напрямую)
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from game_states import GameState
+
+    print("Тестирование AutoSaver...")
+
+    os.chdir(tempfile.mkdtemp())
+    state = GameState()
+    saver = AutoSaver(state, interval=0.05)
+    saver.start()
+
+    state.start_new_session(seed=42)
+    state.add_score(10)
+    time.sleep(0.2)
+    print(f"  {'✓' if not state.dirty and saver.saves_done >= 1 else '✗'} Изменения сохранены в фоне")
+
+    saves = saver.saves_done
+    time.sleep(0.2)
+    print(f"  {'✓' if saver.saves_done == saves else '✗'} Без изменений сохранений нет")
+
+    state.add_score(5)
+    saver.stop()
+    loaded = GameState()
+    loaded.load()
+    print(f"  {'✓' if loaded.total_score == 15 else '✗'} Изменения сохранены при остановке")
+
+    print("\nТестирование завершено!")
@@ -0,0 +1,635 @@
+"""
+Реестр шифров: каждый шифр - класс-плагин с encode/decode/info/detect
+
+Встроенные шифры регистрируются при импорте модуля. Моды добавляют свои
+шифры через register_cipher, не трогая ядро и config.py:
+
+    @register_cipher
+    class MyCipher(BaseCipher):
+        name = 'my'
+        weight = 10
+        ...
+"""
+
+import binascii
+import itertools
+import os
+import random
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import CIPHERS
+from voider_dos.core import cipher_streams
+from voider_dos.core.cipher_streams import StreamCodec
+
+
+# ==================== ПРИЗНАКИ ТЕКСТА ДЛЯ АВТООПРЕДЕЛЕНИЯ ====================
+
+# Классы символов (битовые маски)
+CLASS_BIN = 1      # 0 и 1
+CLASS_DEC = 2      # 0-9
+CLASS_HEX = 4      # 0-9, A-F, a-f
+CLASS_B64 = 8      # алфавит Base64 без дополнения
+CLASS_ALPHA = 16   # латинские буквы
+CLASS_PAD = 32     # '=' (дополнение Base64)
+
+_UPPER = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_LOWER = 'abcdefghijklmnopqrstuvwxyz'
+_DIGITS = '0123456789'
+
+_CHAR_CLASSES: Dict[str, int] = {}
+for _c in _UPPER + _LOWER:
+    _CHAR_CLASSES[_c] = CLASS_B64 | CLASS_ALPHA
+for _c in 'ABCDEFabcdef':
+    _CHAR_CLASSES[_c] |= CLASS_HEX
+for _c in _DIGITS:
+    _CHAR_CLASSES[_c] = CLASS_DEC | CLASS_HEX | CLASS_B64
+for _c in '01':
+    _CHAR_CLASSES[_c] |= CLASS_BIN
+_CHAR_CLASSES['+'] = CLASS_B64
+_CHAR_CLASSES['/'] = CLASS_B64
+_CHAR_CLASSES['='] = CLASS_PAD
+del _c
+
+
+@dataclass
+class CipherFeatures:
+    """Признаки зашифрованного текста, собранные за один проход"""
+    length: int = 0            # Символов без пробелов
+    tokens: int = 0            # Групп, разделенных пробелами
+    letters: int = 0
+    digits: int = 0
+    upper: int = 0
+    lower: int = 0
+    foreign: int = 0           # Символов вне латиницы, цифр и алфавита Base64
+    pad: int = 0               # Символов '='
+    pad_misplaced: bool = False
+    all_bin8: bool = True      # Все группы - двоичные, не короче 8 бит
+    all_hex2: bool = True      # Все группы - HEX-пары
+    all_dec: bool = True       # Все группы - десятичные коды до 7 цифр
+    has_hex_alpha: bool = False
+
+    @property
+    def grouped(self) -> bool:
+        """Текст состоит из числовых групп (binary/hex/ascii)"""
+        return self.all_bin8 or self.all_hex2 or self.all_dec
+
+
+def extract_features(cipher_text: str) -> Optional[CipherFeatures]:
+    """
+    Собрать признаки текста за один линейный проход
+
+    Args:
+        cipher_text: Зашифрованный текст
+
+    Returns:
+        Признаки текста или None для пустой строки
+    """
+    text = cipher_text.strip()
+    if not text:
+        return None
+
+    features = CipherFeatures()
+    token_len = 0
+    token_mask = -1  # Пересечение классов символов текущей группы
+
+    # Пробел в конце закрывает последнюю группу
+    for char in itertools.chain(text, ' '):
+        if char.isspace():
+            if token_len:
+                features.tokens += 1
+                if token_len < 8 or not token_mask & CLASS_BIN:
+                    features.all_bin8 = False
+                if token_len != 2 or not token_mask & CLASS_HEX:
+                    features.all_hex2 = False
+                if token_len > 7 or not token_mask & CLASS_DEC:
+                    features.all_dec = False
+                token_len = 0
+                token_mask = -1
+            continue
+
+        cls = _CHAR_CLASSES.get(char, 0)
+        token_mask &= cls
+        token_len += 1
+        features.length += 1
+
+        if cls & CLASS_PAD:
+            features.pad += 1
+        elif features.pad:
+            # Символ после '=' - это не Base64
+            features.pad_misplaced = True
+
+        if cls & CLASS_ALPHA:
+            features.letters += 1
+            if char.isupper():
+                features.upper += 1
+            else:
+                features.lower += 1
+            if cls & CLASS_HEX:
+                features.has_hex_alpha = True
+        elif cls & CLASS_DEC:
+            features.digits += 1
+        elif not cls:
+            features.foreign += 1
+            if char.isalpha():
+                features.letters += 1
+
+    return features
+
+
+# ==================== БАЗОВЫЙ КЛАСС ====================
+
+class BaseCipher:
+    """Базовый класс шифра-плагина"""
+
+    # Идентификатор типа шифра (hex, ascii, ...)
+    name: str = ''
+    # Вес при случайном выборе шифра для директории
+    weight: int = 0
+    # Требуется ли ключ (сдвиг) для шифрования и дешифрования
+    keyed: bool = False
+    # С какой глубины директорий шифр участвует в случайном выборе
+    min_depth: int = 0
+    # Сохраняет ли шифр форму текста (сдвиговые шифры): два таких слоя
+    # подряд в цепочке не ставятся - они сливаются в один
+    preserves_shape: bool = False
+    # Ключ подбирается дорогим анализом: при взломе цепочки шифр проверяется,
+    # только если детектор его распознал
+    detect_required: bool = False
+    # Описание для команды ciphers и режима практики
+    info: Dict[str, str] = {}
+
+    def encode(self, text: str, key: Any = None) -> str:
+        """Зашифровать текст"""
+        raise NotImplementedError
+
+    def decode(self, text: str, key: Any = None) -> str:
+        """Расшифровать текст (ValueError при неверном формате)"""
+        raise NotImplementedError
+
+    def detect(self, features: CipherFeatures) -> float:
+        """Уверенность (0.0-1.0), что текст с такими признаками зашифрован этим шифром"""
+        return 0.0
+
+    def random_key(self) -> Any:
+        """Случайный ключ для шифрования (None для шифров без ключа)"""
+        return None
+
+    def candidate_keys(self, text: str) -> List[Any]:
+        """Ключи, которые стоит перебрать при взломе текста"""
+        return [None]
+
+    def stream_encoder(self, key: Any = None) -> StreamCodec:
+        """Потоковый шифратор"""
+        raise ValueError(f"Шифр {self.name} не поддерживает потоковую обработку")
+
+    def stream_decoder(self, key: Any = None) -> StreamCodec:
+        """Потоковый дешифратор"""
+        raise ValueError(f"Шифр {self.name} не поддерживает потоковую обработку")
+
+    def _require_key(self, key: Any) -> Any:
+        if key is None:
+            raise ValueError(f"Для {self.info.get('name', self.name)} шифра требуется параметр shift")
+        return key
+
+
+# ==================== РЕЕСТР ====================
+
+_CIPHERS: Dict[str, BaseCipher] = {}
+_CIPHER_LIST: List[BaseCipher] = []       # Индекс в списке - номер типа шифра
+_TYPE_IDS: Dict[str, int] = {}
+_ENABLED: List[str] = []
+
+# Кэш для get_random_cipher: глубина -> (имена, накопленные веса)
+_choice_tables: Dict[Optional[int], Tuple[List[str], List[int]]] = {}
+
+
+def register_cipher(cipher: Any = None, weight: Optional[int] = None,
+                    enabled: bool = True) -> Any:
+    """
+    Зарегистрировать шифр (можно использовать как декоратор класса)
+
+    Args:
+        cipher: Класс шифра или его экземпляр
+        weight: Вес при случайном выборе (по умолчанию - атрибут класса)
+        enabled: Участвует ли шифр в генерации и списке шифров
+
+    Returns:
+        Переданный класс или экземпляр
+    """
+    if cipher is None:
+        return lambda c: register_cipher(c, weight=weight, enabled=enabled)
+
+    instance = cipher() if isinstance(cipher, type) else cipher
+    if not instance.name:
+        raise ValueError("У шифра должен быть задан атрибут name")
+    if weight is not None:
+        instance.weight = weight
+
+    if instance.name in _CIPHERS:
+        # Повторная регистрация заменяет шифр, сохраняя его номер
+        _CIPHER_LIST[_TYPE_IDS[instance.name]] = instance
+    else:
+        _TYPE_IDS[instance.name] = len(_CIPHER_LIST)
+        _CIPHER_LIST.append(instance)
+    _CIPHERS[instance.name] = instance
+
+    if enabled and instance.name not in _ENABLED:
+        _ENABLED.append(instance.name)
+    elif not enabled and instance.name in _ENABLED:
+        _ENABLED.remove(instance.name)
+
+    _choice_tables.clear()
+    return cipher
+
+
+def get_cipher(cipher_type: str) -> BaseCipher:
+    """
+    Получить шифр по типу
+
+    Raises:
+        ValueError: если шифр не зарегистрирован
+    """
+    try:
+        return _CIPHERS[cipher_type]
+    except KeyError:
+        raise ValueError(f"Неизвестный тип шифра: {cipher_type}")
+
+
+def has_cipher(cipher_type: str) -> bool:
+    """Зарегистрирован ли шифр"""
+    return cipher_type in _CIPHERS
+
+
+def type_id(cipher_type: str) -> int:
+    """Номер типа шифра (для компактного хранения)"""
+    try:
+        return _TYPE_IDS[cipher_type]
+    except KeyError:
+        raise ValueError(f"Неизвестный тип шифра: {cipher_type}")
+
+
+def cipher_by_id(cipher_id: int) -> BaseCipher:
+    """Шифр по номеру типа"""
+    return _CIPHER_LIST[cipher_id]
+
+
+def enabled_ciphers() -> List[BaseCipher]:
+    """Включенные шифры в порядке регистрации"""
+    return [_CIPHERS[name] for name in _ENABLED]
+
+
+def choose_random_cipher(depth: Optional[int] = None) -> str:
+    """
+    Случайный тип шифра с учетом весов
+
+    Args:
+        depth: Глубина директории (None - без ограничения min_depth)
+    """
+    table = _choice_tables.get(depth)
+    if table is None:
+        names = [name for name in _ENABLED
+                 if _CIPHERS[name].weight > 0 and (depth is None or _CIPHERS[name].min_depth <= depth)]
+        table = _choice_tables[depth] = (names, list(itertools.accumulate(_CIPHERS[name].weight for name in names)))
+
+    names, cum_weights = table
+    return random.choices(names, cum_weights=cum_weights, k=1)[0]
+
+
+# ==================== ВСТРОЕННЫЕ ШИФРЫ ====================
+
+class HexCipher(BaseCipher):
+    """HEX: байты UTF-8 парами через пробел"""
+
+    name = 'hex'
+    info = {
+        'name': 'HEX',
+        'description': 'Шестнадцатеричное представление текста',
+        'example': '48 65 6C 6C 6F → Hello',
+        'hint': 'Каждые два символа HEX представляют один байт (символ ASCII)'
+    }
+
+    def encode(self, text: str, key: Any = None) -> str:
+        return text.encode('utf-8').hex(' ').upper()
+
+    def decode(self, text: str, key: Any = None) -> str:
+        # bytes.fromhex сам пропускает пробелы, убираем только двоеточия
+        try:
+            return bytes.fromhex(text.replace(':', '')).decode('utf-8')
+        except ValueError as e:
+            raise ValueError(f"Неверный HEX формат: {e}")
+
+    def detect(self, features: CipherFeatures) -> float:
+        if not features.all_hex2:
+            return 0.0
+        return 0.95 if features.has_hex_alpha else 0.7
+
+    def stream_encoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.HexEncoder()
+
+    def stream_decoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.HexDecoder()
+
+
+class AsciiCipher(BaseCipher):
+    """ASCII: десятичные коды символов через пробел"""
+
+    name = 'ascii'
+    info = {
+        'name': 'ASCII',
+        'description': 'Коды символов в десятичной системе',
+        'example': '72 101 108 108 111 → Hello',
+        'hint': 'Числа разделены пробелами, каждое число - код символа'
+    }
+
+    def encode(self, text: str, key: Any = None) -> str:
+        return ' '.join(map(str, map(ord, text)))
+
+    def decode(self, text: str, key: Any = None) -> str:
+        try:
+            return ''.join(map(chr, map(int, text.split())))
+        except (ValueError, OverflowError) as e:
+            raise ValueError(f"Неверный ASCII формат: {e}")
+
+    def detect(self, features: CipherFeatures) -> float:
+        if not features.all_dec or features.all_bin8:
+            return 0.0
+        return 0.6 if features.all_hex2 else 0.9
+
+    def stream_encoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.AsciiEncoder()
+
+    def stream_decoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.AsciiDecoder()
+
+
+# Таблицы 8-битных групп для быстрого пути binary
+_BIN8 = [format(i, '08b') for i in range(256)]
+_BIN8_CHARS = {group: chr(i) for i, group in enumerate(_BIN8)}
+
+
+class BinaryCipher(BaseCipher):
+    """Binary: двоичные коды символов (не короче 8 бит) через пробел"""
+
+    name = 'binary'
+    info = {
+        'name': 'Binary',
+        'description': 'Двоичное представление текста',
+        'example': '01001000 01100101 01101100 01101100 01101111 → Hello',
+        'hint': 'Каждый блок из 8 бит представляет один символ'
+    }
+
+    def encode(self, text: str, key: Any = None) -> str:
+        return ' '.join([_BIN8[code] if code < 256 else format(code, '08b')
+                         for code in map(ord, text)])
+
+    def decode(self, text: str, key: Any = None) -> str:
+        try:
+            return ''.join([_BIN8_CHARS.get(group) or chr(int(group, 2))
+                            for group in text.split()])
+        except (ValueError, OverflowError) as e:
+            raise ValueError(f"Неверный двоичный формат: {e}")
+
+    def detect(self, features: CipherFeatures) -> float:
+        return 0.98 if features.all_bin8 else 0.0
+
+    def stream_encoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.BinaryEncoder()
+
+    def stream_decoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.BinaryDecoder()
+
+
+class Base64Cipher(BaseCipher):
+    """Base64 поверх байтов UTF-8"""
+
+    name = 'base64'
+    info = {
+        'name': 'Base64',
+        'description': 'Кодирование Base64',
+        'example': 'SGVsbG8= → Hello',
+        'hint': 'Использует символы A-Z, a-z, 0-9, +, / и = для дополнения'
+    }
+
+    def encode(self, text: str, key: Any = None) -> str:
+        return binascii.b2a_base64(text.encode('utf-8'), newline=False).decode('ascii')
+
+    def decode(self, text: str, key: Any = None) -> str:
+        try:
+            return binascii.a2b_base64(text).decode('utf-8')
+        except Exception as e:
+            raise ValueError(f"Неверный Base64 формат: {e}")
+
+    def detect(self, features: CipherFeatures) -> float:
+        if (features.tokens != 1 or features.foreign or features.all_dec
+                or features.pad > 2 or features.pad_misplaced or features.length % 4):
+            return 0.0
+        confidence = 0.55
+        if features.pad:
+            confidence += 0.35
+        elif features.upper and features.lower and features.digits:
+            confidence += 0.2
+        return confidence
+
+    def stream_encoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.Base64Encoder()
+
+    def stream_decoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.Base64Decoder()
+
+
+def _shift_detect(features: CipherFeatures, scale: float, digit_bonus: float) -> float:
+    """Уверенность для сдвиговых шифров: различить их можно только частотным анализом"""
+    if not features.letters or features.grouped:
+        return 0.0
+    ratio = features.letters / features.length
+    return round(scale * ratio + (digit_bonus if features.digits else 0.0), 2)
+
+
+class Rot13Cipher(BaseCipher):
+    """ROT13: сдвиг латинских букв на 13 позиций"""
+
+    name = 'rot13'
+    preserves_shape = True
+    info = {
+        'name': 'ROT13',
+        'description': 'Шифр сдвига букв на 13 позиций',
+        'example': 'Uryyb → Hello',
+        'hint': 'A ↔ N, B ↔ O, C ↔ P и т.д. Самодвойственный шифр'
+    }
+
+    _TABLE = cipher_streams.shift_table(13, shift_digits=False)
+
+    def encode(self, text: str, key: Any = None) -> str:
+        return text.translate(self._TABLE)
+
+    def decode(self, text: str, key: Any = None) -> str:
+        # ROT13 - самодвойственный шифр (дешифрование = шифрование)
+        return text.translate(self._TABLE)
+
+    def detect(self, features: CipherFeatures) -> float:
+        return _shift_detect(features, 0.45, 0.0)
+
+    def stream_encoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.Rot13Codec()
+
+    def stream_decoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.Rot13Codec()
+
+
+class CaesarCipher(BaseCipher):
+    """Caesar: сдвиг латинских букв (по модулю 26) и цифр (по модулю 10)"""
+
+    name = 'caesar'
+    keyed = True
+    preserves_shape = True
+    info = {
+        'name': 'Caesar',
+        'description': 'Классический шифр Цезаря со случайным сдвигом',
+        'example': 'Случайный сдвиг (1-25). Например, при сдвиге 3: Khoor → Hello',
+        'hint': 'Все буквы сдвигаются на одинаковое количество позиций в алфавите'
+    }
+
+    def __init__(self):
+        self._tables: Dict[int, Dict[int, int]] = {}
+
+    def _table(self, shift: int) -> Dict[int, int]:
+        table = self._tables.get(shift)
+        if table is None:
+            table = self._tables[shift] = cipher_streams.shift_table(shift, shift_digits=True)
+        return table
+
+    def encode(self, text: str, key: Any = None) -> str:
+        return text.translate(self._table(self._require_key(key)))
+
+    def decode(self, text: str, key: Any = None) -> str:
+        return text.translate(self._table(-self._require_key(key)))
+
+    def detect(self, features: CipherFeatures) -> float:
+        return _shift_detect(features, 0.4, 0.05)
+
+    def random_key(self) -> int:
+        # Случайный сдвиг из диапазона в конфиге
+        min_shift, max_shift = CIPHERS['caesar_shift_range']
+        return random.randint(min_shift, max_shift)
+
+    def candidate_keys(self, text: str) -> List[int]:
+        return list(range(1, 26))
+
+    def stream_encoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.CaesarEncoder(self._require_key(key))
+
+    def stream_decoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.CaesarDecoder(self._require_key(key))
+
+
+def _random_key_text(length_range: Tuple[int, int], alphabet: str) -> str:
+    """Случайный ключ-строка длины из диапазона в конфиге"""
+    return ''.join(random.choices(alphabet, k=random.randint(*length_range)))
+
+
+class VigenereCipher(BaseCipher):
+    """Vigenère: сдвиг латинских букв на буквы повторяющегося ключа"""
+
+    name = 'vigenere'
+    keyed = True
+    preserves_shape = True
+    detect_required = True
+    info = {
+        'name': 'Vigenère',
+        'description': 'Многоалфавитный шифр: каждая буква сдвигается на свою букву ключа',
+        'example': 'Ключ KEY: Rijvs → Hello',
+        'hint': 'Найдите длину ключа (индекс совпадений), затем каждый столбец - как шифр Цезаря'
+    }
+
+    def __init__(self):
+        # LRU-кэш таблиц по (ключ, направление): решатель перебирает много ключей
+        self._tables = lru_cache(maxsize=CIPHERS['cache_size'])(cipher_streams.vigenere_tables)
+
+    def _key_tables(self, key: Any, decrypt: bool) -> List[Dict[str, str]]:
+        return self._tables(self._require_key(key), decrypt)
+
+    def encode(self, text: str, key: Any = None) -> str:
+        return cipher_streams.vigenere_apply(text, self._key_tables(key, False))[0]
+
+    def decode(self, text: str, key: Any = None) -> str:
+        return cipher_streams.vigenere_apply(text, self._key_tables(key, True))[0]
+
+    def detect(self, features: CipherFeatures) -> float:
+        return _shift_detect(features, 0.35, 0.0)
+
+    def random_key(self) -> str:
+        return _random_key_text(CIPHERS['vigenere_key_length'], _UPPER)
+
+    def candidate_keys(self, text: str) -> List[str]:
+        # Импорт здесь: решатель сам импортирует систему шифров
+        from voider_dos.core.cipher_solver import solve_vigenere
+        return [candidate['key'] for candidate in solve_vigenere(text)]
+
+    def stream_encoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.VigenereCodec(self._require_key(key))
+
+    def stream_decoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.VigenereCodec(self._require_key(key), decrypt=True)
+
+
+class XorCipher(BaseCipher):
+    """XOR: байты UTF-8 складываются с повторяющимся ключом, результат в HEX"""
+
+    name = 'xor'
+    keyed = True
+    detect_required = True
+    info = {
+        'name': 'XOR',
+        'description': 'Побитовый XOR байтов текста с повторяющимся ключом',
+        'example': 'Ключ K: 03 2E 27 27 24 → Hello',
+        'hint': 'Найдите длину ключа по расстоянию Хэмминга между блоками, затем подберите каждый байт'
+    }
+
+    def encode(self, text: str, key: Any = None) -> str:
+        key_bytes = cipher_streams.xor_key_bytes(self._require_key(key))
+        return cipher_streams.xor_bytes(text.encode('utf-8'), key_bytes).hex(' ').upper()
+
+    def decode(self, text: str, key: Any = None) -> str:
+        key_bytes = cipher_streams.xor_key_bytes(self._require_key(key))
+        try:
+            data = bytes.fromhex(text)
+        except ValueError as e:
+            raise ValueError(f"Неверный HEX формат: {e}")
+        try:
+            return cipher_streams.xor_bytes(data, key_bytes).decode('utf-8')
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Неверный ключ XOR: {e}")
+
+    def detect(self, features: CipherFeatures) -> float:
+        # Форма как у HEX: отличить можно только попыткой расшифровать
+        return 0.45 if features.all_hex2 else 0.0
+
+    def random_key(self) -> str:
+        return _random_key_text(CIPHERS['xor_key_length'], _UPPER + _DIGITS)
+
+    def candidate_keys(self, text: str) -> List[Any]:
+        from voider_dos.core.cipher_solver import solve_xor
+        return [candidate['key'] for candidate in solve_xor(text)]
+
+    def stream_encoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.XorEncoder(self._require_key(key))
+
+    def stream_decoder(self, key: Any = None) -> StreamCodec:
+        return cipher_streams.XorDecoder(self._require_key(key))
+
+
+# Регистрация встроенных шифров: веса, минимальная глубина и включение берутся из config.py
+for _cipher_class in (HexCipher, AsciiCipher, BinaryCipher, Base64Cipher, Rot13Cipher, CaesarCipher,
+                      VigenereCipher, XorCipher):
+    _cipher_class.min_depth = CIPHERS['min_depth'].get(_cipher_class.name, 0)
+    register_cipher(
+        _cipher_class,
+        weight=CIPHERS['weights'].get(_cipher_class.name, 0),
+        enabled=_cipher_class.name in CIPHERS['enabled']
+    )
+del _cipher_class
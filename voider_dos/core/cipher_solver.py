@@ -0,0 +1,412 @@
+"""
+Решатель цепочек шифров для The Voider DOS
+
+Ищет последовательность слоев, которыми был зашифрован текст, поиском
+"сначала лучший": каждый снятый слой стоит -log(уверенность детектора),
+поэтому сначала раскрываются самые правдоподобные цепочки. Уже
+встреченные тексты запоминаются, а сами расшифровки кешируются в
+CipherSystem, поэтому одинаковые промежуточные тексты не обрабатываются
+повторно.
+"""
+
+import heapq
+import itertools
+import math
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import CIPHERS, DEFAULT_DATA
+from voider_dos.core import cipher_registry
+from voider_dos.core.cipher_streams import xor_bytes
+from voider_dos.core.cipher_system import CipherSystem
+from voider_dos.core.frequency import (
+    byte_score, index_of_coincidence, letter_counts, shift_scores, xor_key_scores
+)
+
+# Минимальная уверенность: шифр, не распознанный детектором, все равно
+# проверяется, но в последнюю очередь
+MIN_CONFIDENCE = 0.02
+
+# Похоже ли на имя директории или файла
+_NAME_PATTERN = re.compile(r'[A-Za-z][A-Za-z0-9_.\-]*')
+
+
+def is_plausible_name(text: str) -> bool:
+    """
+    Проверить, похож ли текст на открытое имя (а не на очередной слой шифра)
+
+    Args:
+        text: Проверяемый текст
+
+    Returns:
+        True, если текст похож на имя
+    """
+    if not _NAME_PATTERN.fullmatch(text):
+        return False
+
+    # Имя не должно уверенно определяться как шифр, меняющий форму текста
+    for candidate in CipherSystem.detect_cipher(text):
+        cipher = cipher_registry.get_cipher(candidate['type'])
+        if not cipher.preserves_shape and candidate['confidence'] > 0.6:
+            return False
+    return True
+
+
+def _has_layer_evidence(text: str) -> bool:
+    """Есть ли признаки шифра, меняющего форму текста"""
+    return any(not cipher_registry.get_cipher(candidate['type']).preserves_shape
+               for candidate in CipherSystem.detect_cipher(text))
+
+
+def _compatible(cipher: cipher_registry.BaseCipher,
+                previous: Optional[cipher_registry.BaseCipher]) -> bool:
+    """Могут ли два шифра стоять в цепочке рядом (правила CipherSystem.create_chain)"""
+    if previous is None:
+        return True
+    return cipher.name != previous.name and not (cipher.preserves_shape and previous.preserves_shape)
+
+
+def _candidates(text: str) -> List[Tuple[cipher_registry.BaseCipher, float]]:
+    """
+    Включенные шифры с уверенностью детектора
+
+    Нераспознанные шифры получают минимальную уверенность, а шифры с
+    дорогим подбором ключа (detect_required) без распознавания пропускаются.
+    """
+    detected = {candidate['type']: candidate['confidence']
+                for candidate in CipherSystem.detect_cipher(text)}
+    return [(cipher, max(detected.get(cipher.name, 0.0), MIN_CONFIDENCE))
+            for cipher in cipher_registry.enabled_ciphers()
+            if cipher.name in detected or not cipher.detect_required]
+
+
+def solve_chain(cipher_text: str,
+                is_goal: Optional[Callable[[str], bool]] = None,
+                max_layers: Optional[int] = None,
+                max_expansions: int = 2000) -> Optional[Dict[str, Any]]:
+    """
+    Найти цепочку шифров, снимающую все слои с текста
+
+    Args:
+        cipher_text: Зашифрованный текст
+        is_goal: Проверка открытого текста (по умолчанию - is_plausible_name)
+        max_layers: Максимальная глубина цепочки (по умолчанию из CIPHERS['chain'])
+        max_expansions: Ограничение на количество раскрытых текстов
+
+    Returns:
+        Словарь {'chain': [(тип, ключ), ...] в порядке применения, 'text', 'expanded'}
+        или None, если цепочка не найдена
+    """
+    if is_goal is None:
+        is_goal = is_plausible_name
+    if max_layers is None:
+        max_layers = CIPHERS['chain']['max_layers']
+
+    counter = itertools.count()
+    # (стоимость, порядковый номер, текст, снятые слои снаружи внутрь, последний шифр)
+    heap = [(0.0, next(counter), cipher_text, (), None)]
+    visited = {cipher_text}
+    expanded = 0
+
+    while heap and expanded < max_expansions:
+        cost, _, text, layers, previous = heapq.heappop(heap)
+        if len(layers) >= max_layers:
+            continue
+        expanded += 1
+
+        for cipher, confidence in _candidates(text):
+            if not _compatible(cipher, previous):
+                continue
+            step_cost = -math.log(confidence)
+
+            for key in cipher.candidate_keys(text):
+                try:
+                    decoded = CipherSystem.decrypt(text, cipher.name, key)
+                except ValueError:
+                    continue
+                if not decoded or not decoded.isprintable() or decoded in visited:
+                    continue
+                visited.add(decoded)
+
+                chain = layers + ((cipher.name, key),)
+                if is_goal(decoded):
+                    return {'chain': list(reversed(chain)), 'text': decoded, 'expanded': expanded}
+
+                # Шифры с подбором ключа ставятся только первым слоем (см. create_chain)
+                if cipher.detect_required:
+                    continue
+
+                # После сдвигового слоя может идти только шифр, меняющий форму,
+                # поэтому без его признаков ветка бесполезна
+                if cipher.preserves_shape:
+                    if not _has_layer_evidence(decoded):
+                        continue
+                    total = cost + step_cost - math.log(max(CipherSystem._calculate_confidence(decoded),
+                                                            MIN_CONFIDENCE))
+                else:
+                    total = cost + step_cost
+
+                heapq.heappush(heap, (total, next(counter), decoded, chain, cipher))
+
+    return None
+
+
+# ==================== ВЗЛОМ КЛЮЧЕЙ VIGENERE / XOR ====================
+
+_LETTERS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz')
+
+# Известные начала имен директорий: по ним подбирается ключ для коротких
+# текстов, где частотного анализа недостаточно. PREFIX_ нужен для XOR: из
+# 'DIR' выводится не больше 3 байт ключа, из 'DIR_' - 4 (имена вида DIR_866)
+CRIB_WORDS = (DEFAULT_DATA['directory_names'] + DEFAULT_DATA['directory_prefixes'] +
+              [f"{prefix}_" for prefix in DEFAULT_DATA['directory_prefixes']] +
+              [f"{prefix}_{suffix}" for prefix in DEFAULT_DATA['directory_prefixes']
+               for suffix in DEFAULT_DATA['directory_suffixes'] + ['V']])
+
+
+def _crib_variants(cribs: List[str]) -> List[str]:
+    """Слова-подсказки в вариантах регистра, как они встречаются в именах"""
+    variants = []
+    for word in cribs:
+        for variant in (word, word.upper(), word.capitalize()):
+            if variant not in variants:
+                variants.append(variant)
+    return variants
+
+
+def _periodic_prefix(derived: List[int], key_length: int) -> bool:
+    """Повторяется ли выведенная последовательность ключа с периодом key_length"""
+    return all(derived[i] == derived[i % key_length] for i in range(key_length, len(derived)))
+
+
+def _minimal_period(key: Any) -> Any:
+    """Сократить ключ до минимального периода (ABCABC -> ABC)"""
+    size = len(key)
+    for period in range(1, size):
+        if size % period == 0 and key[:period] * (size // period) == key:
+            return key[:period]
+    return key
+
+
+def _vigenere_key_lengths(letters: str, max_key_length: int) -> List[int]:
+    """
+    Длины ключа Vigenère по убыванию среднего индекса совпадений столбцов
+
+    При верной длине каждый столбец - обычный сдвиг, и его индекс
+    совпадений близок к английскому, при неверной - к равномерному шуму.
+    """
+    scores = []
+    for key_length in range(1, min(max_key_length, len(letters)) + 1):
+        columns = [letters[i::key_length] for i in range(key_length)]
+        iocs = [index_of_coincidence(letter_counts(column)) for column in columns if len(column) > 1]
+        average = sum(iocs) / len(iocs) if iocs else 0.0
+        # Небольшой штраф за длину: кратные длины дают тот же индекс
+        scores.append((average - 0.002 * key_length, key_length))
+
+    scores.sort(reverse=True)
+    return [key_length for _, key_length in scores]
+
+
+def _vigenere_crib_keys(letters: str, cribs: Optional[List[str]]) -> List[str]:
+    """Ключи Vigenère, при которых текст начинается с одного из известных слов"""
+    min_length, max_length = CIPHERS['vigenere_key_length']
+    keys = []
+    for word in _crib_variants(CRIB_WORDS if cribs is None else cribs):
+        # letters - только буквы шифротекста, слово сравнивается тоже без '_' и цифр
+        word = ''.join(w for w in word.upper() if w in _LETTERS)
+        derived = [(ord(c) - ord(w)) % 26 for c, w in zip(letters, word)]
+        for key_length in range(min_length, min(max_length, len(derived)) + 1):
+            if _periodic_prefix(derived, key_length):
+                keys.append(''.join(chr(ord('A') + shift) for shift in derived[:key_length]))
+    return keys
+
+
+def solve_vigenere(cipher_text: str, max_key_length: Optional[int] = None,
+                   limit: int = 3, cribs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Подобрать ключ Vigenère частотным анализом
+
+    Длина ключа оценивается индексом совпадений, затем каждый столбец
+    решается как шифр Цезаря критерием хи-квадрат. Для коротких текстов
+    (имен) дополнительно проверяются ключи по известным словам CRIB_WORDS.
+
+    Args:
+        cipher_text: Зашифрованный текст
+        max_key_length: Максимальная длина ключа (по умолчанию из конфига)
+        limit: Сколько длин ключа проверить
+        cribs: Слова, с которых может начинаться открытый текст
+
+    Returns:
+        Список {'key', 'text', 'chi_squared'}, лучшие первыми
+    """
+    if max_key_length is None:
+        max_key_length = CIPHERS['solver_max_key_length']
+
+    letters = ''.join(filter(_LETTERS.__contains__, cipher_text))
+    if not letters:
+        return []
+
+    keys = []
+    for key_length in _vigenere_key_lengths(letters, max_key_length)[:limit]:
+        keys.append(''.join(chr(ord('A') + shift_scores(letter_counts(letters[i::key_length]))[0]['shift'])
+                            for i in range(key_length)))
+    if len(cipher_text) <= CIPHERS['solver_crib_length']:
+        keys.extend(_vigenere_crib_keys(letters.upper(), cribs))
+
+    results = []
+    seen = set()
+    for key in keys:
+        key = _minimal_period(key)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        text = CipherSystem.decrypt(cipher_text, 'vigenere', key)
+        # Хи-квадрат открытого текста при нулевом сдвиге
+        counts = letter_counts(text)
+        chi_squared = next(score['chi_squared'] for score in shift_scores(counts) if score['shift'] == 0)
+        results.append({'key': key, 'text': text, 'chi_squared': chi_squared})
+
+    results.sort(key=lambda x: x['chi_squared'])
+    return results
+
+
+def _xor_key_lengths(data: bytes, max_key_length: int) -> List[int]:
+    """
+    Длины ключа XOR по возрастанию нормированного расстояния Хэмминга
+
+    Соседние блоки длины ключа зашифрованы одинаково, поэтому при верной
+    длине их XOR равен XOR открытых текстов и содержит мало единичных битов.
+    """
+    scores = []
+    for key_length in range(1, min(max_key_length, len(data) // 2) + 1):
+        blocks = [int.from_bytes(data[i:i + key_length], 'little')
+                  for i in range(0, len(data) - key_length + 1, key_length)][:16]
+        pairs = list(zip(blocks, blocks[1:]))
+        distance = sum((a ^ b).bit_count() for a, b in pairs) / (len(pairs) * key_length)
+        scores.append((distance, key_length))
+
+    scores.sort()
+    return [key_length for _, key_length in scores] or [1]
+
+
+def _xor_crib_keys(data: bytes, cribs: Optional[List[str]]) -> List[bytes]:
+    """Ключи XOR, при которых текст начинается с одного из известных слов"""
+    min_length, max_length = CIPHERS['xor_key_length']
+    keys = []
+    for word in _crib_variants(CRIB_WORDS if cribs is None else cribs):
+        derived = list(xor_bytes(data[:len(word)], word.encode('utf-8')))
+        for key_length in range(min_length, min(max_length, len(derived)) + 1):
+            if _periodic_prefix(derived, key_length):
+                keys.append(bytes(derived[:key_length]))
+    return keys
+
+
+def solve_xor(cipher_text: str, max_key_length: Optional[int] = None,
+              limit: int = 3, cribs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Подобрать ключ XOR частотным анализом
+
+    Длина ключа оценивается нормированным расстоянием Хэмминга, затем
+    каждый байт ключа подбирается по весам байтов английского текста.
+    Для коротких текстов (имен) дополнительно проверяются ключи по
+    известным словам CRIB_WORDS.
+
+    Args:
+        cipher_text: Зашифрованный текст (HEX-пары)
+        max_key_length: Максимальная длина ключа (по умолчанию из конфига)
+        limit: Сколько длин ключа проверить
+        cribs: Слова, с которых может начинаться открытый текст
+
+    Returns:
+        Список {'key', 'text', 'score'}, лучшие первыми
+    """
+    if max_key_length is None:
+        max_key_length = CIPHERS['solver_max_key_length']
+
+    try:
+        data = bytes.fromhex(cipher_text)
+    except ValueError:
+        return []
+    if not data:
+        return []
+
+    keys = []
+    for key_length in _xor_key_lengths(data, max_key_length)[:limit]:
+        scores = [xor_key_scores(data[i::key_length]) for i in range(key_length)]
+        keys.append(bytes(max(range(256), key=column.__getitem__) for column in scores))
+    if len(data) <= CIPHERS['solver_crib_length']:
+        keys.extend(_xor_crib_keys(data, cribs))
+
+    results = []
+    seen = set()
+    for key_bytes in keys:
+        key_bytes = _minimal_period(key_bytes)
+        if key_bytes in seen:
+            continue
+        seen.add(key_bytes)
+
+        # Ключи из ASCII храним строкой, как их создает XorCipher.random_key
+        key = key_bytes.decode('ascii') if key_bytes.isascii() else key_bytes
+        plain = xor_bytes(data, key_bytes)
+        try:
+            text = plain.decode('utf-8')
+        except UnicodeDecodeError:
+            continue
+        results.append({'key': key, 'text': text, 'score': round(byte_score(plain) / len(plain), 4)})
+
+    results.sort(key=lambda x: x['score'], reverse=True)
+    return results
+
+
+def describe_chain(chain: List[Tuple[str, Any]]) -> str:
+    """
+    Описание цепочки для подсказки (без открытого текста)
+
+    Args:
+        chain: Слои (тип, ключ) в порядке применения
+
+    Returns:
+        Строка вида "HEX → Base64"
+    """
+    return ' → '.join(CipherSystem.get_cipher_info(cipher_type)['name'] for cipher_type, _ in chain)
+
+
+# Тестирование модуля (если файл запущен напрямую)
+if __name__ == "__main__":
+    import random
+    import time
+
+    print("Тестирование решателя цепочек шифров...")
+
+    random.seed(42)
+    names = ['System32', 'DATA_417', 'MOD_V3', 'Config', 'SEC_BETA', 'Program7']
+    solved = 0
+    start = time.perf_counter()
+
+    for name in names * 3:
+        record = CipherSystem.create_chain(name, random.randint(1, CIPHERS['chain']['max_layers']))
+        result = solve_chain(record.render(name), is_goal=lambda text, name=name: text == name)
+        ok = result is not None and result['text'] == name
+        solved += ok
+        print(f"  {'✓' if ok else '✗'} {record!r}: "
+              f"{describe_chain(result['chain']) if result else '-'}")
+
+    elapsed = time.perf_counter() - start
+    print(f"\nРешено: {solved}/{len(names) * 3} за {elapsed:.3f} сек")
+
+    # Взлом ключей на тексте длины содержимого файла
+    body = ("The void listens to every secret hidden in the system directories "
+            "of this old machine and nobody remembers who wrote them. ") * 4
+    for cipher_type, key, solver in (('vigenere', 'VOIDX', solve_vigenere), ('xor', 'K3Y', solve_xor)):
+        encrypted, _ = CipherSystem.encrypt(body, cipher_type, key)
+        start = time.perf_counter()
+        candidates = solver(encrypted)
+        elapsed = time.perf_counter() - start
+        found = candidates[0]['key'] if candidates else None
+        print(f"  {'✓' if found == key else '✗'} {cipher_type}: ключ {found} за {elapsed * 1000:.1f} мс")
+    print("\nТестирование завершено!")
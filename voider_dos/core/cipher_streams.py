@@ -0,0 +1,520 @@
+"""
+Потоковые кодеки шифров: обработка больших зашифрованных файлов по частям
+
+Каждый кодек принимает куски байтов (bytes, bytearray, memoryview) через
+feed(chunk) -> str и возвращает остаток через finish(). Границы групп
+(HEX-пары, четверки Base64, двоичные и десятичные группы, многобайтные
+символы UTF-8) корректно переносятся между кусками, поэтому файл любого
+размера обрабатывается в постоянной памяти.
+"""
+
+import binascii
+import codecs
+import os
+import sys
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import CIPHERS
+
+Chunk = Union[bytes, bytearray, memoryview]
+
+# Размер куска по умолчанию при чтении файла
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class StreamCodec:
+    """Базовый класс потокового кодека"""
+
+    def feed(self, chunk: Chunk) -> str:
+        """
+        Обработать очередной кусок данных
+
+        Args:
+            chunk: Кусок входных байтов
+
+        Returns:
+            Готовая часть результата (может быть пустой)
+        """
+        raise NotImplementedError
+
+    def finish(self) -> str:
+        """
+        Завершить обработку и вернуть остаток результата
+
+        Returns:
+            Последняя часть результата
+        """
+        return ''
+
+
+class _TextStreamCodec(StreamCodec):
+    """Кодек, работающий с символами: входные байты декодируются как UTF-8"""
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def feed(self, chunk: Chunk) -> str:
+        return self._transform(self._decoder.decode(chunk))
+
+    def finish(self) -> str:
+        return self._transform(self._decoder.decode(b'', final=True))
+
+    def _transform(self, text: str) -> str:
+        raise NotImplementedError
+
+
+class _GroupEncoder(_TextStreamCodec):
+    """Кодирование символов в группы, разделенные пробелами"""
+
+    def __init__(self):
+        super().__init__()
+        self._started = False
+
+    def _transform(self, text: str) -> str:
+        if not text:
+            return ''
+        groups = ' '.join(map(self._encode_char, text))
+        if self._started:
+            return ' ' + groups
+        self._started = True
+        return groups
+
+    def _encode_char(self, char: str) -> str:
+        raise NotImplementedError
+
+
+class _GroupDecoder(StreamCodec):
+    """Декодирование групп, разделенных пробелами (незаконченная группа переносится)"""
+
+    def __init__(self):
+        self._tail = ''
+
+    def feed(self, chunk: Chunk) -> str:
+        text = self._tail + bytes(chunk).decode('ascii', errors='replace')
+        groups = text.split()
+
+        # Последняя группа может продолжиться в следующем куске
+        if groups and not text[-1].isspace():
+            self._tail = groups.pop()
+        else:
+            self._tail = ''
+        return self._decode_groups(groups)
+
+    def finish(self) -> str:
+        groups = self._tail.split()
+        self._tail = ''
+        return self._decode_groups(groups)
+
+    def _decode_groups(self, groups) -> str:
+        try:
+            return ''.join(chr(int(group, self.BASE)) for group in groups)
+        except (ValueError, OverflowError) as e:
+            raise ValueError(f"{self.ERROR} {e}")
+
+
+class _ByteDecoder(StreamCodec):
+    """Декодирование в байты с последующей сборкой символов UTF-8"""
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def _text(self, data: bytes, final: bool = False) -> str:
+        try:
+            return self._decoder.decode(data, final=final)
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Неверная кодировка UTF-8: {e}")
+
+
+# ==================== HEX ====================
+
+class HexEncoder(StreamCodec):
+    """Потоковое шифрование в HEX (пары через пробел)"""
+
+    def __init__(self):
+        self._started = False
+
+    def feed(self, chunk: Chunk) -> str:
+        if not len(chunk):
+            return ''
+        pairs = memoryview(chunk).hex(' ').upper()
+        if self._started:
+            return ' ' + pairs
+        self._started = True
+        return pairs
+
+
+class HexDecoder(_ByteDecoder):
+    """Потоковое дешифрование HEX (нечетная цифра переносится в следующий кусок)"""
+
+    def __init__(self):
+        super().__init__()
+        self._nibble = b''
+
+    def feed(self, chunk: Chunk) -> str:
+        digits = self._nibble + bytes(chunk).translate(None, b' \t\r\n:')
+        if len(digits) % 2:
+            self._nibble = digits[-1:]
+            digits = digits[:-1]
+        else:
+            self._nibble = b''
+        try:
+            data = binascii.unhexlify(digits)
+        except binascii.Error as e:
+            raise ValueError(f"Неверный HEX формат: {e}")
+        return self._text(data)
+
+    def finish(self) -> str:
+        if self._nibble:
+            raise ValueError("Неверный HEX формат: нечетное количество цифр")
+        return self._text(b'', final=True)
+
+
+# ==================== ASCII ====================
+
+class AsciiEncoder(_GroupEncoder):
+    """Потоковое шифрование в десятичные коды символов"""
+
+    def _encode_char(self, char: str) -> str:
+        return str(ord(char))
+
+
+class AsciiDecoder(_GroupDecoder):
+    """Потоковое дешифрование десятичных кодов"""
+
+    BASE = 10
+    ERROR = "Неверный ASCII формат:"
+
+
+# ==================== BINARY ====================
+
+class BinaryEncoder(_GroupEncoder):
+    """Потоковое шифрование в двоичные группы (не короче 8 бит)"""
+
+    def _encode_char(self, char: str) -> str:
+        return format(ord(char), '08b')
+
+
+class BinaryDecoder(_GroupDecoder):
+    """Потоковое дешифрование двоичных групп"""
+
+    BASE = 2
+    ERROR = "Неверный двоичный формат:"
+
+
+# ==================== BASE64 ====================
+
+class Base64Encoder(StreamCodec):
+    """Потоковое шифрование в Base64 (неполная тройка байтов переносится)"""
+
+    def __init__(self):
+        self._carry = b''
+
+    def feed(self, chunk: Chunk) -> str:
+        data = self._carry + bytes(chunk)
+        cut = len(data) - len(data) % 3
+        self._carry = data[cut:]
+        return binascii.b2a_base64(data[:cut], newline=False).decode('ascii')
+
+    def finish(self) -> str:
+        carry, self._carry = self._carry, b''
+        return binascii.b2a_base64(carry, newline=False).decode('ascii')
+
+
+class Base64Decoder(_ByteDecoder):
+    """Потоковое дешифрование Base64 (неполная четверка символов переносится)"""
+
+    def __init__(self):
+        super().__init__()
+        self._carry = b''
+
+    def feed(self, chunk: Chunk) -> str:
+        data = self._carry + bytes(chunk).translate(None, b' \t\r\n')
+        cut = len(data) - len(data) % 4
+        self._carry = data[cut:]
+        return self._text(self._decode(data[:cut]))
+
+    def finish(self) -> str:
+        carry, self._carry = self._carry, b''
+        if carry:
+            raise ValueError("Неверный Base64 формат: неполная группа из 4 символов")
+        return self._text(b'', final=True)
+
+    @staticmethod
+    def _decode(data: bytes) -> bytes:
+        try:
+            return binascii.a2b_base64(data)
+        except binascii.Error as e:
+            raise ValueError(f"Неверный Base64 формат: {e}")
+
+
+# ==================== ROT13 / CAESAR ====================
+
+def shift_table(shift: int, shift_digits: bool) -> Dict[int, int]:
+    """Таблица перевода для сдвигового шифра"""
+    upper = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    lower = 'abcdefghijklmnopqrstuvwxyz'
+    digits = '0123456789'
+
+    source = upper + lower
+    target = upper[shift % 26:] + upper[:shift % 26] + lower[shift % 26:] + lower[:shift % 26]
+    if shift_digits:
+        source += digits
+        target += digits[shift % 10:] + digits[:shift % 10]
+    return str.maketrans(source, target)
+
+
+class _ShiftCodec(_TextStreamCodec):
+    """Потоковый сдвиговый шифр"""
+
+    def __init__(self, shift: int, shift_digits: bool):
+        super().__init__()
+        self._table = shift_table(shift, shift_digits)
+
+    def _transform(self, text: str) -> str:
+        return text.translate(self._table)
+
+
+class Rot13Codec(_ShiftCodec):
+    """Потоковый ROT13 (шифрование и дешифрование совпадают)"""
+
+    def __init__(self):
+        super().__init__(13, shift_digits=False)
+
+
+class CaesarEncoder(_ShiftCodec):
+    """Потоковое шифрование Caesar с известным сдвигом"""
+
+    def __init__(self, shift: int):
+        super().__init__(shift, shift_digits=True)
+
+
+class CaesarDecoder(_ShiftCodec):
+    """Потоковое дешифрование Caesar с известным сдвигом"""
+
+    def __init__(self, shift: int):
+        super().__init__(-shift, shift_digits=True)
+
+
+# ==================== VIGENERE ====================
+
+def vigenere_tables(key: str, decrypt: bool = False) -> List[Dict[str, str]]:
+    """
+    Таблицы перевода для каждой буквы ключа Vigenère
+
+    Args:
+        key: Ключ из латинских букв
+        decrypt: Таблицы для дешифрования (обратный сдвиг)
+
+    Returns:
+        Список словарей {буква: зашифрованная буква}, по одному на букву ключа
+    """
+    if not isinstance(key, str) or not key or not key.isascii() or not key.isalpha():
+        raise ValueError("Ключ Vigenère должен состоять из латинских букв")
+
+    tables = []
+    for key_char in key.upper():
+        shift = ord(key_char) - ord('A')
+        table = shift_table(-shift if decrypt else shift, shift_digits=False)
+        tables.append({chr(source): chr(target) for source, target in table.items()})
+    return tables
+
+
+class VigenereCodec(_TextStreamCodec):
+    """Потоковый Vigenère: позиция в ключе сохраняется между кусками"""
+
+    def __init__(self, key: str, decrypt: bool = False):
+        super().__init__()
+        self._tables = vigenere_tables(key, decrypt)
+        self._position = 0
+
+    def _transform(self, text: str) -> str:
+        result, self._position = vigenere_apply(text, self._tables, self._position)
+        return result
+
+
+def vigenere_apply(text: str, tables: List[Dict[str, str]], position: int = 0) -> Tuple[str, int]:
+    """
+    Применить таблицы Vigenère к тексту (ключ сдвигается только на буквах)
+
+    Args:
+        text: Текст
+        tables: Таблицы из vigenere_tables
+        position: Позиция в ключе перед первым символом
+
+    Returns:
+        Кортеж (результат, позиция в ключе после текста)
+    """
+    size = len(tables)
+    result = []
+    append = result.append
+    for char in text:
+        mapped = tables[position].get(char)
+        if mapped is None:
+            append(char)
+        else:
+            append(mapped)
+            position = (position + 1) % size
+    return ''.join(result), position
+
+
+# ==================== XOR ====================
+
+def xor_key_bytes(key: Union[str, bytes]) -> bytes:
+    """Ключ XOR в байтах (строка кодируется в UTF-8)"""
+    if not isinstance(key, (str, bytes, bytearray)):
+        raise ValueError("Ключ XOR должен быть строкой или байтами")
+    data = key.encode('utf-8') if isinstance(key, str) else bytes(key)
+    if not data:
+        raise ValueError("Ключ XOR не может быть пустым")
+    return data
+
+
+def xor_bytes(data: bytes, key: bytes, offset: int = 0) -> bytes:
+    """
+    Наложить повторяющийся ключ на данные операцией XOR
+
+    XOR выполняется над целыми числами из байтов, а не побайтно в цикле.
+
+    Args:
+        data: Данные
+        key: Ключ
+        offset: Позиция в ключе для первого байта данных
+
+    Returns:
+        Результат той же длины
+    """
+    size = len(data)
+    if not size:
+        return b''
+    offset %= len(key)
+    stream = (key[offset:] + key * (size // len(key) + 1))[:size]
+    return (int.from_bytes(data, 'little') ^ int.from_bytes(stream, 'little')).to_bytes(size, 'little')
+
+
+class XorEncoder(StreamCodec):
+    """Потоковое шифрование XOR с выводом HEX-пар"""
+
+    def __init__(self, key: Union[str, bytes]):
+        self._key = xor_key_bytes(key)
+        self._offset = 0
+        self._hex = HexEncoder()
+
+    def feed(self, chunk: Chunk) -> str:
+        data = xor_bytes(bytes(chunk), self._key, self._offset)
+        self._offset += len(data)
+        return self._hex.feed(data)
+
+
+class XorDecoder(HexDecoder):
+    """Потоковое дешифрование XOR из HEX-пар"""
+
+    def __init__(self, key: Union[str, bytes]):
+        super().__init__()
+        self._key = xor_key_bytes(key)
+        self._offset = 0
+
+    def _text(self, data: bytes, final: bool = False) -> str:
+        data = xor_bytes(data, self._key, self._offset)
+        self._offset += len(data)
+        return super()._text(data, final)
+
+
+# ==================== ФАБРИКИ ====================
+
+def get_encoder(cipher_type: str, shift: Optional[int] = None) -> StreamCodec:
+    """
+    Создать потоковый шифратор
+
+    Args:
+        cipher_type: Тип шифра
+        shift: Ключ (сдвиг для Caesar, строка для Vigenère и XOR)
+
+    Returns:
+        Кодек: на входе байты UTF-8 открытого текста, на выходе шифр
+    """
+    # Импорт здесь: реестр шифров сам импортирует этот модуль
+    from voider_dos.core.cipher_registry import get_cipher
+    return get_cipher(cipher_type).stream_encoder(shift)
+
+
+def get_decoder(cipher_type: str, shift: Optional[int] = None) -> StreamCodec:
+    """
+    Создать потоковый дешифратор
+
+    Args:
+        cipher_type: Тип шифра
+        shift: Ключ (сдвиг для Caesar, строка для Vigenère и XOR)
+
+    Returns:
+        Кодек: на входе байты шифра, на выходе открытый текст
+    """
+    from voider_dos.core.cipher_registry import get_cipher
+    return get_cipher(cipher_type).stream_decoder(shift)
+
+
+def stream_codec(source: BinaryIO, codec: StreamCodec,
+                 write: Callable[[str], Any] = sys.stdout.write,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Прогнать файл через кодек кусками, отдавая результат сразу в write
+
+    Используется один буфер на все чтения, поэтому память не зависит
+    от размера файла.
+
+    Args:
+        source: Файл, открытый в двоичном режиме
+        codec: Потоковый кодек
+        write: Приемник результата (по умолчанию - консоль)
+        chunk_size: Размер куска в байтах
+
+    Returns:
+        Количество прочитанных байтов
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    total = 0
+
+    while True:
+        count = source.readinto(buffer)
+        if not count:
+            break
+        total += count
+        output = codec.feed(view[:count])
+        if output:
+            write(output)
+
+    output = codec.finish()
+    if output:
+        write(output)
+    return total
+
+
+# Тестирование модуля (если файл запущен напрямую)
+if __name__ == "__main__":
+    import io
+    from cipher_system import CipherSystem
+
+    print("Тестирование потоковых кодеков...")
+
+    test_text = "HelloWorld Привет, Пустота! 0123456789 " * 50
+    raw = test_text.encode('utf-8')
+
+    test_keys = {'caesar': 7, 'vigenere': 'VOID', 'xor': 'K3Y'}
+    for cipher_type in CIPHERS['enabled']:
+        shift = test_keys.get(cipher_type)
+        expected, _ = CipherSystem.encrypt(test_text, cipher_type, shift)
+
+        # Шифруем кусками неудобного размера, чтобы проверить границы групп
+        encrypted = io.StringIO()
+        stream_codec(io.BytesIO(raw), get_encoder(cipher_type, shift), encrypted.write, chunk_size=7)
+
+        decrypted = io.StringIO()
+        stream_codec(io.BytesIO(encrypted.getvalue().encode('utf-8')),
+                     get_decoder(cipher_type, shift), decrypted.write, chunk_size=5)
+
+        status = "✓" if encrypted.getvalue() == expected and decrypted.getvalue() == test_text else "✗"
+        print(f"  {status} {cipher_type}")
+
+    print("\nТестирование завершено!")
@@ -1,16 +1,18 @@
 """
 Класс CipherSystem: система шифрования и дешифрования
 Поддерживает: HEX, ASCII, Binary, Base64, ROT13, Caesar
+Сами шифры - плагины из cipher_registry, CipherSystem - фасад над реестром
 """
 
-import base64
-import random
-from typing import Optional, Tuple, Dict, List
+import os
+from typing import Optional, Tuple, Dict, List, Any
 import sys
+from functools import lru_cache
 
 # Добавляем путь для импорта config.py из корня проекта
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from config import CIPHERS
+from voider_dos.core import cipher_registry
 
 class CipherSystem:
     """Система шифрования и дешифрования для THE-VOIDER-DOS"""
@@ -19,33 +21,28 @@ class CipherSystem:
     ALPHABET_UPPER = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
     ALPHABET_LOWER = 'abcdefghijklmnopqrstuvwxyz'
     ALPHABET_DIGITS = '0123456789'
-    
+
     @staticmethod
-    def encrypt(text: str, cipher_type: str) -> Tuple[str, Optional[int]]:
+    def encrypt(text: str, cipher_type: str, shift: Optional[int] = None) -> Tuple[str, Optional[int]]:
         """
         Зашифровать текст указанным методом
         
         Args:
             text: Текст для шифрования
-            cipher_type: Тип шифра (hex, ascii, binary, base64, rot13, caesar)
+            cipher_type: Тип шифра (hex, ascii, binary, base64, rot13, caesar, vigenere, xor)
+            shift: Ключ: сдвиг для Caesar, строка для Vigenère и XOR (если None - случайный)
             
         Returns:
-            Кортеж (зашифрованный_текст, сдвиг_для_caesar или None)
+            Кортеж (зашифрованный_текст, ключ или None)
         """
-        if cipher_type == 'hex':
-            return CipherSystem._encrypt_hex(text), None
-        elif cipher_type == 'ascii':
-            return CipherSystem._encrypt_ascii(text), None
-        elif cipher_type == 'binary':
-            return CipherSystem._encrypt_binary(text), None
-        elif cipher_type == 'base64':
-            return CipherSystem._encrypt_base64(text), None
-        elif cipher_type == 'rot13':
-            return CipherSystem._encrypt_rot13(text), None
-        elif cipher_type == 'caesar':
-            return CipherSystem._encrypt_caesar(text)
-        else:
-            raise ValueError(f"Неизвестный тип шифра: {cipher_type}")
+        cipher = cipher_registry.get_cipher(cipher_type)
+        if not cipher.keyed:
+            return CipherSystem._encrypt_cached(text, cipher_type, None), None
+        if shift is None:
+            # Ключ случайный, поэтому результат не кэшируется
+            shift = cipher.random_key()
+            return cipher.encode(text, shift), shift
+        return CipherSystem._encrypt_cached(text, cipher_type, shift), shift
     
     @staticmethod
     def decrypt(encrypted: str, cipher_type: str, shift: Optional[int] = None) -> str:
@@ -60,176 +57,128 @@ class CipherSystem:
         Returns:
             Расшифрованный текст
         """
-        if cipher_type == 'hex':
-            return CipherSystem._decrypt_hex(encrypted)
-        elif cipher_type == 'ascii':
-            return CipherSystem._decrypt_ascii(encrypted)
-        elif cipher_type == 'binary':
-            return CipherSystem._decrypt_binary(encrypted)
-        elif cipher_type == 'base64':
-            return CipherSystem._decrypt_base64(encrypted)
-        elif cipher_type == 'rot13':
-            return CipherSystem._decrypt_rot13(encrypted)
-        elif cipher_type == 'caesar':
-            if shift is None:
-                raise ValueError("Для Caesar шифра требуется параметр shift")
-            return CipherSystem._decrypt_caesar(encrypted, shift)
-        else:
-            raise ValueError(f"Неизвестный тип шифра: {cipher_type}")
-    
-    @staticmethod
-    def _encrypt_hex(text: str) -> str:
-        """Шифрование в HEX"""
-        # Вариант 1: Без разделителей
-        # return text.encode().hex().upper()
-        
-        # Вариант 2: С разделителями каждые 2 символа (более читаемо)
-        hex_str = text.encode().hex().upper()
-        return ' '.join([hex_str[i:i+2] for i in range(0, len(hex_str), 2)])
-    
-    @staticmethod
-    def _decrypt_hex(encrypted: str) -> str:
-        """Дешифрование HEX"""
-        # Удаляем пробелы и другие разделители
-        clean_hex = encrypted.replace(' ', '').replace(':', '')
-        try:
-            return bytes.fromhex(clean_hex).decode('utf-8')
-        except ValueError as e:
-            raise ValueError(f"Неверный HEX формат: {e}")
+        # Ключ важен только для шифров с ключом - не плодим лишние записи в кэше
+        if not cipher_registry.get_cipher(cipher_type).keyed:
+            shift = None
+        return CipherSystem._decrypt_cached(encrypted, cipher_type, shift)
     
     @staticmethod
-    def _encrypt_ascii(text: str) -> str:
-        """Шифрование в ASCII коды"""
-        ascii_codes = [str(ord(char)) for char in text]
-        return ' '.join(ascii_codes)
+    @lru_cache(maxsize=CIPHERS['cache_size'])
+    def _encrypt_cached(text: str, cipher_type: str, shift: Optional[int]) -> str:
+        """Шифрование с известным ключом (с LRU-кэшем)"""
+        return cipher_registry.get_cipher(cipher_type).encode(text, shift)
     
     @staticmethod
-    def _decrypt_ascii(encrypted: str) -> str:
-        """Дешифрование ASCII кодов"""
-        try:
-            codes = encrypted.split()
-            chars = [chr(int(code)) for code in codes]
-            return ''.join(chars)
-        except ValueError as e:
-            raise ValueError(f"Неверный ASCII формат: {e}")
+    @lru_cache(maxsize=CIPHERS['cache_size'])
+    def _decrypt_cached(encrypted: str, cipher_type: str, shift: Optional[int]) -> str:
+        """Дешифрование (с LRU-кэшем, ошибки не кэшируются)"""
+        return cipher_registry.get_cipher(cipher_type).decode(encrypted, shift)
     
     @staticmethod
-    def _encrypt_binary(text: str) -> str:
-        """Шифрование в двоичный код"""
-        binary_codes = []
-        for char in text:
-            # Преобразуем в 8-битный двоичный код
-            binary = format(ord(char), '08b')
-            binary_codes.append(binary)
-        return ' '.join(binary_codes)
-    
-    @staticmethod
-    def _decrypt_binary(encrypted: str) -> str:
-        """Дешифрование двоичного кода"""
-        try:
-            binaries = encrypted.split()
-            chars = [chr(int(binary, 2)) for binary in binaries]
-            return ''.join(chars)
-        except ValueError as e:
-            raise ValueError(f"Неверный двоичный формат: {e}")
-    
-    @staticmethod
-    def _encrypt_base64(text: str) -> str:
-        """Шифрование в Base64"""
-        encoded = base64.b64encode(text.encode('utf-8')).decode('utf-8')
-        return encoded
-    
-    @staticmethod
-    def _decrypt_base64(encrypted: str) -> str:
-        """Дешифрование Base64"""
-        try:
-            decoded = base64.b64decode(encrypted).decode('utf-8')
-            return decoded
-        except Exception as e:
-            raise ValueError(f"Неверный Base64 формат: {e}")
-    
-    @staticmethod
-    def _encrypt_rot13(text: str) -> str:
-        """Шифрование ROT13"""
-        result = []
-        for char in text:
-            if 'a' <= char <= 'z':
-                # Сдвиг для строчных букв
-                result.append(chr((ord(char) - ord('a') + 13) % 26 + ord('a')))
-            elif 'A' <= char <= 'Z':
-                # Сдвиг для заглавных букв
-                result.append(chr((ord(char) - ord('A') + 13) % 26 + ord('A')))
-            else:
-                # Не-буквы остаются как есть
-                result.append(char)
-        return ''.join(result)
+    def random_key(cipher_type: str) -> Optional[int]:
+        """
+        Получить случайный ключ для шифра
+        
+        Args:
+            cipher_type: Тип шифра
+            
+        Returns:
+            Ключ (сдвиг для Caesar) или None для шифров без ключа
+        """
+        return cipher_registry.get_cipher(cipher_type).random_key()
     
     @staticmethod
-    def _decrypt_rot13(encrypted: str) -> str:
-        """Дешифрование ROT13"""
-        # ROT13 - самодвойственный шифр (дешифрование = шифрование)
-        return CipherSystem._encrypt_rot13(encrypted)
+    def get_cache_stats() -> Dict[str, Dict[str, int]]:
+        """
+        Получить статистику LRU-кэшей шифрования
+        
+        Returns:
+            Словарь {кэш: {'hits', 'misses', 'size', 'maxsize'}}
+        """
+        caches = {
+            'encrypt': CipherSystem._encrypt_cached,
+            'decrypt': CipherSystem._decrypt_cached,
+            'hint': CipherSystem._get_hint,
+        }
+        stats = {}
+        for name, cached in caches.items():
+            info = cached.cache_info()
+            stats[name] = {
+                'hits': info.hits,
+                'misses': info.misses,
+                'size': info.currsize,
+                'maxsize': info.maxsize
+            }
+        return stats
     
     @staticmethod
-    def _encrypt_caesar(text: str) -> Tuple[str, int]:
-        """Шифрование Caesar с случайным сдвигом"""
-        # Генерируем случайный сдвиг из диапазона в конфиге
-        min_shift, max_shift = CIPHERS['caesar_shift_range']
-        shift = random.randint(min_shift, max_shift)
-        
-        result = []
-        for char in text:
-            if 'a' <= char <= 'z':
-                # Сдвиг для строчных букв
-                new_char = chr((ord(char) - ord('a') + shift) % 26 + ord('a'))
-                result.append(new_char)
-            elif 'A' <= char <= 'Z':
-                # Сдвиг для заглавных букв
-                new_char = chr((ord(char) - ord('A') + shift) % 26 + ord('A'))
-                result.append(new_char)
-            elif '0' <= char <= '9':
-                # Сдвиг для цифр (по кругу 0-9)
-                new_char = chr((ord(char) - ord('0') + shift) % 10 + ord('0'))
-                result.append(new_char)
-            else:
-                # Остальные символы без изменений
-                result.append(char)
-        
-        return ''.join(result), shift
+    def clear_cache() -> None:
+        """Очистить LRU-кэши шифрования"""
+        CipherSystem._encrypt_cached.cache_clear()
+        CipherSystem._decrypt_cached.cache_clear()
+        CipherSystem._get_hint.cache_clear()
     
     @staticmethod
-    def _decrypt_caesar(encrypted: str, shift: int) -> str:
-        """Дешифрование Caesar с известным сдвигом"""
-        # Дешифрование = шифрование с обратным сдвигом
-        result = []
-        for char in encrypted:
-            if 'a' <= char <= 'z':
-                new_char = chr((ord(char) - ord('a') - shift) % 26 + ord('a'))
-                result.append(new_char)
-            elif 'A' <= char <= 'Z':
-                new_char = chr((ord(char) - ord('A') - shift) % 26 + ord('A'))
-                result.append(new_char)
-            elif '0' <= char <= '9':
-                new_char = chr((ord(char) - ord('0') - shift) % 10 + ord('0'))
-                result.append(new_char)
-            else:
-                result.append(char)
+    def get_random_cipher(depth: Optional[int] = None) -> str:
+        """
+        Получить случайный тип шифра с учетом весов
         
-        return ''.join(result)
+        Args:
+            depth: Глубина директории: шифры с большей min_depth не выбираются
+            
+        Returns:
+            Тип шифра (hex, ascii, binary, base64, rot13, caesar, vigenere, xor)
+        """
+        # Таблица накопленных весов строится один раз в реестре
+        return cipher_registry.choose_random_cipher(depth)
     
     @staticmethod
-    def get_random_cipher() -> str:
+    def create_chain(text: str, layers: int, depth: Optional[int] = None) -> 'CipherRecord':
         """
-        Получить случайный тип шифра с учетом весов
+        Зашифровать текст цепочкой случайных шифров
+        
+        Два одинаковых шифра и два сдвиговых шифра подряд не ставятся,
+        слой не добавляется, если текст станет длиннее CIPHERS['chain']['max_length'].
         
+        Args:
+            text: Открытый текст
+            layers: Желаемое количество слоев
+            depth: Глубина директории (ограничивает выбор шифров)
+            
         Returns:
-            Тип шифра (hex, ascii, binary, base64, rot13, caesar)
+            Запись шифра с уже вычисленным зашифрованным текстом
         """
-        ciphers = list(CIPHERS['weights'].keys())
-        weights = list(CIPHERS['weights'].values())
+        chain = []
+        current = text
+        previous = None
+        
+        for _ in range(layers):
+            # Несколько попыток подобрать шифр, совместимый с предыдущим слоем
+            # и действительно меняющий текст (ROT13 не трогает цифры)
+            for _attempt in range(3):
+                cipher = cipher_registry.get_cipher(CipherSystem.get_random_cipher(depth))
+                if previous is not None and (cipher.name == previous.name or
+                                             (cipher.preserves_shape and previous.preserves_shape)):
+                    continue
+                if cipher.detect_required and chain:
+                    # Ключ Vigenère/XOR взламывается частотным анализом открытого
+                    # текста, поэтому такие шифры ставятся только первым слоем
+                    continue
+                key = cipher.random_key()
+                encrypted = CipherSystem.encrypt(current, cipher.name, key)[0]
+                if encrypted != current:
+                    break
+            else:
+                continue
+            
+            if chain and len(encrypted) > CIPHERS['chain']['max_length']:
+                break
+            
+            chain.append((cipher.name, key))
+            current = encrypted
+            previous = cipher
         
-        # Выбираем случайный шифр с учетом весов
-        return random.choices(ciphers, weights=weights, k=1)[0]
+        return CipherRecord.chain(chain, current)
     
     @staticmethod
     def get_cipher_info(cipher_type: str) -> Dict[str, str]:
@@ -242,51 +191,15 @@ class CipherSystem:
         Returns:
             Словарь с информацией о шифре
         """
-        info = {
-            'hex': {
-                'name': 'HEX',
-                'description': 'Шестнадцатеричное представление текста',
-                'example': '48 65 6C 6C 6F → Hello',
-                'hint': 'Каждые два символа HEX представляют один байт (символ ASCII)'
-            },
-            'ascii': {
-                'name': 'ASCII',
-                'description': 'Коды символов в десятичной системе',
-                'example': '72 101 108 108 111 → Hello',
-                'hint': 'Числа разделены пробелами, каждое число - код символа'
-            },
-            'binary': {
-                'name': 'Binary',
-                'description': 'Двоичное представление текста',
-                'example': '01001000 01100101 01101100 01101100 01101111 → Hello',
-                'hint': 'Каждый блок из 8 бит представляет один символ'
-            },
-            'base64': {
-                'name': 'Base64',
-                'description': 'Кодирование Base64',
-                'example': 'SGVsbG8= → Hello',
-                'hint': 'Использует символы A-Z, a-z, 0-9, +, / и = для дополнения'
-            },
-            'rot13': {
-                'name': 'ROT13',
-                'description': 'Шифр сдвига букв на 13 позиций',
-                'example': 'Uryyb → Hello',
-                'hint': 'A ↔ N, B ↔ O, C ↔ P и т.д. Самодвойственный шифр'
-            },
-            'caesar': {
-                'name': 'Caesar',
-                'description': 'Классический шифр Цезаря со случайным сдвигом',
-                'example': 'Случайный сдвиг (1-25). Например, при сдвиге 3: Khoor → Hello',
-                'hint': 'Все буквы сдвигаются на одинаковое количество позиций в алфавите'
-            }
-        }
+        if cipher_registry.has_cipher(cipher_type):
+            return dict(cipher_registry.get_cipher(cipher_type).info)
         
-        return info.get(cipher_type, {
+        return {
             'name': 'Неизвестный',
             'description': 'Неизвестный тип шифра',
             'example': 'Нет примера',
             'hint': 'Нет подсказки'
-        })
+        }
     
     @staticmethod
     def brute_force_caesar(encrypted: str) -> List[Dict[str, str]]:
@@ -305,7 +218,7 @@ class CipherSystem:
         # Пробуем все сдвиги от 1 до 25
         for shift in range(1, 26):
             try:
-                decrypted = CipherSystem._decrypt_caesar(encrypted, shift)
+                decrypted = CipherSystem.decrypt(encrypted, 'caesar', shift)
                 # Проверяем, содержит ли результат печатные символы
                 if any(c.isprintable() and c.isalpha() for c in decrypted):
                     results.append({
@@ -350,7 +263,35 @@ class CipherSystem:
             confidence += 0.3
         
         return min(confidence, 1.0)
-    
+
+    @staticmethod
+    def detect_cipher(cipher_text: str) -> List[Dict[str, Any]]:
+        """
+        Определить вероятный тип шифра за один проход по тексту
+
+        Анализируются классы символов и форма групп: двоичные группы
+        от 8 бит, HEX-пары, десятичные коды, алфавит Base64 с дополнением.
+
+        Args:
+            cipher_text: Зашифрованный текст
+
+        Returns:
+            Список словарей {'type', 'confidence'}, отсортированный по убыванию уверенности
+        """
+        features = cipher_registry.extract_features(cipher_text)
+        if features is None:
+            return []
+        
+        # Каждый шифр оценивает собранные признаки сам
+        results = []
+        for cipher in cipher_registry.enabled_ciphers():
+            confidence = cipher.detect(features)
+            if confidence > 0:
+                results.append({'type': cipher.name, 'confidence': confidence})
+        
+        results.sort(key=lambda x: x['confidence'], reverse=True)
+        return results
+
     @staticmethod
     def validate_decryption(attempt: str, original: str, cipher_type: str, 
                           shift: Optional[int] = None) -> Tuple[bool, Optional[str]]:
@@ -367,31 +308,26 @@ class CipherSystem:
             Кортеж (успех, сообщение_об_ошибке)
         """
         # Нормализуем регистр для сравнения (имена директорий часто не чувствительны к регистру)
-        attempt_norm = attempt.strip().lower()
-        original_norm = original.lower()
+        if attempt.strip().lower() == original.lower():
+            return True, None
         
+        return False, CipherSystem._get_hint(original, cipher_type, shift)
+    
+    @staticmethod
+    @lru_cache(maxsize=CIPHERS['cache_size'])
+    def _get_hint(original: str, cipher_type: str, shift: Optional[int]) -> str:
+        """Сообщение-подсказка для неверной расшифровки (с LRU-кэшем)"""
         if cipher_type == 'caesar':
             # Для Caesar мы можем не знать сдвиг
-            # Просто сравниваем с оригиналом
-            if attempt_norm == original_norm:
-                return True, None
-            else:
-                # Попробуем дать подсказку
-                if shift is not None:
-                    return False, f"Неверно. Попробуйте другой текст. Сдвиг был: {shift}"
-                else:
-                    return False, "Неверно. Попробуйте другой текст."
-        else:
-            # Для остальных шифров просто сравниваем
-            if attempt_norm == original_norm:
-                return True, None
-            else:
-                # Попробуем дать подсказку для HEX
-                if cipher_type == 'hex':
-                    # Покажем правильный HEX для сравнения
-                    correct_hex = CipherSystem._encrypt_hex(original)
-                    return False, f"Неверно. Правильный HEX: {correct_hex}"
-                return False, "Неверная расшифровка. Попробуйте еще раз."
+            if shift is not None:
+                return f"Неверно. Попробуйте другой текст. Сдвиг был: {shift}"
+            return "Неверно. Попробуйте другой текст."
+        
+        if cipher_type == 'hex':
+            # Покажем правильный HEX для сравнения
+            correct_hex = CipherSystem._encrypt_cached(original, 'hex', None)
+            return f"Неверно. Правильный HEX: {correct_hex}"
+        return "Неверная расшифровка. Попробуйте еще раз."
     
     @staticmethod
     def get_all_ciphers_info() -> List[Dict[str, str]]:
@@ -402,13 +338,18 @@ class CipherSystem:
             Список с информацией о каждом шифре
         """
         all_info = []
-        for cipher_type in CIPHERS['enabled']:
-            info = CipherSystem.get_cipher_info(cipher_type)
-            info['type'] = cipher_type
+        for cipher in cipher_registry.enabled_ciphers():
+            info = dict(cipher.info)
+            info['type'] = cipher.name
             all_info.append(info)
         
         return all_info
     
+    @staticmethod
+    def get_enabled_ciphers() -> List[str]:
+        """Получить типы включенных шифров (встроенных и зарегистрированных модами)"""
+        return [cipher.name for cipher in cipher_registry.enabled_ciphers()]
+    
     @staticmethod
     def practice_mode(text: str = "Hello") -> None:
         """
@@ -421,11 +362,11 @@ class CipherSystem:
         print(f"РЕЖИМ ПРАКТИКИ: '{text}'")
         print(f"{'='*60}\n")
         
-        for cipher_type in CIPHERS['enabled']:
-            if cipher_type == 'caesar':
+        for cipher_type in CipherSystem.get_enabled_ciphers():
+            if cipher_registry.get_cipher(cipher_type).keyed:
                 encrypted, shift = CipherSystem.encrypt(text, cipher_type)
                 info = CipherSystem.get_cipher_info(cipher_type)
-                print(f"{info['name']} (сдвиг {shift}):")
+                print(f"{info['name']} (ключ {shift}):")
                 print(f"  Зашифровано: {encrypted}")
                 print(f"  Пример: {info['example']}")
             else:
@@ -438,6 +379,81 @@ class CipherSystem:
             print()
 
 
+class CipherRecord:
+    """
+    Компактная запись о шифровании директории
+    
+    Хранит только слои шифра (номер типа и ключ для каждого), а
+    зашифрованный текст строит по требованию из открытого имени и
+    запоминает.
+    """
+    
+    __slots__ = ('layers', '_text')
+    
+    def __init__(self, cipher_type: str, shift: Optional[int] = None):
+        """
+        Args:
+            cipher_type: Тип шифра
+            shift: Сдвиг для Caesar (опционально)
+        """
+        # Номер типа шифра - индекс в реестре шифров
+        self.layers: Tuple[Tuple[int, Any], ...] = ((cipher_registry.type_id(cipher_type), shift),)
+        self._text: Optional[str] = None
+    
+    @classmethod
+    def chain(cls, layers: List[Tuple[str, Any]], cipher_text: Optional[str] = None) -> 'CipherRecord':
+        """
+        Создать запись для цепочки шифров
+        
+        Args:
+            layers: Слои (тип, ключ) в порядке применения
+            cipher_text: Уже вычисленный зашифрованный текст (опционально)
+        """
+        record = cls.__new__(cls)
+        record.layers = tuple((cipher_registry.type_id(cipher_type), key) for cipher_type, key in layers)
+        record._text = cipher_text
+        return record
+    
+    @property
+    def cipher_types(self) -> List[str]:
+        """Типы шифров в порядке применения"""
+        return [cipher_registry.cipher_by_id(cipher_id).name for cipher_id, _ in self.layers]
+    
+    @property
+    def cipher_type(self) -> str:
+        """Тип шифра (для цепочки - типы через '+' в порядке применения)"""
+        return '+'.join(self.cipher_types)
+    
+    def render(self, plain_text: str) -> str:
+        """
+        Получить зашифрованный текст (строится один раз)
+        
+        Args:
+            plain_text: Открытый текст
+            
+        Returns:
+            Зашифрованный текст
+        """
+        if self._text is None:
+            text = plain_text
+            for cipher_id, key in self.layers:
+                text = CipherSystem.encrypt(text, cipher_registry.cipher_by_id(cipher_id).name, key)[0]
+            self._text = text
+        return self._text
+    
+    def decrypt(self, cipher_text: str) -> str:
+        """Расшифровать текст ключами из записи (слои снимаются снаружи внутрь)"""
+        text = cipher_text
+        for cipher_id, key in reversed(self.layers):
+            text = CipherSystem.decrypt(text, cipher_registry.cipher_by_id(cipher_id).name, key)
+        return text
+    
+    def __repr__(self) -> str:
+        layers = ', '.join(f"{name}:{key}" if key is not None else name
+                           for name, (_, key) in zip(self.cipher_types, self.layers))
+        return f"CipherRecord({layers})"
+
+
 # Тестирование класса (если файл запущен напрямую)
 if __name__ == "__main__":
     print("Тестирование CipherSystem...")
@@ -446,14 +462,14 @@ if __name__ == "__main__":
     test_text = "HelloWorld"
     
     # Тестируем все шифры
-    for cipher_type in CIPHERS['enabled']:
+    for cipher_type in CipherSystem.get_enabled_ciphers():
         print(f"\n{cipher_type.upper()}:")
         print(f"  Оригинал: {test_text}")
         
         try:
-            if cipher_type == 'caesar':
+            if cipher_registry.get_cipher(cipher_type).keyed:
                 encrypted, shift = CipherSystem.encrypt(test_text, cipher_type)
-                print(f"  Зашифровано: {encrypted} (сдвиг: {shift})")
+                print(f"  Зашифровано: {encrypted} (ключ: {shift})")
                 decrypted = CipherSystem.decrypt(encrypted, cipher_type, shift)
                 print(f"  Расшифровано: {decrypted}")
             else:
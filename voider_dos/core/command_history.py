@@ -0,0 +1,199 @@
+"""
+Класс CommandHistory: постоянная история команд
+
+Каждая введенная команда дописывается строкой в конец файла истории
+(SAVES['command_history_file']), поэтому история переживает сессии. При
+запуске читается только хвост файла - последние UI['history_preload']
+команд, блоками с конца, так что приглашение появляется одинаково быстро
+и при десятках тысяч записей. Более старые записи читаются с диска только
+при поиске. Когда файл вырастает сильно больше SAVES['command_history_limit']
+команд, он сворачивается до последних limit записей.
+"""
+
+import os
+import sys
+from collections import deque
+from typing import Deque, Iterator, List, Optional
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import SAVES, UI
+from voider_dos.utils.file_utils import append_line, atomic_write, file_lock
+from voider_dos.utils.log import get_logger
+
+logger = get_logger('history')
+
+# Размер блока при чтении файла с конца
+TAIL_BLOCK = 8192
+
+# Файл сворачивается, когда в нем примерно во столько раз больше записей, чем limit
+COMPACT_RATIO = 1.5
+
+
+class CommandHistory:
+    """Последние команды в памяти (deque) и полная история в файле"""
+
+    def __init__(self, path: Optional[str] = None, preload: Optional[int] = None,
+                 limit: Optional[int] = None):
+        """
+        Args:
+            path: Файл истории (по умолчанию в SAVES['save_dir'])
+            preload: Сколько последних команд держать в памяти (по умолчанию UI['history_preload'])
+            limit: Сколько команд хранить в файле после сворачивания
+        """
+        save_dir = SAVES['save_dir']
+        self.path = path or os.path.join(save_dir, SAVES['command_history_file'])
+        self.lock_file = os.path.join(os.path.dirname(self.path) or '.', SAVES['lock_file'])
+        self.limit = limit or SAVES['command_history_limit']
+        self.recent: Deque[str] = deque(maxlen=preload or UI['history_preload'])
+        self.appended = 0
+
+        # Средняя длина записи (по загруженному хвосту) - для оценки размера файла
+        self._line_bytes = 16.0
+        self._load_tail()
+
+    def _load_tail(self) -> None:
+        """Прочитать последние команды, не читая файл целиком"""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning("Не удалось прочитать историю команд: %s", e)
+            return
+
+        wanted = self.recent.maxlen
+        with f:
+            position = f.seek(0, os.SEEK_END)
+            data = b''
+            while position > 0 and data.count(b'\n') <= wanted:
+                step = min(TAIL_BLOCK, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+
+        lines = data.decode('utf-8', errors='replace').splitlines()
+        if position > 0:
+            # Первая строка блока может быть началом обрезанной записи
+            lines = lines[1:]
+        if lines:
+            self._line_bytes = len(data) / len(lines)
+        self.recent.extend(line for line in lines if line)
+        logger.debug("Загружено команд из истории: %s", len(self.recent))
+
+    def append(self, command: str) -> None:
+        """
+        Добавить команду (повтор предыдущей команды не записывается)
+
+        Args:
+            command: Введенная строка
+        """
+        command = command.strip()
+        if not command or (self.recent and self.recent[-1] == command):
+            return
+
+        self.recent.append(command)
+        try:
+            if not self.appended:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # Дозапись под общей блокировкой: сворачивание берет исключительную
+            with file_lock(self.lock_file, shared=True):
+                append_line(self.path, command, fsync=False)
+            self.appended += 1
+        except OSError as e:
+            logger.warning("Не удалось записать историю команд: %s", e)
+
+    def last(self, count: int) -> List[str]:
+        """Последние count команд (старые первыми)"""
+        start = max(0, len(self.recent) - count)
+        return [self.recent[i] for i in range(start, len(self.recent))]
+
+    def entries(self) -> Iterator[str]:
+        """Вся история с диска, от старых команд к новым (читается построчно)"""
+        try:
+            with open(self.path, encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    line = line.rstrip('\n')
+                    if line:
+                        yield line
+        except FileNotFoundError:
+            yield from self.recent
+
+    def search(self, text: str, count: int = 20) -> List[str]:
+        """
+        Найти команды, содержащие text (без учета регистра)
+
+        Args:
+            text: Искомая подстрока
+            count: Сколько последних совпадений вернуть
+
+        Returns:
+            Совпадения, новые последними, без повторов
+        """
+        needle = text.casefold()
+        found: Deque[str] = deque(maxlen=count)
+        for command in self.entries():
+            if needle in command.casefold():
+                if command in found:
+                    found.remove(command)
+                found.append(command)
+        return list(found)
+
+    def compact(self) -> bool:
+        """
+        Свернуть файл до последних limit команд, если он вырос
+
+        Returns:
+            True, если файл был переписан
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return False
+        # Число строк оценивается по размеру, файл читается только при сворачивании
+        if size < self.limit * self._line_bytes * COMPACT_RATIO:
+            return False
+
+        with file_lock(self.lock_file):
+            kept: Deque[str] = deque(self.entries(), maxlen=self.limit)
+            if len(kept) < self.limit:
+                # Записи длиннее средней по хвосту: сворачивать пока рано
+                return False
+            atomic_write(self.path, ''.join(command + '\n' for command in kept), fsync=SAVES['fsync'])
+
+        logger.debug("История команд свернута до %s записей", len(kept))
+        return True
+
+
+# Тестирование класса (если файл запущен напрямую)
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    print("Тестирование CommandHistory...")
+
+    path = os.path.join(tempfile.mkdtemp(), 'history.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(50000):
+            f.write(f"cd DIR_{i}\n")
+
+    start = time.perf_counter()
+    history = CommandHistory(path, preload=1000, limit=20000)
+    elapsed = time.perf_counter() - start
+    status = "✓" if history.last(1) == ['cd DIR_49999'] and len(history.recent) == 1000 else "✗"
+    print(f"  {status} Хвост из 50000 записей загружен за {elapsed * 1000:.2f} мс")
+
+    history.append('decode 4A 6F Jo')
+    history.append('decode 4A 6F Jo')
+    print(f"  {'✓' if history.last(2) == ['cd DIR_49999', 'decode 4A 6F Jo'] else '✗'} Повтор не записан")
+
+    found = history.search('dir_123', count=3)
+    print(f"  {'✓' if found == ['cd DIR_12397', 'cd DIR_12398', 'cd DIR_12399'] else '✗'} Поиск: {found}")
+
+    compacted = history.compact()
+    reopened = CommandHistory(path, preload=10, limit=20000)
+    lines = sum(1 for _ in reopened.entries())
+    status = "✓" if compacted and lines == 20000 and reopened.last(1) == ['decode 4A 6F Jo'] else "✗"
+    print(f"  {status} Файл свернут до {lines} записей")
+
+    print("\nТестирование завершено!")
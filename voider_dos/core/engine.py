@@ -0,0 +1,279 @@
+"""
+Класс GameEngine: игровая логика без терминала
+
+Движок строит VFS, выполняет команды через CommandHandler, начисляет очки,
+ведет быстрые сохранения и статистику сессии. step(команда) возвращает
+Result с данными (voider_dos.core.results) и ничего не печатает, поэтому
+боты, тесты и другие интерфейсы запускают игру в своем процессе без
+разбора цветного вывода. Терминальный GameSession только отображает
+результаты.
+"""
+
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import SAVES
+from .vfs_generator import VirtualFileSystem
+from .cipher_system import CipherSystem
+from .autosave import AutoSaver
+from .persistent import PSet
+from .results import (
+    Achievement, Decryption, Message, QuickSlots, Result, SessionStats, error, is_error
+)
+from voider_dos.commands.command_handler import CommandHandler, CommandRegistry
+from voider_dos.utils.log import get_logger
+
+logger = get_logger('engine')
+
+
+class GameEngine:
+    """Игровая сессия без ввода-вывода: команда -> Result"""
+
+    def __init__(self, game_state, new_game: bool = True, seed: Optional[int] = None,
+                 autosave: bool = True):
+        """
+        Args:
+            game_state: Состояние игры (GameState)
+            new_game: Начинать ли новую игру
+            seed: Seed для генерации VFS (если None - случайный или из сохранения)
+            autosave: Запускать ли фоновое автосохранение
+        """
+        self.game_state = game_state
+        self.new_game = new_game
+
+        # При продолжении мир строится заново из seed сохраненной сессии
+        world = None if new_game or seed is not None else game_state.world_deltas
+        if world is not None and world['seed'] is not None:
+            seed = world['seed']
+        self.vfs = VirtualFileSystem(seed=seed)
+        if world is not None:
+            if world['seed'] is None:
+                # Сохранение без мира: запоминаем новый
+                game_state.set_world(self.vfs.seed)
+            else:
+                restored = self.vfs.apply_decoded(world['decoded'])
+                logger.debug("Восстановлено расшифрованных директорий: %s", restored)
+        self.vfs.on_decoded = game_state.record_world_delta
+
+        # Команды игры и команды сессии в одном реестре
+        self.command_handler = CommandHandler(self.vfs, game_state)
+        self._register_commands()
+
+        # Статистика сессии
+        self.session_start_time = time.time()
+        self.commands_executed = 0
+        self.last_command_time = None
+        self.running = True
+        self._closed = False
+
+        # Быстрые сохранения (qsave/qload): слот -> (снимок, директория, путь, открытые файлы)
+        self.quick_slots: Dict[str, Tuple[Any, Any, List[str], PSet]] = {}
+
+        # Достижения собираются в Result вместо печати
+        self._unlocked: List[Achievement] = []
+        game_state.announce_achievements = False
+        game_state.achievement_engine.subscribe(self._on_achievement)
+
+        if new_game:
+            game_state.start_new_session(seed=self.vfs.seed)
+
+        # Фоновое автосохранение: пишет на диск, только если состояние изменилось
+        self.autosaver = AutoSaver(game_state) if autosave else None
+        if self.autosaver is not None:
+            self.autosaver.start()
+
+    @property
+    def registry(self) -> CommandRegistry:
+        """Реестр команд (интерфейс может добавить свои команды)"""
+        return self.command_handler.registry
+
+    def _register_commands(self) -> None:
+        """Команды сессии (не учитываются в статистике команд)"""
+        register = self.registry.register
+        register('exit', lambda _: self.exit(), aliases=('quit',), group='session',
+                 help='Выйти в главное меню')
+        register('stats', lambda _: self.session_stats(), group='session', help='Подробная статистика')
+        register('qsave', lambda _, slot: self.quick_save(slot or '1'), args='[слот]', group='session',
+                 help='Быстрое сохранение')
+        register('qload', lambda _, slot: self.quick_load(slot or '1'), args='[слот]', group='session',
+                 help='Вернуться к быстрому сохранению')
+        register('qslots', lambda _: self.quick_slots_info(), group='session', help='Список быстрых сохранений')
+        register('seed', lambda _, action, value: self.seed_command(action, value),
+                 args='[действие] [значение:int]', group='session',
+                 help='Показать seed (seed set <число> - перегенерировать ФС)')
+
+    def step(self, command: str) -> Result:
+        """
+        Выполнить одну команду
+
+        Args:
+            command: Строка ввода
+
+        Returns:
+            Результат с выводом команды, счетом, путем и открытыми достижениями
+        """
+        self._unlocked = []
+        try:
+            output = self.command_handler.execute(command)
+            if isinstance(output, Decryption):
+                self.game_state.record_decryption(output.points)
+                self.request_save()
+        except Exception as e:
+            logger.debug("Ошибка команды '%s'", command, exc_info=True)
+            output = error(f"Ошибка: {e}")
+
+        last = self.command_handler.last_command
+        if command.strip() and (last is None or last.group != 'session'):
+            self.commands_executed += 1
+            self.last_command_time = time.time()
+
+        return Result(command, output, not is_error(output), self.game_state.score,
+                      self.vfs.get_current_path_str(), self._unlocked, self.running)
+
+    def _on_achievement(self, key: str, definition: Dict[str, Any]) -> None:
+        """Событие движка достижений: вернуть открытие в Result текущей команды"""
+        self._unlocked.append(Achievement(key, definition['name'], definition['description']))
+
+    def request_save(self) -> None:
+        """Попросить автосохранение записать изменения"""
+        if self.autosaver is not None:
+            self.autosaver.request_save()
+
+    def exit(self) -> Message:
+        """Завершить игру (сохранение - в close)"""
+        self.running = False
+        return Message("Выход в главное меню...", 'notice')
+
+    def quick_save(self, slot: str) -> Message:
+        """Быстрое сохранение в слот (снимок в памяти за O(1))"""
+        if slot not in self.quick_slots and len(self.quick_slots) >= SAVES['quick_slots']:
+            # Вытесняем самый старый слот
+            del self.quick_slots[next(iter(self.quick_slots))]
+        self.quick_slots.pop(slot, None)
+        self.quick_slots[slot] = (self.game_state.quick_save(), self.vfs.current_dir,
+                                  list(self.vfs.current_path), self.command_handler.opened_files)
+        return Message(f"Быстрое сохранение в слот '{slot}' (счет: {self.game_state.score}).", 'success')
+
+    def quick_load(self, slot: str) -> Message:
+        """Вернуться к быстрому сохранению: меняются только директории, измененные с тех пор"""
+        saved = self.quick_slots.get(slot)
+        if saved is None:
+            return error(f"Слот '{slot}' пуст. Используйте: qsave [слот]")
+
+        snapshot, directory, path, opened_files = saved
+        try:
+            decode, encrypt = self.game_state.quick_load(snapshot)
+        except ValueError as e:
+            return error(str(e))
+
+        self.vfs.apply_encrypted(encrypt)
+        self.vfs.apply_decoded(decode)
+        self.vfs.current_dir = directory
+        self.vfs.current_path = list(path)
+        # Очки за файлы, открытые после сохранения, снова доступны
+        self.command_handler.opened_files = opened_files
+        logger.debug("Быстрая загрузка: зашифровано %s, расшифровано %s", len(encrypt), len(decode))
+        return Message(f"Загружено быстрое сохранение '{slot}' (счет: {self.game_state.score}).", 'success')
+
+    def quick_slots_info(self) -> QuickSlots:
+        """Быстрые сохранения сессии"""
+        return QuickSlots([{'slot': slot, 'created': snapshot.created, 'score': snapshot.session_score,
+                            'path': path[-1] if path else ''}
+                           for slot, (snapshot, _, path, _) in self.quick_slots.items()])
+
+    def seed_command(self, action: Optional[str], value: Optional[int]) -> Message:
+        """seed - показать seed, seed set <число> - перегенерировать ФС"""
+        if action is None:
+            return Message(f"Текущий seed: {self.vfs.seed}")
+
+        if action.lower() != 'set' or value is None:
+            return error("Использование: seed set <число>")
+
+        self.vfs = VirtualFileSystem(seed=value)
+        self.command_handler.vfs = self.vfs
+        # Новый мир: прежние изменения и быстрые сохранения к нему не относятся
+        self.game_state.set_world(self.vfs.seed)
+        self.vfs.on_decoded = self.game_state.record_world_delta
+        self.quick_slots.clear()
+        return Message(f"Seed изменен на {value}. ФС перегенерирована.", 'success')
+
+    def session_stats(self) -> SessionStats:
+        """Статистика текущей сессии"""
+        vfs_stats = self.vfs.get_stats()
+        caches = dict(CipherSystem.get_cache_stats(), commands=self.registry.cache_info())
+        return SessionStats(
+            seed=vfs_stats['seed'],
+            duration=time.time() - self.session_start_time,
+            commands=self.commands_executed,
+            path=vfs_stats['current_path'],
+            items_in_dir=vfs_stats['items_in_current_dir'],
+            vfs=vfs_stats,
+            caches=caches,
+        )
+
+    def close(self, verbose: bool = False) -> None:
+        """
+        Завершить сессию: остановить автосохранение, записать итоги и сохранить
+
+        Args:
+            verbose: Сообщить о сохранении на уровне INFO (GameState.save)
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.running = False
+
+        if self.autosaver is not None:
+            # Финальное сохранение ниже
+            self.autosaver.stop(flush=False)
+        self.game_state.end_session(commands=self.commands_executed)
+        self.game_state.save(verbose=verbose)
+
+        self.game_state.achievement_engine.unsubscribe(self._on_achievement)
+        self.game_state.announce_achievements = True
+
+
+# Тестирование класса (если файл запущен напрямую)
+if __name__ == "__main__":
+    import tempfile
+    from voider_dos.core.game_states import GameState
+    from voider_dos.core.results import FileView, Listing
+    from voider_dos.core.vfs_generator import DirNode
+
+    print("Тестирование GameEngine...")
+
+    SAVES['save_dir'] = tempfile.mkdtemp()
+    engine = GameEngine(GameState(), new_game=True, seed=42, autosave=False)
+
+    result = engine.step('dir')
+    status = "✓" if result.ok and isinstance(result.output, Listing) else "✗"
+    print(f"  {status} dir: {len(result.output.lines)} строк, путь {result.path}")
+
+    result = engine.step('zzz')
+    print(f"  {'✓' if not result.ok else '✗'} Неизвестная команда: {result.output.text}")
+
+    # Файл первой открытой директории: очки и структурированное содержимое
+    folder = next(item for item in engine.vfs.root.children if isinstance(item, DirNode) and not item.encrypted)
+    engine.step(f"cd {folder.name}")
+    files = [item for item in folder.children if not isinstance(item, DirNode)]
+    if files:
+        result = engine.step(f"type {files[0].get_full_name()}")
+        status = "✓" if isinstance(result.output, FileView) and result.score == result.output.points else "✗"
+        print(f"  {status} Файл {result.output.filename}: +{result.output.points}")
+
+    # Скорость: команды без форматирования
+    start = time.perf_counter()
+    for _ in range(10000):
+        engine.step('pwd')
+    elapsed = time.perf_counter() - start
+    print(f"  ✓ 10000 команд за {elapsed * 1000:.1f} мс")
+
+    result = engine.step('exit')
+    engine.close()
+    print(f"  {'✓' if not result.running else '✗'} exit завершает сессию")
+
+    print("\nТестирование завершено!")
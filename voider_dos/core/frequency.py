@@ -0,0 +1,165 @@
+"""
+Частотный анализ для взлома шифров
+
+Подсчет букв и байтов за один проход (numpy.bincount, если numpy
+установлен, иначе collections.Counter), индекс совпадений и оценка
+сдвигов и однобайтовых XOR-ключей по частотам английского языка.
+Используется командой analyze и решателями Vigenère/XOR.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List
+
+# numpy необязателен: без него используется Counter
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+# Частоты букв английского языка (в долях), по ним оцениваются сдвиги
+ENGLISH_FREQUENCIES = [
+    0.0817, 0.0149, 0.0278, 0.0425, 0.1270, 0.0223, 0.0202, 0.0609, 0.0697,
+    0.0015, 0.0077, 0.0403, 0.0241, 0.0675, 0.0751, 0.0193, 0.0010, 0.0599,
+    0.0633, 0.0906, 0.0276, 0.0098, 0.0236, 0.0015, 0.0197, 0.0007,
+]
+
+# Индекс совпадений: английский текст ~0.066, равномерный шум ~0.038
+IOC_ENGLISH = 0.066
+IOC_RANDOM = 1 / 26
+IOC_THRESHOLD = 0.052
+
+# С какой длины выгоднее numpy (на коротких строках дороже создание массива)
+NUMPY_MIN_LENGTH = 4096
+
+
+def _build_byte_weights() -> List[float]:
+    """Вес каждого байта открытого текста: буквы по частотам, управляющие - штраф"""
+    weights = [0.001] * 256
+    for code in range(32):
+        weights[code] = -0.5
+    weights[0x7F] = -0.5
+    for code in (0x09, 0x0A, 0x0D):
+        weights[code] = 0.001
+    for code in range(0x80, 0x100):
+        # Байты многобайтных символов UTF-8 (кириллица) - нейтральные
+        weights[code] = 0.0
+    for index, frequency in enumerate(ENGLISH_FREQUENCIES):
+        weights[ord('a') + index] = frequency
+        weights[ord('A') + index] = frequency * 0.9
+    for char in '0123456789_-.':
+        weights[ord(char)] = 0.01
+    weights[ord(' ')] = 0.13
+    return weights
+
+
+BYTE_WEIGHTS = _build_byte_weights()
+
+
+def letter_counts(text: str) -> List[int]:
+    """
+    Посчитать латинские буквы без учета регистра за один проход
+
+    Args:
+        text: Анализируемый текст
+
+    Returns:
+        Список из 26 количеств (a..z)
+    """
+    # Сдвиговые шифры меняют только латиницу, остальные символы не нужны
+    data = text.encode('ascii', errors='ignore')
+
+    if HAS_NUMPY and len(data) >= NUMPY_MIN_LENGTH:
+        # OR 0x20 переводит A-Z в a-z и не создает новых букв из других байтов
+        counts = np.bincount(np.frombuffer(data, dtype=np.uint8) | 0x20, minlength=256)
+        return counts[ord('a'):ord('z') + 1].tolist()
+
+    counts = Counter(data.lower())
+    return [counts[code] for code in range(ord('a'), ord('z') + 1)]
+
+
+def index_of_coincidence(counts: List[int]) -> float:
+    """
+    Индекс совпадений: вероятность, что две случайные буквы текста одинаковы
+
+    Args:
+        counts: Количества букв
+
+    Returns:
+        Индекс совпадений (0.0, если букв меньше двух)
+    """
+    total = sum(counts)
+    if total < 2:
+        return 0.0
+    return sum(n * (n - 1) for n in counts) / (total * (total - 1))
+
+
+def shift_scores(counts: List[int]) -> List[Dict[str, Any]]:
+    """
+    Оценить все сдвиги критерием хи-квадрат против частот английского
+
+    Args:
+        counts: Количества букв шифротекста
+
+    Returns:
+        Список {'shift', 'chi_squared'} по возрастанию хи-квадрат (лучшие первыми)
+    """
+    total = sum(counts)
+    if not total:
+        return []
+
+    # sum((O - E)^2 / E) = sum(O^2 / E) - 2N + sum(E): зависит от сдвига только
+    # первое слагаемое, и в нем участвуют лишь встреченные буквы
+    inverse = [1 / (frequency * total) for frequency in ENGLISH_FREQUENCIES]
+    base = total * sum(ENGLISH_FREQUENCIES) - 2 * total
+    present = [(letter, count * count) for letter, count in enumerate(counts) if count]
+
+    scores = []
+    for shift in range(26):
+        # При сдвиге shift открытая буква i превращается в букву i + shift
+        chi_squared = base + sum(square * inverse[letter - shift] for letter, square in present)
+        scores.append({'shift': shift, 'chi_squared': round(chi_squared, 2)})
+
+    scores.sort(key=lambda x: x['chi_squared'])
+    return scores
+
+
+def byte_score(data: bytes) -> float:
+    """
+    Насколько байты похожи на английский текст (больше - лучше)
+
+    Args:
+        data: Байты открытого текста
+
+    Returns:
+        Сумма весов байтов
+    """
+    return sum(BYTE_WEIGHTS[value] * count for value, count in Counter(data).items())
+
+
+def xor_key_scores(column: bytes) -> List[float]:
+    """
+    Оценить все 256 однобайтовых XOR-ключей для столбца шифротекста
+
+    Гистограмма столбца строится один раз, затем каждый ключ оценивается
+    по различным значениям байтов, а не по всему столбцу.
+
+    Args:
+        column: Байты, зашифрованные одним байтом ключа
+
+    Returns:
+        Список из 256 оценок (индекс - байт ключа)
+    """
+    histogram = Counter(column)
+    values = list(histogram)
+    counts = list(histogram.values())
+
+    if HAS_NUMPY and len(values) > 16:
+        weights = np.array(BYTE_WEIGHTS)
+        table = weights[np.bitwise_xor.outer(np.arange(256), np.array(values))]
+        return (table @ np.array(counts, dtype=float)).tolist()
+
+    items = list(zip(values, counts))
+    return [sum(BYTE_WEIGHTS[value ^ key] * count for value, count in items) for key in range(256)]
@@ -2,22 +2,115 @@
 Класс GameState: управление состоянием игры, счетом, статистикой и сохранениями
 """
 
+import getpass
 import json
 import os
+import threading
 import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
 import sys
 
 # Добавляем путь для импорта config.py из корня проекта
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from config import SAVES, SCORING
+from config import ACHIEVEMENTS, SAVES, SCORING
+from voider_dos.utils.file_utils import (atomic_write, append_line, discard_write, file_lock, file_stamp,
+                                         fsync_directory, fsync_file, link_or_copy, prepare_write)
+from voider_dos.core import save_format
+from voider_dos.core.achievements import AchievementEngine
+from voider_dos.core.persistent import PSet
+from voider_dos.core.sqlite_store import SQLiteStore
+from voider_dos.core.stats_store import SLOT_INDEX, STAT_SLOTS, StatField, StatsStore
+from voider_dos.utils.log import get_logger
+
+logger = get_logger('state')
+
+# Счетчики, изменения которых пишутся в журнал (слоты StatsStore)
+PERSISTENT_STATS = STAT_SLOTS
+
+# Метаданные, которые пишутся в журнал, и часть снимка, где они хранятся
+PERSISTENT_META = {'last_played': 'META', 'last_session_seed': 'HDR', 'first_play_date': 'META'}
+
+# Счетчики из заголовка сохранения - известны сразу после load()
+HEADER_STATS = ('total_score', 'sessions_played')
+# Счетчики секции STAT
+SECTION_STATS = tuple(name for name in STAT_SLOTS if name not in HEADER_STATS)
+
+# Секции сохранения, которые читаются при первом обращении к их данным
+LAZY_SECTIONS = ('STAT', 'ACHV', 'HIST', 'META', 'BCKT', 'WRLD')
+# Все части снимка: заголовок ('HDR') и секции
+ALL_SECTIONS = ('HDR',) + LAZY_SECTIONS
+
+# Атрибуты, которых нет в __dict__, пока их секция не прочитана
+LAZY_ATTRIBUTES = {
+    'achievements': 'ACHV',
+    'session_history': 'HIST',
+    'last_played': 'META',
+    'first_play_date': 'META',
+    'world_deltas': 'WRLD',
+}
+
+
+class _SectionStatField(StatField):
+    """Счетчик секции STAT: перед первым обращением секция дочитывается из файла"""
+    
+    def __get__(self, obj, owner=None):
+        if obj is not None and 'STAT' in obj._pending:
+            obj._require('STAT')
+        return super().__get__(obj, owner)
+    
+    def __set__(self, obj, value) -> None:
+        if 'STAT' in obj._pending:
+            obj._require('STAT')
+        super().__set__(obj, value)
+
+
+@dataclass(frozen=True)
+class QuickSave:
+    """
+    Быстрое сохранение внутри сессии (qsave/qload)
+    
+    Хранит ссылки на неизменяемые версии состояния, поэтому создается за
+    O(1) и почти не занимает памяти: множество расшифрованных директорий
+    общее с текущим состоянием, кроме изменившихся с тех пор ветвей.
+    """
+    totals: Tuple[float, ...]                    # Слоты счетчиков (их число фиксировано)
+    session_score: int
+    session_stats: Tuple[Tuple[str, float], ...]
+    world_seed: Optional[int]
+    decoded: PSet                                # Расшифрованные директории мира
+    created: float
+
 
 class GameState:
     """Класс для управления состоянием игры и сохранениями"""
     
-    def __init__(self):
-        """Инициализация состояния игры"""
+    # Счетчики хранятся в слотах self.stats (итоги и корзины по времени)
+    score = _SectionStatField('score')
+    total_score = StatField('total_score')
+    sessions_played = StatField('sessions_played')
+    play_time = _SectionStatField('play_time')
+    directories_decrypted = _SectionStatField('directories_decrypted')
+    files_opened = _SectionStatField('files_opened')
+    easter_eggs_found = _SectionStatField('easter_eggs_found')
+    special_dirs_found = _SectionStatField('special_dirs_found')
+    
+    def __init__(self, profile: Optional[str] = None):
+        """
+        Инициализация состояния игры
+        
+        Args:
+            profile: Имя профиля игрока для SQLite-хранилища
+                     (по умолчанию SAVES['profile'] или имя пользователя ОС)
+        """
+        self.stats = StatsStore()
+        
+        # Ленивая загрузка: секции сохранения, еще не прочитанные из файла
+        self._pending: Set[str] = set()
+        self._reader: Optional[save_format.SaveReader] = None
+        self._deferred_events: List[Dict[str, Any]] = []  # События журнала для непрочитанных секций
+        
         # Основные параметры
         self.score = 0
         self.session_score = 0
@@ -37,68 +130,266 @@ class GameState:
         self.last_played = None
         self.first_play_date = None
         
-        # Прогресс и достижения
-        self.achievements = {
-            'first_decryption': False,
-            'easter_egg_hunter': False,
-            'void_explorer': False,
-            'master_decryptor': False
-        }
+        # Прогресс и достижения (описаны в config.ACHIEVEMENTS)
+        self.achievements = self._empty_achievements()
+        self.achievement_engine = AchievementEngine()
+        self.achievement_engine.subscribe(self._on_achievement)
+        # Печатать ли открытые достижения (GameEngine собирает их в Result сам)
+        self.announce_achievements = True
+        
+        # История сессий (последние SAVES['history_limit'])
+        self.session_history: List[Dict[str, Any]] = []
+        
+        # Мир последней сессии: seed и ключи расшифрованных директорий (для продолжения)
+        self.world_deltas: Dict[str, Any] = {'seed': None, 'decoded': PSet()}
         
         # Флаги сессии
         self.first_decryption_done = False
+        self._session_stats: Dict[str, float] = {}  # Приращения счетчиков за текущую сессию
         
         # Пути для сохранения
         self.save_dir = SAVES['save_dir']
         self.save_file = os.path.join(self.save_dir, SAVES['save_file'])
+        self.legacy_save_file = os.path.join(self.save_dir, SAVES['legacy_save_file'])
+        
+        # Журнал изменений между полными снимками
+        self.journal_file = os.path.join(self.save_dir, SAVES['journal_file'])
+        self._journal_pending: List[Dict[str, Any]] = []  # Еще не записанные события
+        self._journal_seq = 0                             # Номер последнего события
+        self._journal_size = 0                            # Записей в файле журнала
+        self._snapshot_required = True                    # Следующее сохранение - полный снимок
+        
+        # Несколько процессов игры делят одно сохранение: запись идет под
+        # блокировкой файла, чужие изменения сливаются по отпечатку снимка
+        # и длине журнала, с которыми согласовано состояние
+        self.lock_file = os.path.join(self.save_dir, SAVES['lock_file'])
+        self._disk_stamp = None                           # Отпечаток снимка (file_stamp)
+        self._journal_offset = 0                          # Байт журнала уже учтено
+        self._overwrite_disk = False                      # После reset/импорта чужие изменения не сливаются
+        
+        # Есть ли несохраненные изменения (для автосохранения)
+        self.dirty = False
+        # Изменения и подготовка сохранения атомарны относительно друг друга,
+        # запись на диск идет вне _lock, чтобы не блокировать игровой цикл
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
         
         # Создаем директорию для сохранений, если ее нет
         os.makedirs(self.save_dir, exist_ok=True)
+        
+        # Необязательное SQLite-хранилище: профили игроков, история и рекорды
+        self.profile = profile or SAVES['profile'] or self._default_profile()
+        self.store: Optional[SQLiteStore] = None
+        if SAVES['backend'] == 'sqlite':
+            self.store = SQLiteStore(os.path.join(self.save_dir, SAVES['sqlite_file']), self.profile)
+    
+    @staticmethod
+    def _default_profile() -> str:
+        """Имя профиля по умолчанию - имя пользователя ОС"""
+        try:
+            return getpass.getuser()
+        except Exception:
+            return 'default'
+    
+    def __getattr__(self, name: str) -> Any:
+        """Атрибут непрочитанной секции: прочитать секцию и вернуть значение"""
+        section = LAZY_ATTRIBUTES.get(name)
+        if section is None or section not in self.__dict__.get('_pending', ()):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        self._require(section)
+        return self.__dict__[name]
     
     def add_score(self, points: int, reason: str = "") -> None:
         """Добавить очки за действие"""
-        self.score += points
-        self.session_score += points
-        self.total_score += points
+        with self._lock:
+            self._load_pending()
+            now = time.time()
+            self.stats.add('score', points, now)
+            self.stats.add('total_score', points, now)
+            self.session_score += points
+            self._journal_event('score', v=points, s=int(now))
+            self.achievement_engine.update('total_score', self.total_score)
         
         # Логирование для отладки
         if reason:
-            print(f"[DEBUG] +{points} очков за: {reason}")
+            logger.debug("+%s очков за: %s", points, reason)
     
     def add_stat(self, stat_name: str, value: int = 1) -> None:
         """Добавить значение к статистике"""
-        if hasattr(self, stat_name):
-            current = getattr(self, stat_name)
-            setattr(self, stat_name, current + value)
-            
-            # Проверка достижений
-            self._check_achievements()
+        if stat_name in SLOT_INDEX or hasattr(self, stat_name):
+            self._increment(stat_name, value)
+    
+    def _increment(self, stat_name: str, value: Any = 1) -> None:
+        """Увеличить счетчик, записать изменение в журнал и проверить достижения"""
+        with self._lock:
+            self._load_pending()
+            slot = SLOT_INDEX.get(stat_name)
+            if slot is None:
+                new_value = getattr(self, stat_name) + value
+                setattr(self, stat_name, new_value)
+            else:
+                now = time.time()
+                new_value = self.stats.add(slot, value, now)
+                self._session_stats[stat_name] = self._session_stats.get(stat_name, 0) + value
+                self._journal_event('stat', k=stat_name, v=value, s=int(now))
+            self.achievement_engine.update(stat_name, new_value)
+    
+    def _set_meta(self, name: str, value: Any) -> None:
+        """Изменить метаданные и записать изменение в журнал"""
+        with self._lock:
+            self._load_pending()
+            setattr(self, name, value)
+            self._journal_event('meta', k=name, v=value)
+    
+    def _unlock(self, achievement: str) -> bool:
+        """Разблокировать достижение (True, если оно не было открыто)"""
+        with self._lock:
+            self._load_pending()
+            if self.achievements.get(achievement):
+                return False
+            self.achievements[achievement] = True
+            self._journal_event('ach', k=achievement)
+            return True
+    
+    def _add_history(self, record: Dict[str, Any]) -> None:
+        """Добавить запись в историю сессий и записать ее в журнал"""
+        with self._lock:
+            self._load_pending()
+            self._append_history(record)
+            self._journal_event('hist', r=record)
+    
+    def _append_history(self, record: Dict[str, Any]) -> None:
+        """Добавить запись в историю, отбросив самые старые сверх лимита"""
+        self.session_history.append(record)
+        overflow = len(self.session_history) - SAVES['history_limit']
+        if overflow > 0:
+            del self.session_history[:overflow]
+    
+    def _journal_event(self, event_type: str, **data: Any) -> None:
+        """
+        Добавить событие в очередь журнала (записывается при save, вызывать под _lock)
+        
+        Номер события назначается при записи под блокировкой файла: номера
+        общие для всех процессов, пишущих в журнал.
+        """
+        data['t'] = event_type
+        self._journal_pending.append(data)
+        self.dirty = True
     
     def start_new_session(self, seed: Optional[int] = None) -> None:
         """Начать новую игровую сессию"""
         self.session_score = 0
         self.current_session_start = time.time()
-        self.last_session_seed = seed
+        self._set_meta('last_session_seed', seed)
+        self.set_world(seed)
         
         # Сбрасываем флаги сессии
         self.first_decryption_done = False
+        self._session_stats = {}
         
-        self.sessions_played += 1
+        self._increment('sessions_played')
         
-        print(f"[DEBUG] Начата новая сессия (Seed: {seed})")
+        logger.debug("Начата новая сессия (Seed: %s)", seed)
     
-    def end_session(self) -> None:
-        """Завершить текущую сессию"""
+    def set_world(self, seed: Optional[int]) -> None:
+        """
+        Начать учет изменений нового мира
+        
+        Args:
+            seed: Seed, из которого построена VFS
+        """
+        with self._lock:
+            self._load_pending()
+            self.world_deltas = {'seed': seed, 'decoded': PSet()}
+            self._journal_event('world', seed=seed)
+    
+    def record_world_delta(self, key: str) -> None:
+        """
+        Запомнить расшифрованную директорию текущего мира
+        
+        Args:
+            key: Ключ директории (VirtualFileSystem.node_key)
+        """
+        with self._lock:
+            self._load_pending()
+            self.world_deltas['decoded'] = self.world_deltas['decoded'].add(key)
+            self._journal_event('world', p=key)
+    
+    def quick_save(self) -> QuickSave:
+        """Быстрое сохранение текущей сессии (в памяти, O(1))"""
+        with self._lock:
+            self._load_pending()
+            return QuickSave(
+                totals=tuple(self.stats.totals),
+                session_score=self.session_score,
+                session_stats=tuple(self._session_stats.items()),
+                world_seed=self.world_deltas['seed'],
+                decoded=self.world_deltas['decoded'],
+                created=time.time(),
+            )
+    
+    def quick_load(self, snapshot: QuickSave) -> Tuple[Set[str], Set[str]]:
+        """
+        Вернуть счетчики и мир к быстрому сохранению
+        
+        Изменения пишутся в журнал обычными событиями: приращениями
+        счетчиков и изменениями мира, их число - O(изменений с момента
+        быстрого сохранения). Открытые достижения и история сессий остаются.
+        
+        Args:
+            snapshot: Результат quick_save
+            
+        Returns:
+            (ключи директорий, которые снова расшифрованы; ключи директорий,
+            которые снова зашифрованы) - для VirtualFileSystem
+        """
+        with self._lock:
+            self._load_pending()
+            if snapshot.world_seed != self.world_deltas['seed']:
+                raise ValueError("Быстрое сохранение относится к другому миру")
+            
+            for name, value in zip(STAT_SLOTS, snapshot.totals):
+                delta = value - self.stats.totals[SLOT_INDEX[name]]
+                if delta:
+                    self._increment(name, delta)
+            self.session_score = snapshot.session_score
+            self._session_stats = dict(snapshot.session_stats)
+            
+            decode, encrypt = self.world_deltas['decoded'].diff(snapshot.decoded)
+            for key in encrypt:
+                self._journal_event('world', x=key)
+            for key in decode:
+                self._journal_event('world', p=key)
+            self.world_deltas['decoded'] = snapshot.decoded
+            return decode, encrypt
+    
+    def end_session(self, commands: int = 0) -> None:
+        """
+        Завершить текущую сессию
+        
+        Args:
+            commands: Сколько команд выполнено за сессию
+        """
         if self.current_session_start:
             session_time = time.time() - self.current_session_start
-            self.play_time += session_time / 60  # конвертируем в минуты
+            self._increment('play_time', session_time / 60)  # конвертируем в минуты
+            
+            self._add_history({
+                'seed': self.last_session_seed,
+                'started': self.current_session_start,
+                'minutes': session_time / 60,
+                'score': self.session_score,
+                'decrypted': self._session_stats.get('directories_decrypted', 0),
+                'files': self._session_stats.get('files_opened', 0),
+                'commands': commands,
+            })
             self.current_session_start = None
             
-            print(f"[DEBUG] Сессия завершена. Очков заработано: {self.session_score}")
+            logger.debug("Сессия завершена. Очков заработано: %s", self.session_score)
     
     def record_decryption(self, points: int = None) -> None:
         """Записать факт расшифровки директории"""
-        self.directories_decrypted += 1
+        self._increment('directories_decrypted')
         
         if points is None:
             points = SCORING['directory_decrypted']
@@ -108,181 +399,629 @@ class GameState:
             bonus = SCORING['first_decryption_bonus']
             self.add_score(bonus, "Бонус за первую расшифровку")
             self.first_decryption_done = True
-            self.achievements['first_decryption'] = True
         
         self.add_score(points, "Расшифровка директории")
     
     def record_file_opened(self, is_easter_egg: bool = False, is_special: bool = False) -> None:
         """Записать факт открытия файла"""
-        self.files_opened += 1
+        self._increment('files_opened')
         
         if is_easter_egg:
-            self.easter_eggs_found += 1
+            self._increment('easter_eggs_found')
             points = SCORING['easter_egg_found']
             self.add_score(points, "Находка пасхалки")
         elif is_special:
-            self.special_dirs_found += 1
+            self._increment('special_dirs_found')
             points = SCORING['special_dir_found']
             self.add_score(points, "Особая директория")
         else:
             points = SCORING['file_opened']
             self.add_score(points, "Открытие файла")
     
-    def _check_achievements(self) -> None:
-        """Проверить и разблокировать достижения"""
-        # Охотник за пасхалками
-        if self.easter_eggs_found >= 3 and not self.achievements['easter_egg_hunter']:
-            self.achievements['easter_egg_hunter'] = True
-            print("[ДОСТИЖЕНИЕ] Охотник за пасхалками: найдено 3 пасхалки!")
-        
-        # Исследователь пустоты
-        if self.files_opened >= 20 and not self.achievements['void_explorer']:
-            self.achievements['void_explorer'] = True
-            print("[ДОСТИЖЕНИЕ] Исследователь пустоты: открыто 20 файлов!")
-        
-        # Мастер дешифровки
-        if self.directories_decrypted >= 10 and not self.achievements['master_decryptor']:
-            self.achievements['master_decryptor'] = True
-            print("[ДОСТИЖЕНИЕ] Мастер дешифровки: расшифровано 10 директорий!")
-    
-    def save(self) -> bool:
-        """Сохранить состояние игры в файл"""
-        try:
-            save_data = {
-                # Основные данные
-                'total_score': self.total_score,
-                'score': self.score,
+    @staticmethod
+    def _empty_achievements() -> Dict[str, bool]:
+        """Все достижения из конфигурации, еще не открытые"""
+        return {key: False for key in ACHIEVEMENTS}
+    
+    def _on_achievement(self, key: str, definition: Dict[str, Any]) -> None:
+        """Событие движка достижений: отметить и сообщить игроку"""
+        if self._unlock(key) and self.announce_achievements:
+            print(f"[ДОСТИЖЕНИЕ] {definition['name']}: {definition['description']}!")
+    
+    def _sync_achievements(self) -> None:
+        """Перестроить очереди порогов по загруженному состоянию и открыть уже заработанные"""
+        self.achievement_engine.reset(self.achievements)
+        self.achievement_engine.catch_up({stat: getattr(self, stat, 0)
+                                          for stat in self.achievement_engine.stats})
+    
+    def save(self, verbose: bool = True) -> bool:
+        """
+        Сохранить состояние игры
+        
+        Обычно в журнал дописываются только события с прошлого сохранения.
+        Полный снимок пишется атомарно (временный файл, fsync, os.replace)
+        при первом сохранении, после reset и когда журнал дорастает до
+        SAVES['journal_compact_events'] записей.
+        
+        С SQLite-хранилищем (SAVES['backend'] = 'sqlite') профиль и новые
+        сессии записываются одной транзакцией, журнал не используется.
+        
+        Безопасно вызывать из фонового потока (AutoSaver): состояние
+        фиксируется под блокировкой, а запись на диск идет без нее.
+        
+        Несколько процессов могут сохраняться в одну директорию: файлы
+        меняются под блокировкой SAVES['lock_file'] (fcntl.flock), а
+        изменения других процессов сначала сливаются в состояние
+        (_merge_disk). Под блокировкой выполняется только дозапись журнала
+        или os.replace готового снимка, fsync - после ее снятия.
+        
+        Args:
+            verbose: Сообщить о сохранении в журнал на уровне INFO (иначе DEBUG)
+        """
+        with self._io_lock:
+            with self._lock:
+                # Снимок и файл сохранения меняются - непрочитанные секции нужны сейчас
+                self._load_pending()
+                now = datetime.now().isoformat()
+                self._set_meta('last_played', now)
+                if self.first_play_date is None:
+                    self._set_meta('first_play_date', now)
                 
-                # Статистика
-                'sessions_played': self.sessions_played,
-                'play_time': self.play_time,
-                'directories_decrypted': self.directories_decrypted,
-                'files_opened': self.files_opened,
-                'easter_eggs_found': self.easter_eggs_found,
-                'special_dirs_found': self.special_dirs_found,
+                if self.store is not None:
+                    # Профиль заменяется целиком только после reset, импорта или
+                    # переноса из файла. Первое сохранение нового процесса тоже
+                    # пишет приращения: профиль мог создать другой процесс
+                    snapshot = self._overwrite_disk
+                    save_data = self._snapshot_data()
+                else:
+                    journal_size = self._journal_size + len(self._journal_pending)
+                    snapshot = (self._snapshot_required or not os.path.exists(self.save_file)
+                                or journal_size >= SAVES['journal_compact_events'])
+                    save_data = self._snapshot_data() if snapshot else None
+                events, self._journal_pending = self._journal_pending, []
+                self.dirty = False
+            
+            try:
+                if self.store is not None:
+                    self._write_store(save_data, events, snapshot)
+                elif snapshot:
+                    self._write_snapshot(save_data, events)
+                else:
+                    self._append_journal(events)
                 
-                # Достижения
-                'achievements': self.achievements,
+                # Автосохранение (verbose=False) пишется только в отладочный журнал
+                log = logger.info if verbose else logger.debug
+                log("Игра сохранена в %s", self.store.path if self.store else self.save_file)
+                return True
                 
-                # Метаданные
-                'last_played': datetime.now().isoformat(),
-                'last_session_seed': self.last_session_seed,
-                'first_play_date': self.first_play_date or datetime.now().isoformat(),
-                'version': '0.1.0'  # Версия формата сохранения
-            }
+            except Exception as e:
+                # Возвращаем события в очередь - они попадут в следующее сохранение
+                with self._lock:
+                    self._journal_pending[:0] = events
+                    self.dirty = True
+                    if snapshot:
+                        self._snapshot_required = True
+                logger.error("Ошибка при сохранении: %s", e)
+                return False
+    
+    def _snapshot_data(self) -> Dict[str, Any]:
+        """Данные полного снимка (вызывать под _lock)"""
+        return {
+            # Основные данные
+            'total_score': self.total_score,
+            'score': self.score,
             
-            # Создаем резервную копию, если файл уже существует
-            if os.path.exists(self.save_file):
-                self._create_backup()
+            # Статистика
+            'sessions_played': self.sessions_played,
+            'play_time': self.play_time,
+            'directories_decrypted': self.directories_decrypted,
+            'files_opened': self.files_opened,
+            'easter_eggs_found': self.easter_eggs_found,
+            'special_dirs_found': self.special_dirs_found,
             
-            # Сохраняем данные
-            with open(self.save_file, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
+            # Достижения и история
+            'achievements': dict(self.achievements),
+            'session_history': list(self.session_history),
+            'stats_buckets': self.stats.export_buckets(),
+            'world_deltas': {'seed': self.world_deltas['seed'], 'decoded': sorted(self.world_deltas['decoded'])},
             
-            # Обновляем время последней игры
-            self.last_played = save_data['last_played']
+            # Метаданные
+            'last_played': self.last_played,
+            'last_session_seed': self.last_session_seed,
+            'first_play_date': self.first_play_date,
+            'journal_seq': self._journal_seq,  # События журнала до этого номера уже в снимке
+        }
+    
+    def _write_snapshot(self, save_data: Dict[str, Any], events: List[Dict[str, Any]]) -> None:
+        """
+        Записать полный снимок состояния и очистить журнал
+        
+        Снимок кодируется и сбрасывается на диск во временный файл до взятия
+        блокировки. Если за это время другой процесс успел сохраниться, его
+        изменения сливаются и снимок пересобирается уже под блокировкой.
+        
+        Args:
+            save_data: Данные снимка
+            events: События, вошедшие в снимок (дополняются, если снимок пересобран)
+        """
+        fsync = SAVES['fsync']
+        temp_path = prepare_write(self.save_file, save_format.encode_save(save_data), fsync)
+        try:
+            with file_lock(self.lock_file):
+                if not self._overwrite_disk and self._disk_changed():
+                    self._merge_disk(events)
+                    with self._lock:
+                        # Снимок из памяти покрывает и события, накопленные с начала сохранения
+                        events.extend(self._journal_pending)
+                        self._journal_pending = []
+                        save_data = self._snapshot_data()
+                    discard_write(temp_path)
+                    temp_path = prepare_write(self.save_file, save_format.encode_save(save_data), fsync)
+                
+                # Резервная копия делается только при сворачивании журнала, а не при каждом сохранении
+                if os.path.exists(self.save_file):
+                    self._create_backup()
+                os.replace(temp_path, self.save_file)
+                
+                # Все события теперь в снимке. Если сбой случится до удаления журнала,
+                # при загрузке его записи будут пропущены по journal_seq
+                if os.path.exists(self.journal_file):
+                    os.remove(self.journal_file)
+                # Сохранение старого JSON-формата больше не нужно
+                if os.path.exists(self.legacy_save_file):
+                    os.remove(self.legacy_save_file)
+                
+                with self._lock:
+                    self._disk_stamp = file_stamp(self.save_file)
+                    self._journal_offset = 0
+                    self._journal_size = 0
+                    self._snapshot_required = False
+                    self._overwrite_disk = False
+        except BaseException:
+            discard_write(temp_path)
+            raise
+        
+        if fsync:
+            fsync_directory(self.save_dir)
+    
+    def _write_store(self, save_data: Dict[str, Any], events: List[Dict[str, Any]], snapshot: bool) -> None:
+        """
+        Записать профиль в SQLite-хранилище
+        
+        Счетчики пишутся приращениями из событий, поэтому сохранения
+        нескольких процессов складываются. Приращения других процессов
+        (значение в базе минус наше) добавляются к состоянию.
+        """
+        if snapshot:
+            self.store.save(save_data, save_data['session_history'], replace_history=True)
+        else:
+            stored = self.store.save(save_data, [event['r'] for event in events if event['t'] == 'hist'],
+                                     deltas=self._event_deltas(events))
+            with self._lock:
+                for name, value in stored.items():
+                    self.stats.totals[SLOT_INDEX[name]] += value - save_data[name]
+        
+        with self._lock:
+            self._snapshot_required = False
+            self._overwrite_disk = False
+    
+    @staticmethod
+    def _event_deltas(events: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Суммарные приращения счетчиков по событиям журнала"""
+        deltas: Dict[str, float] = {}
+        for event in events:
+            if event['t'] == 'score':
+                names = ('score', 'total_score')
+            elif event['t'] == 'stat' and event.get('k') in PERSISTENT_STATS:
+                names = (event['k'],)
+            else:
+                continue
+            for name in names:
+                deltas[name] = deltas.get(name, 0) + event['v']
+        return deltas
+    
+    def _append_journal(self, events: List[Dict[str, Any]]) -> None:
+        """Дописать события в журнал одной записью"""
+        if not events:
+            return
+        
+        with file_lock(self.lock_file):
+            self._merge_disk(events)
+            with self._lock:
+                for event in events:
+                    self._journal_seq += 1
+                    event['n'] = self._journal_seq
             
-            print(f"[DEBUG] Игра сохранена в {self.save_file}")
-            return True
+            lines = '\n'.join(json.dumps(event, ensure_ascii=False, separators=(',', ':'))
+                              for event in events)
+            append_line(self.journal_file, lines, fsync=False)
             
-        except Exception as e:
-            print(f"[ERROR] Ошибка при сохранении: {e}")
-            return False
+            with self._lock:
+                self._journal_size += len(events)
+                self._journal_offset = os.path.getsize(self.journal_file)
+        
+        # Порядок записей уже закреплен, сброс на диск не держит блокировку
+        if SAVES['fsync']:
+            fsync_file(self.journal_file)
+    
+    def _disk_changed(self) -> bool:
+        """Менялись ли файлы сохранения другим процессом с последнего согласования"""
+        try:
+            journal_size = os.path.getsize(self.journal_file)
+        except OSError:
+            journal_size = 0
+        return file_stamp(self.save_file) != self._disk_stamp or journal_size != self._journal_offset
+    
+    def _merge_disk(self, events: List[Dict[str, Any]]) -> None:
+        """
+        Слить в состояние изменения других процессов (вызывать под file_lock)
+        
+        Счетчики в событиях - приращения, поэтому изменения процессов
+        складываются, а не перезаписывают друг друга. Если журнал только
+        дописан, применяются чужие записи после _journal_offset. Если снимок
+        переписан, состояние перечитывается с диска и поверх накладываются
+        еще не сохраненные события этого процесса.
+        
+        Args:
+            events: Записываемые сейчас события этого процесса
+        """
+        stamp = file_stamp(self.save_file)
+        with self._lock:
+            if stamp != self._disk_stamp and stamp is not None:
+                unsaved = list(events) + self._journal_pending
+                self._discard_pending()
+                reader = save_format.SaveReader(self.save_file)
+                try:
+                    self._apply_snapshot(reader.read_all())
+                finally:
+                    reader.close()
+                self._disk_stamp = stamp
+                self._journal_size = 0
+                merged = self._replay_journal()
+                for event in unsaved:
+                    self._apply_event(event)
+            elif self._disk_changed():
+                self._disk_stamp = stamp
+                merged = self._replay_journal(offset=self._journal_offset)
+            else:
+                return
+            self._sync_achievements()
+        
+        logger.debug("Слиты изменения других процессов (событий журнала: %s)", merged)
     
     def load(self) -> bool:
-        """Загрузить состояние игры из файла"""
+        """
+        Загрузить состояние игры
+        
+        Из файла сохранения сразу читается только заголовок: общий счет,
+        число сессий и seed последней сессии. Меню появляется за постоянное
+        время, сколько бы ни накопилось истории. Остальные секции читаются
+        при первом обращении к своим данным (_require). Файлы старых версий,
+        JSON и SQLite-хранилище загружаются целиком.
+        
+        Файлы читаются под разделяемой блокировкой SAVES['lock_file'], чтобы
+        другой процесс не свернул журнал между чтением снимка и журнала.
+        """
         try:
-            if not os.path.exists(self.save_file):
-                print(f"[DEBUG] Файл сохранения не найден: {self.save_file}")
-                # Устанавливаем дату первого запуска
-                self.first_play_date = datetime.now().isoformat()
-                return False
+            # Разделяемая блокировка: снимок и журнал читаются согласованными
+            with file_lock(self.lock_file, shared=True):
+                self._discard_pending()
+                stored = self.store.load() if self.store is not None else None
+                if stored is not None:
+                    save_data, source, migrated = stored, self.store.path, False
+                elif os.path.exists(self.save_file):
+                    # С SQLite-хранилищем файл сохранения переносится в базу
+                    reader = save_format.SaveReader(self.save_file)
+                    source, migrated = self.save_file, self.store is not None
+                    if migrated or reader.version < 3:
+                        save_data = reader.read_all()
+                        reader.close()
+                    else:
+                        save_data, self._reader = None, reader
+                elif os.path.exists(self.legacy_save_file):
+                    # Сохранение версии до двоичного формата: читаем JSON,
+                    # следующее сохранение запишет двоичный снимок
+                    with open(self.legacy_save_file, 'r', encoding='utf-8') as f:
+                        save_data = save_format.import_json(f.read())
+                    source, migrated = self.legacy_save_file, True
+                else:
+                    logger.debug("Файл сохранения не найден: %s", self.save_file)
+                    # Устанавливаем дату первого запуска
+                    self.first_play_date = datetime.now().isoformat()
+                    return False
+                
+                # Применяем события журнала, записанные после снимка
+                self._journal_pending.clear()
+                self._journal_size = 0
+                self._snapshot_required = migrated
+                if save_data is None:
+                    # Сейчас применяется только заголовок, секции - при чтении
+                    self._apply_section('HDR', self._reader.header)
+                    self._pending = set(LAZY_SECTIONS)
+                    for name in LAZY_ATTRIBUTES:
+                        self.__dict__.pop(name, None)
+                    replayed = self._replay_journal(('HDR',))
+                else:
+                    self._apply_snapshot(save_data)
+                    replayed = self._replay_journal() if stored is None else 0
+                self.dirty = migrated
+                self._disk_stamp = file_stamp(self.save_file)
+                # Перенос файла в SQLite-хранилище записывает профиль целиком
+                self._overwrite_disk = migrated and self.store is not None
+                if not self._pending:
+                    self._sync_achievements()
             
-            with open(self.save_file, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
+            logger.debug("Игра загружена из %s (событий журнала: %s)", source, replayed)
+            logger.debug("Общий счет: %s, Сессий: %s", self.total_score, self.sessions_played)
+            return True
             
-            # Загружаем основные данные
-            self.total_score = save_data.get('total_score', 0)
-            self.score = save_data.get('score', 0)
+        except Exception as e:
+            logger.error("Ошибка при загрузке: %s", e)
+            return False
+    
+    def _require(self, section: str) -> None:
+        """
+        Прочитать секцию сохранения при первом обращении к ее данным
+        
+        Поверх секции применяются отложенные при загрузке события журнала.
+        Поврежденная секция заменяется значениями по умолчанию, следующее
+        сохранение перепишет снимок целиком.
+        
+        Args:
+            section: Тег секции ('STAT', 'ACHV' ...)
+        """
+        with self._lock:
+            if section not in self._pending:
+                return
+            self._pending.discard(section)
             
-            # Загружаем статистику
-            self.sessions_played = save_data.get('sessions_played', 0)
-            self.play_time = save_data.get('play_time', 0)
-            self.directories_decrypted = save_data.get('directories_decrypted', 0)
-            self.files_opened = save_data.get('files_opened', 0)
-            self.easter_eggs_found = save_data.get('easter_eggs_found', 0)
-            self.special_dirs_found = save_data.get('special_dirs_found', 0)
+            try:
+                data = self._reader.read(section)
+            except Exception as e:
+                logger.error("Секция %s сохранения не прочитана: %s", section, e)
+                data = {}
+                self._snapshot_required = True
             
-            # Загружаем достижения
-            self.achievements = save_data.get('achievements', {
-                'first_decryption': False,
-                'easter_egg_hunter': False,
-                'void_explorer': False,
-                'master_decryptor': False
-            })
+            self._apply_section(section, data)
+            for event in self._deferred_events:
+                self._apply_event(event, (section,))
             
-            # Загружаем метаданные
-            self.last_played = save_data.get('last_played')
-            self.last_session_seed = save_data.get('last_session_seed')
-            self.first_play_date = save_data.get('first_play_date')
+            if not self._pending:
+                self._reader.close()
+                self._reader = None
+                self._deferred_events = []
+            logger.debug("Прочитана секция сохранения %s", section)
             
-            print(f"[DEBUG] Игра загружена из {self.save_file}")
-            print(f"[DEBUG] Общий счет: {self.total_score}, Сессий: {self.sessions_played}")
+            if section == 'ACHV':
+                self._sync_achievements()
+    
+    def _load_pending(self) -> None:
+        """Прочитать все оставшиеся секции (перед изменением состояния)"""
+        for section in LAZY_SECTIONS:
+            if section in self._pending:
+                self._require(section)
+    
+    def _discard_pending(self) -> None:
+        """Забыть непрочитанные секции, оставив значения по умолчанию"""
+        with self._lock:
+            pending, self._pending = self._pending, set()
+            for section in pending:
+                self._apply_section(section, {})
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+            self._deferred_events = []
+    
+    def _apply_snapshot(self, save_data: Dict[str, Any]) -> None:
+        """Заполнить состояние из словаря снимка (двоичного или JSON)"""
+        for section in ALL_SECTIONS:
+            self._apply_section(section, save_data)
+    
+    def _apply_section(self, section: str, data: Dict[str, Any]) -> None:
+        """
+        Заполнить поля одной части снимка
+        
+        Args:
+            section: 'HDR' (заголовок) или тег секции
+            data: Словарь снимка или его часть; отсутствующие поля - по умолчанию
+        """
+        totals = self.stats.totals
+        if section == 'HDR':
+            for name in HEADER_STATS:
+                totals[SLOT_INDEX[name]] = data.get(name, 0)
+            self.last_session_seed = data.get('last_session_seed')
+            self._journal_seq = data.get('journal_seq', 0)
+        elif section == 'STAT':
+            for name in SECTION_STATS:
+                totals[SLOT_INDEX[name]] = data.get(name, 0)
+        elif section == 'ACHV':
+            # SQLite-хранилище возвращает только открытые достижения
+            self.achievements = self._empty_achievements()
+            self.achievements.update(data.get('achievements', {}))
+        elif section == 'HIST':
+            self.session_history = list(data.get('session_history', []))
+        elif section == 'META':
+            self.last_played = data.get('last_played')
+            self.first_play_date = data.get('first_play_date')
+        elif section == 'BCKT':
+            self.stats.import_buckets(data.get('stats_buckets'))
+        elif section == 'WRLD':
+            world = data.get('world_deltas') or {}
+            self.world_deltas = {'seed': world.get('seed'), 'decoded': PSet(world.get('decoded', []))}
+    
+    def export_json(self, path: str) -> bool:
+        """
+        Экспортировать сохранение в JSON
+        
+        Args:
+            path: Путь к JSON-файлу
+        """
+        try:
+            with self._lock:
+                self._load_pending()
+                save_data = self._snapshot_data()
+            atomic_write(path, save_format.export_json(save_data), fsync=SAVES['fsync'])
+            logger.debug("Сохранение экспортировано в %s", path)
             return True
+        except Exception as e:
+            logger.error("Ошибка при экспорте: %s", e)
+            return False
+    
+    def import_json(self, path: str) -> bool:
+        """
+        Импортировать сохранение из JSON (заменяет текущее состояние)
+        
+        Args:
+            path: Путь к JSON-файлу
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                save_data = save_format.import_json(f.read())
             
+            with self._lock:
+                journal_seq = self._journal_seq
+                self._discard_pending()
+                self._apply_snapshot(save_data)
+                self._sync_achievements()
+                # Номера событий не должны повторяться: старый журнал
+                # будет удален при записи снимка, но до этого не должен примениться
+                self._journal_seq = max(journal_seq, self._journal_seq)
+                self._journal_pending.clear()
+                self._snapshot_required = True
+                self._overwrite_disk = True
+                self.dirty = True
+            
+            logger.debug("Сохранение импортировано из %s", path)
+            return True
         except Exception as e:
-            print(f"[ERROR] Ошибка при загрузке: {e}")
+            logger.error("Ошибка при импорте: %s", e)
             return False
     
+    def _replay_journal(self, sections: Tuple[str, ...] = ALL_SECTIONS, offset: int = 0) -> int:
+        """
+        Применить события журнала поверх загруженного снимка
+        
+        Args:
+            sections: Части снимка, которые уже загружены; для остальных
+                      события откладываются до чтения секции
+            offset: С какого байта читать (записи до него уже учтены)
+        
+        Returns:
+            Количество примененных событий
+        """
+        self._journal_offset = offset
+        if not os.path.exists(self.journal_file):
+            self._journal_offset = 0
+            return 0
+        
+        applied = 0
+        with open(self.journal_file, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # Оборванная запись (сбой во время дозаписи): дальше журнал
+                    # не читается, следующее сохранение перепишет снимок
+                    self._snapshot_required = True
+                    break
+                
+                self._journal_offset += len(line)
+                self._journal_size += 1
+                if event.get('n', 0) <= self._journal_seq:
+                    continue  # Событие уже учтено в снимке
+                
+                self._apply_event(event, sections)
+                if self._pending:
+                    self._deferred_events.append(event)
+                self._journal_seq = event['n']
+                applied += 1
+        
+        return applied
+    
+    def _apply_event(self, event: Dict[str, Any], sections: Tuple[str, ...] = ALL_SECTIONS) -> None:
+        """
+        Применить одно событие журнала
+        
+        Args:
+            event: Событие
+            sections: Части снимка, которые нужно обновить
+        """
+        event_type = event.get('t')
+        
+        if event_type == 'score':
+            self._replay_stat('score', event['v'], event.get('s'), sections)
+            self._replay_stat('total_score', event['v'], event.get('s'), sections)
+        elif event_type == 'stat' and event.get('k') in PERSISTENT_STATS:
+            self._replay_stat(event['k'], event['v'], event.get('s'), sections)
+        elif event_type == 'ach' and 'ACHV' in sections:
+            self.achievements[event['k']] = True
+        elif event_type == 'meta' and PERSISTENT_META.get(event.get('k')) in sections:
+            setattr(self, event['k'], event['v'])
+        elif event_type == 'hist' and 'HIST' in sections:
+            self._append_history(event['r'])
+        elif event_type == 'world' and 'WRLD' in sections:
+            decoded = self.world_deltas['decoded']
+            if 'p' in event:
+                self.world_deltas['decoded'] = decoded.add(event['p'])
+            elif 'x' in event:
+                self.world_deltas['decoded'] = decoded.discard(event['x'])
+            else:
+                self.world_deltas = {'seed': event.get('seed'), 'decoded': PSet()}
+    
+    def _replay_stat(self, name: str, value: Any, timestamp: Optional[int],
+                     sections: Tuple[str, ...] = ALL_SECTIONS) -> None:
+        """Применить изменение счетчика из журнала (записи без времени меняют только итог)"""
+        if ('HDR' if name in HEADER_STATS else 'STAT') in sections:
+            self.stats.totals[SLOT_INDEX[name]] += value
+        if timestamp is not None and 'BCKT' in sections:
+            self.stats.record(name, value, timestamp)
+    
     def _create_backup(self) -> None:
-        """Создать резервную копию файла сохранения"""
+        """
+        Создать резервную копию файла сохранения
+        
+        Копии хранятся в кольце слотов backups/<файл>.backup.0..N-1 (0 - самая
+        новая): слоты сдвигаются переименованием os.replace, а в слот 0
+        ставится жесткая ссылка на текущий файл (или копия, если ссылки не
+        поддерживаются). Это фиксированное число операций с метаданными
+        независимо от размера сохранения и содержимого директории.
+        """
         try:
-            import shutil
-            from datetime import datetime
-            
             # Создаем директорию для бэкапов, если ее нет
             backup_dir = os.path.join(self.save_dir, 'backups')
             os.makedirs(backup_dir, exist_ok=True)
             
-            # Генерируем имя файла с временной меткой
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_file = os.path.join(backup_dir, f'voider_save_backup_{timestamp}.json')
+            keep_count = SAVES['backup_count']
+            if keep_count <= 0:
+                return
             
-            # Копируем файл
-            shutil.copy2(self.save_file, backup_file)
+            # Сдвигаем слоты: N-2 -> N-1, ..., 0 -> 1 (самая старая копия перезаписывается)
+            for slot in range(keep_count - 1, 0, -1):
+                try:
+                    os.replace(self._backup_path(backup_dir, slot - 1), self._backup_path(backup_dir, slot))
+                except FileNotFoundError:
+                    pass
             
-            # Удаляем старые бэкапы (оставляем только последние N)
-            self._cleanup_old_backups(backup_dir)
+            # Снимок пишется через os.replace, поэтому ссылка сохранит старое содержимое
+            link_or_copy(self.save_file, self._backup_path(backup_dir, 0))
             
         except Exception as e:
-            print(f"[WARNING] Не удалось создать бэкап: {e}")
+            logger.warning("Не удалось создать бэкап: %s", e)
     
-    def _cleanup_old_backups(self, backup_dir: str) -> None:
-        """Удалить старые резервные копии"""
-        try:
-            import glob
-            
-            # Получаем все файлы бэкапов
-            backup_files = glob.glob(os.path.join(backup_dir, 'voider_save_backup_*.json'))
-            
-            # Сортируем по времени модификации (новые в конце)
-            backup_files.sort(key=os.path.getmtime)
-            
-            # Удаляем старые файлы, оставляя только последние N
-            keep_count = SAVES['backup_count']
-            if len(backup_files) > keep_count:
-                for old_file in backup_files[:-keep_count]:
-                    os.remove(old_file)
-                    
-        except Exception as e:
-            print(f"[WARNING] Не удалось очистить старые бэкапы: {e}")
+    def _backup_path(self, backup_dir: str, slot: int) -> str:
+        """Путь к слоту резервной копии"""
+        return os.path.join(backup_dir, f'{os.path.basename(self.save_file)}.backup.{slot}')
     
     def has_save(self) -> bool:
         """Проверить наличие файла сохранения"""
-        return os.path.exists(self.save_file)
+        if self.store is not None and self.store.has_profile():
+            return True
+        return os.path.exists(self.save_file) or os.path.exists(self.legacy_save_file)
     
     def reset(self, keep_stats: bool = False) -> None:
         """Сбросить текущее состояние игры"""
+        self._load_pending()
         self.score = 0
         self.session_score = 0
         
@@ -294,14 +1033,18 @@ class GameState:
             self.files_opened = 0
             self.easter_eggs_found = 0
             self.special_dirs_found = 0
-            self.achievements = {
-                'first_decryption': False,
-                'easter_egg_hunter': False,
-                'void_explorer': False,
-                'master_decryptor': False
-            }
+            self.session_history = []
+            self.stats.clear_buckets()
+            self.achievements = self._empty_achievements()
+            self.achievement_engine.reset(self.achievements)
         
-        print("[DEBUG] Состояние игры сброшено")
+        # Сброс не выражается событиями журнала - нужен полный снимок,
+        # заменяющий и изменения других процессов
+        self._snapshot_required = True
+        self._overwrite_disk = True
+        self.dirty = True
+        
+        logger.debug("Состояние игры сброшено")
     
     def get_statistics(self) -> Dict[str, Any]:
         """Получить статистику в виде словаря"""
@@ -318,7 +1061,22 @@ class GameState:
             'last_session_seed': self.last_session_seed,
             'last_session_score': self.session_score,
             'last_played': self.last_played or 'Никогда',
-            'first_play_date': self.first_play_date or 'Неизвестно'
+            'first_play_date': self.first_play_date or 'Неизвестно',
+            'trends': self.get_trends()
+        }
+    
+    def get_trends(self) -> Dict[str, Any]:
+        """Динамика по корзинам статистики (без просмотра истории сессий)"""
+        self._require('BCKT')
+        stats = self.stats
+        now = time.time()
+        return {
+            'score_last_hour': stats.window('total_score', minutes=60, now=now),
+            'score_today': stats.window('total_score', days=1, now=now),
+            'score_week': stats.window('total_score', days=7, now=now),
+            'decryptions_per_minute': round(stats.rate_per_minute('directories_decrypted', 60, now), 2),
+            'decryptions_today': stats.window('directories_decrypted', days=1, now=now),
+            'files_week': stats.window('files_opened', days=7, now=now),
         }
     
     def show_stats(self) -> None:
@@ -342,7 +1100,15 @@ class GameState:
         print(f"  Найдено пасхалок: {stats['easter_eggs_found']}")
         print(f"  Особых директорий: {stats['special_dirs_found']}")
         
-        print(f"\nДОСТИЖЕНИЯ: {stats['achievements_unlocked']}/4")
+        trends = stats['trends']
+        print(f"\nДИНАМИКА:")
+        print(f"  Очков за час / сутки / неделю: {trends['score_last_hour']} / "
+              f"{trends['score_today']} / {trends['score_week']}")
+        print(f"  Расшифровок сегодня: {trends['decryptions_today']} "
+              f"({trends['decryptions_per_minute']} в минуту за последний час)")
+        print(f"  Открыто файлов за неделю: {trends['files_week']}")
+        
+        print(f"\nДОСТИЖЕНИЯ: {stats['achievements_unlocked']}/{len(self.achievements)}")
         for name, unlocked in self.achievements.items():
             status = "✓" if unlocked else "✗"
             print(f"  {status} {self._get_achievement_name(name)}")
@@ -356,13 +1122,7 @@ class GameState:
     
     def _get_achievement_name(self, key: str) -> str:
         """Получить читаемое название достижения"""
-        names = {
-            'first_decryption': 'Первая расшифровка',
-            'easter_egg_hunter': 'Охотник за пасхалками',
-            'void_explorer': 'Исследователь пустоты',
-            'master_decryptor': 'Мастер дешифровки'
-        }
-        return names.get(key, key)
+        return self.achievement_engine.name(key)
 
 
 # Тестирование класса (если файл запущен напрямую)
@@ -383,9 +1143,10 @@ if __name__ == "__main__":
     # Сохраняем
     state.save()
     
-    # Загружаем
+    # Загружаем: сразу читается только заголовок, секции - при обращении
     state2 = GameState()
     state2.load()
+    print(f"Общий счет из заголовка: {state2.total_score}, непрочитанных секций: {len(state2._pending)}")
     
     # Показываем статистику
     state2.show_stats()
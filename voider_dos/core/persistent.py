@@ -0,0 +1,411 @@
+"""
+Постоянные (неизменяемые) структуры данных со структурным разделением
+
+PMap - отображение на основе HAMT (hash array mapped trie): узел хранит
+битовую карту занятых ячеек и плотный кортеж до 32 элементов, каждый
+уровень разбирает очередные 5 бит хеша ключа. Изменение копирует только
+путь от корня до листа (O(log32 n) узлов), остальные узлы общие у старой
+и новой версии. Поэтому "снимок" - это просто ссылка на текущую версию
+(O(1)), а разница двух версий (diff) обходит только несовпадающие
+поддеревья - O(числа изменений).
+
+PSet - множество поверх PMap.
+"""
+
+from typing import Any, Hashable, Iterable, Iterator, Optional, Set, Tuple
+
+# Бит хеша на уровень и ширина узла
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+# hash() дает не больше 64 бит; глубже ключи с равным хешем хранятся списком
+_HASH_BITS = 64
+
+# Отсутствующее значение в diff
+MISSING: Any = object()
+
+# Лист - кортеж (хеш, ключ, значение)
+Leaf = Tuple[int, Hashable, Any]
+
+
+def _hash(key: Hashable) -> int:
+    return hash(key) & ((1 << _HASH_BITS) - 1)
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count('1')
+
+
+class _Node:
+    """Узел HAMT: битовая карта занятых ячеек и их элементы по порядку"""
+
+    __slots__ = ('bitmap', 'array')
+
+    def __init__(self, bitmap: int, array: tuple):
+        self.bitmap = bitmap
+        self.array = array
+
+    def slot(self, bit: int) -> Any:
+        """Элемент ячейки bit (None, если ячейка пуста)"""
+        if not self.bitmap & bit:
+            return None
+        return self.array[_popcount(self.bitmap & (bit - 1))]
+
+    def find(self, shift: int, h: int, key: Hashable) -> Optional[Leaf]:
+        entry = self.slot(1 << ((h >> shift) & _MASK))
+        if entry is None:
+            return None
+        if type(entry) is tuple:
+            return entry if entry[0] == h and (entry[1] is key or entry[1] == key) else None
+        return entry.find(shift + _BITS, h, key)
+
+    def assoc(self, shift: int, leaf: Leaf) -> Tuple['_Node', bool]:
+        """Версия узла с листом leaf (второй элемент - добавлен ли новый ключ)"""
+        h = leaf[0]
+        bit = 1 << ((h >> shift) & _MASK)
+        index = _popcount(self.bitmap & (bit - 1))
+        if not self.bitmap & bit:
+            return _Node(self.bitmap | bit, self.array[:index] + (leaf,) + self.array[index:]), True
+
+        entry = self.array[index]
+        if type(entry) is tuple:
+            if entry[0] == h and (entry[1] is leaf[1] or entry[1] == leaf[1]):
+                if entry[2] is leaf[2]:
+                    return self, False
+                new_entry, added = leaf, False
+            else:
+                new_entry, added = _join(shift + _BITS, entry, leaf), True
+        else:
+            new_entry, added = entry.assoc(shift + _BITS, leaf)
+            if new_entry is entry:
+                return self, False
+        return _Node(self.bitmap, self.array[:index] + (new_entry,) + self.array[index + 1:]), added
+
+    def without(self, shift: int, h: int, key: Hashable) -> Tuple[Any, bool]:
+        """
+        Версия узла без ключа
+
+        Returns:
+            (узел, лист или None, если узел опустел; удален ли ключ)
+        """
+        bit = 1 << ((h >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return self, False
+        index = _popcount(self.bitmap & (bit - 1))
+        entry = self.array[index]
+
+        if type(entry) is tuple:
+            if not (entry[0] == h and (entry[1] is key or entry[1] == key)):
+                return self, False
+            new_entry = None
+        else:
+            new_entry, removed = entry.without(shift + _BITS, h, key)
+            if not removed:
+                return self, False
+
+        if new_entry is None:
+            if len(self.array) == 1:
+                return None, True
+            array = self.array[:index] + self.array[index + 1:]
+            bitmap = self.bitmap & ~bit
+        else:
+            array = self.array[:index] + (new_entry,) + self.array[index + 1:]
+            bitmap = self.bitmap
+        if len(array) == 1 and type(array[0]) is tuple and shift:
+            # Единственный лист поднимается на уровень выше: форма дерева
+            # зависит только от набора ключей, и diff не видит ложных различий
+            return array[0], True
+        return _Node(bitmap, array), True
+
+    def leaves(self) -> Iterator[Leaf]:
+        for entry in self.array:
+            if type(entry) is tuple:
+                yield entry
+            else:
+                yield from entry.leaves()
+
+
+class _Collision:
+    """Ключи с полностью совпадающим хешем"""
+
+    __slots__ = ('array',)
+
+    def __init__(self, array: Tuple[Leaf, ...]):
+        self.array = array
+
+    def find(self, shift: int, h: int, key: Hashable) -> Optional[Leaf]:
+        for leaf in self.array:
+            if leaf[1] is key or leaf[1] == key:
+                return leaf
+        return None
+
+    def assoc(self, shift: int, leaf: Leaf) -> Tuple['_Collision', bool]:
+        for index, entry in enumerate(self.array):
+            if entry[1] is leaf[1] or entry[1] == leaf[1]:
+                if entry[2] is leaf[2]:
+                    return self, False
+                return _Collision(self.array[:index] + (leaf,) + self.array[index + 1:]), False
+        return _Collision(self.array + (leaf,)), True
+
+    def without(self, shift: int, h: int, key: Hashable) -> Tuple[Any, bool]:
+        for index, entry in enumerate(self.array):
+            if entry[1] is key or entry[1] == key:
+                array = self.array[:index] + self.array[index + 1:]
+                return (array[0] if len(array) == 1 else _Collision(array)), True
+        return self, False
+
+    def leaves(self) -> Iterator[Leaf]:
+        return iter(self.array)
+
+
+def _join(shift: int, first: Leaf, second: Leaf) -> Any:
+    """Поддерево из двух листов с разными ключами, начиная с уровня shift"""
+    if shift >= _HASH_BITS:
+        return _Collision((first, second))
+    first_bit = 1 << ((first[0] >> shift) & _MASK)
+    second_bit = 1 << ((second[0] >> shift) & _MASK)
+    if first_bit == second_bit:
+        return _Node(first_bit, (_join(shift + _BITS, first, second),))
+    if first_bit < second_bit:
+        return _Node(first_bit | second_bit, (first, second))
+    return _Node(first_bit | second_bit, (second, first))
+
+
+def _entry_leaves(entry: Any) -> Iterator[Leaf]:
+    if entry is None:
+        return iter(())
+    if type(entry) is tuple:
+        return iter((entry,))
+    return entry.leaves()
+
+
+def _diff(first: Any, second: Any) -> Iterator[Tuple[Hashable, Any, Any]]:
+    """Различия двух поддеревьев: (ключ, старое значение, новое значение)"""
+    if first is second:
+        return
+    if type(first) is _Node and type(second) is _Node:
+        bits = first.bitmap | second.bitmap
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            yield from _diff(first.slot(bit), second.slot(bit))
+        return
+
+    # Листья, коллизии или лист против узла: поддеревья здесь малы
+    old = {leaf[1]: leaf[2] for leaf in _entry_leaves(first)}
+    for _, key, value in _entry_leaves(second):
+        previous = old.pop(key, MISSING)
+        if previous is not value and previous != value:
+            yield key, previous, value
+    for key, value in old.items():
+        yield key, value, MISSING
+
+
+class PMap:
+    """Неизменяемое отображение: set/remove возвращают новую версию"""
+
+    __slots__ = ('_root', '_size')
+
+    def __init__(self, items: Iterable[Tuple[Hashable, Any]] = ()):
+        """
+        Args:
+            items: Пары (ключ, значение)
+        """
+        self._root: Optional[_Node] = None
+        self._size = 0
+        for key, value in items:
+            self._root, self._size = self._assoc(key, value)
+
+    @classmethod
+    def _make(cls, root: Optional[_Node], size: int) -> 'PMap':
+        result = cls.__new__(cls)
+        result._root = root
+        result._size = size
+        return result
+
+    def _assoc(self, key: Hashable, value: Any) -> Tuple[_Node, int]:
+        leaf = (_hash(key), key, value)
+        if self._root is None:
+            return _Node(1 << (leaf[0] & _MASK), (leaf,)), 1
+        root, added = self._root.assoc(0, leaf)
+        return root, self._size + added
+
+    def set(self, key: Hashable, value: Any) -> 'PMap':
+        """Версия с ключом key = value"""
+        root, size = self._assoc(key, value)
+        if root is self._root:
+            return self
+        return self._make(root, size)
+
+    def remove(self, key: Hashable) -> 'PMap':
+        """Версия без ключа (та же версия, если ключа нет)"""
+        if self._root is None:
+            return self
+        root, removed = self._root.without(0, _hash(key), key)
+        if not removed:
+            return self
+        return self._make(root, self._size - 1)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if self._root is None:
+            return default
+        leaf = self._root.find(0, _hash(key), key)
+        return default if leaf is None else leaf[2]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, MISSING) is not MISSING
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return (leaf[1] for leaf in _entry_leaves(self._root))
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        return ((leaf[1], leaf[2]) for leaf in _entry_leaves(self._root))
+
+    def diff(self, other: 'PMap') -> Iterator[Tuple[Hashable, Any, Any]]:
+        """
+        Различия с другой версией за O(числа изменений)
+
+        Общие поддеревья пропускаются по идентичности, поэтому сравнение
+        версий, произошедших одна от другой, не обходит все ключи.
+
+        Args:
+            other: Другая версия
+
+        Returns:
+            Итератор (ключ, значение здесь, значение в other); отсутствующее - MISSING
+        """
+        return _diff(self._root, other._root)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, PMap):
+            return NotImplemented
+        return len(self) == len(other) and next(self.diff(other), None) is None
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PMap({dict(self.items())!r})"
+
+
+class PSet:
+    """Неизменяемое множество поверх PMap"""
+
+    __slots__ = ('_map',)
+
+    def __init__(self, items: Iterable[Hashable] = ()):
+        """
+        Args:
+            items: Элементы множества
+        """
+        self._map = PMap((item, True) for item in items)
+
+    @classmethod
+    def _make(cls, mapping: PMap) -> 'PSet':
+        result = cls.__new__(cls)
+        result._map = mapping
+        return result
+
+    def add(self, item: Hashable) -> 'PSet':
+        """Версия с элементом"""
+        mapping = self._map.set(item, True)
+        return self if mapping is self._map else self._make(mapping)
+
+    def discard(self, item: Hashable) -> 'PSet':
+        """Версия без элемента"""
+        mapping = self._map.remove(item)
+        return self if mapping is self._map else self._make(mapping)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._map
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._map)
+
+    def diff(self, other: 'PSet') -> Tuple[Set[Hashable], Set[Hashable]]:
+        """
+        Различия с другой версией за O(числа изменений)
+
+        Returns:
+            (есть только в other, есть только здесь)
+        """
+        added, removed = set(), set()
+        for item, before, _ in self._map.diff(other._map):
+            (added if before is MISSING else removed).add(item)
+        return added, removed
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, PSet):
+            return NotImplemented
+        return self._map == other._map
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PSet({list(self)!r})"
+
+
+# Тестирование модуля (если файл запущен напрямую)
+if __name__ == "__main__":
+    import random
+    import time
+
+    print("Тестирование постоянных структур...")
+
+    rng = random.Random(1)
+    reference = {}
+    current = PMap()
+    versions = []
+    for step in range(20000):
+        key = rng.randint(0, 5000)
+        if rng.random() < 0.3:
+            reference.pop(key, None)
+            current = current.remove(key)
+        else:
+            reference[key] = step
+            current = current.set(key, step)
+        if step % 5000 == 0:
+            versions.append((dict(reference), current))
+
+    same = len(current) == len(reference) and all(current[k] == v for k, v in reference.items())
+    print(f"  {'✓' if same else '✗'} {len(current)} ключей совпадают со словарем")
+    old_same = all(dict(version.items()) == snapshot for snapshot, version in versions)
+    print(f"  {'✓' if old_same else '✗'} Старые версии не изменились")
+
+    # Коллизии хешей
+    class Colliding:
+        def __init__(self, value):
+            self.value = value
+
+        def __hash__(self):
+            return 42
+
+        def __eq__(self, other):
+            return isinstance(other, Colliding) and other.value == self.value
+
+    keys = [Colliding(i) for i in range(5)]
+    colliding = PMap((key, key.value) for key in keys).remove(keys[2])
+    ok = len(colliding) == 4 and colliding[Colliding(3)] == 3 and Colliding(2) not in colliding
+    print(f"  {'✓' if ok else '✗'} Ключи с одинаковым хешем")
+
+    # Снимок и разница на большом множестве
+    decoded = PSet(f'{i}/{i % 7}' for i in range(200000))
+    start = time.perf_counter()
+    snapshot = decoded
+    later = decoded.add('new/1').add('new/2').discard('5/5')
+    added, removed = snapshot.diff(later)
+    elapsed = (time.perf_counter() - start) * 1000
+    ok = added == {'new/1', 'new/2'} and removed == {'5/5'}
+    print(f"  {'✓' if ok else '✗'} Снимок и разница на 200000 элементах за {elapsed:.3f} мс")
+
+    print("\nТестирование завершено!")
@@ -0,0 +1,112 @@
+"""
+Результаты команд GameEngine: структурированные данные без оформления
+
+Команды возвращают один из классов вывода (Message, Listing, FileView,
+Decryption ...), GameEngine.step оборачивает его в Result вместе со
+счетом, путем и открытыми достижениями. Цвета и рамки добавляет только
+терминальный GameSession; боты и тесты читают поля напрямую.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Уровни Message: как терминал выделяет сообщение
+LEVELS = ('info', 'success', 'notice', 'warning', 'error')
+
+
+@dataclass
+class Message:
+    """Одно сообщение"""
+    text: str
+    level: str = 'info'
+
+
+@dataclass
+class Listing:
+    """Строки вывода (dir, find, help, ciphers)"""
+    lines: List[str]
+    title: str = ''
+
+
+@dataclass
+class FileView:
+    """Открытый файл; points - очки за первое открытие в сессии"""
+    filename: str
+    content: str
+    is_easter_egg: bool = False
+    points: int = 0
+    reason: str = ''
+
+
+@dataclass
+class Decryption:
+    """Расшифрованная директория"""
+    dir_name: str
+    points: int
+    message: str = ''
+
+
+@dataclass
+class Analysis:
+    """Частотный анализ (словарь decryption.analyze_text)"""
+    data: Dict[str, Any]
+
+
+@dataclass
+class Scores:
+    """Счет сессии и общий счет"""
+    session_score: int
+    total_score: int
+
+
+@dataclass
+class QuickSlots:
+    """Быстрые сохранения: {'slot', 'created', 'score', 'path'}"""
+    slots: List[Dict[str, Any]]
+
+
+@dataclass
+class SessionStats:
+    """Статистика текущей сессии"""
+    seed: int
+    duration: float
+    commands: int
+    path: str
+    items_in_dir: int
+    vfs: Dict[str, Any]
+    caches: Dict[str, Dict[str, int]]
+
+
+@dataclass
+class Achievement:
+    """Достижение, открытое командой"""
+    key: str
+    name: str
+    description: str
+
+
+@dataclass
+class Result:
+    """Результат GameEngine.step"""
+    command: str
+    output: Any = None                  # Один из классов вывода или None
+    ok: bool = True
+    score: int = 0
+    path: str = ''
+    achievements: List[Achievement] = field(default_factory=list)
+    running: bool = True                # False после exit
+
+
+def error(text: str, warning: bool = False) -> Message:
+    """Сообщение об ошибке (warning - предупреждение)"""
+    return Message(text, 'warning' if warning else 'error')
+
+
+def is_error(output: Any) -> bool:
+    """Является ли вывод команды ошибкой"""
+    return isinstance(output, Message) and output.level == 'error'
+
+
+def output_type(output: Any) -> Optional[str]:
+    """Имя класса вывода для сериализации ('Message', 'FileView' ...)"""
+    return type(output).__name__ if output is not None else None
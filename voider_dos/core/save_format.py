@@ -0,0 +1,586 @@
+"""
+Двоичный формат сохранения THE-VOIDER-DOS
+
+Файл состоит из заголовка фиксированного размера и секций вида
+[тег 4 байта][длина uint32][crc32 данных][данные]:
+
+    VDSV | версия | число секций | crc32 заголовка | total_score | sessions_played |
+           journal_seq | seed последней сессии
+    STAT - счетчики статистики
+    ACHV - достижения
+    HIST - история сессий (записи фиксированного размера)
+    META - даты первой и последней игры
+    BCKT - поминутные и посуточные корзины статистики (StatsStore)
+    WRLD - изменения мира последней сессии (seed и расшифрованные директории)
+
+Заголовок читается отдельно (read_header), поэтому меню может показать
+общий счет, не разбирая весь файл. SaveReader читает секции по одной:
+у каждой своя контрольная сумма, а таблица секций строится без чтения
+их данных. Неизвестные секции пропускаются, так что новые версии могут
+добавлять свои. JSON остается форматом импорта/экспорта.
+"""
+
+import json
+import os
+import struct
+import zlib
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+MAGIC = b'VDSV'
+FORMAT_VERSION = 3
+
+# Сигнатура и версия - одинаковы во всех версиях формата
+PREFIX = struct.Struct('<4sH')
+
+# magic, версия, число секций, crc32 заголовка, total_score, sessions_played,
+# journal_seq, есть ли seed, seed последней сессии
+HEADER = struct.Struct('<4sHHIqIQ?q')
+# Тег, длина, crc32 данных секции
+SECTION = struct.Struct('<4sII')
+
+# Версии 1-2: без seed в заголовке, одна контрольная сумма на все секции
+HEADER_V2 = struct.Struct('<4sHHIqIQ')
+SECTION_V2 = struct.Struct('<4sI')
+
+# Счетчики секции STAT в порядке упаковки
+STAT_FIELDS = ('score', 'play_time', 'directories_decrypted', 'files_opened',
+               'easter_eggs_found', 'special_dirs_found')
+STAT = struct.Struct('<qdIIII')
+
+# Запись истории: есть ли seed, seed, начало (unix time), минуты, очки, расшифровано, файлов, команд
+HISTORY_RECORD = struct.Struct('<?qddqIII')
+# Версия 1 не хранила количество команд
+HISTORY_RECORD_V1 = struct.Struct('<?qddqII')
+
+# Корзины статистики: число слотов, затем по кольцу - число корзин и
+# записи [номер периода int64][значения слотов float64...]
+BUCKET_COUNT = struct.Struct('<I')
+BUCKET_RINGS = ('minute', 'day')
+
+SEED = struct.Struct('<?q')
+_LENGTH = struct.Struct('<H')
+_NONE_LENGTH = 0xFFFF  # Длина строки, обозначающая None
+
+
+def _pack_text(value: Optional[str]) -> bytes:
+    """Строка с длиной uint16 (None кодируется длиной 0xFFFF)"""
+    if value is None:
+        return _LENGTH.pack(_NONE_LENGTH)
+    data = value.encode('utf-8')
+    if len(data) >= _NONE_LENGTH:
+        raise ValueError(f"Слишком длинная строка для сохранения: {len(data)} байт")
+    return _LENGTH.pack(len(data)) + data
+
+
+def _unpack_text(payload: bytes, offset: int) -> Tuple[Optional[str], int]:
+    """Прочитать строку _pack_text, вернуть (строка, новое смещение)"""
+    (length,) = _LENGTH.unpack_from(payload, offset)
+    offset += _LENGTH.size
+    if length == _NONE_LENGTH:
+        return None, offset
+    return payload[offset:offset + length].decode('utf-8'), offset + length
+
+
+def _pack_seed(seed: Optional[int]) -> bytes:
+    return SEED.pack(seed is not None, seed or 0)
+
+
+def _encode_stats(data: Dict[str, Any]) -> bytes:
+    return STAT.pack(*(data.get(field, 0) for field in STAT_FIELDS))
+
+
+def _encode_achievements(achievements: Dict[str, bool]) -> bytes:
+    parts = [_LENGTH.pack(len(achievements))]
+    for name, unlocked in achievements.items():
+        parts.append(_pack_text(name))
+        parts.append(b'\x01' if unlocked else b'\x00')
+    return b''.join(parts)
+
+
+def _encode_history(history: List[Dict[str, Any]]) -> bytes:
+    pack = HISTORY_RECORD.pack
+    return b''.join(pack(record['seed'] is not None, record['seed'] or 0, record['started'],
+                         record['minutes'], record['score'], record['decrypted'], record['files'],
+                         record.get('commands', 0))
+                    for record in history)
+
+
+def _encode_meta(data: Dict[str, Any]) -> bytes:
+    # С версии 3 seed последней сессии хранится в заголовке
+    return _pack_text(data.get('last_played')) + _pack_text(data.get('first_play_date'))
+
+
+def encode_world(world: Dict[str, Any]) -> bytes:
+    """
+    Упаковать изменения мира (seed и ключи расшифрованных директорий)
+
+    Args:
+        world: Словарь {'seed', 'decoded'}
+
+    Returns:
+        Данные секции WRLD
+    """
+    decoded = world.get('decoded', [])
+    return (_pack_seed(world.get('seed')) + BUCKET_COUNT.pack(len(decoded))
+            + b''.join(_pack_text(path) for path in decoded))
+
+
+def encode_buckets(buckets: Dict[str, Any]) -> bytes:
+    """
+    Упаковать корзины статистики (StatsStore.export_buckets)
+
+    Args:
+        buckets: Словарь {'slots', 'minute', 'day'}
+
+    Returns:
+        Данные секции BCKT
+    """
+    slots = buckets.get('slots', [])
+    record = struct.Struct('<q' + 'd' * len(slots))
+    parts = [bytes([len(slots)])]
+    parts.extend(_pack_text(name) for name in slots)
+    for ring in BUCKET_RINGS:
+        entries = buckets.get(ring, [])
+        parts.append(BUCKET_COUNT.pack(len(entries)))
+        parts.extend(record.pack(stamp, *values) for stamp, values in entries)
+    return b''.join(parts)
+
+
+def decode_buckets(payload: bytes) -> Dict[str, Any]:
+    """
+    Распаковать корзины статистики
+
+    Args:
+        payload: Данные секции BCKT
+
+    Returns:
+        Словарь {'slots', 'minute', 'day'}
+    """
+    offset = 1
+    slots = []
+    for _ in range(payload[0]):
+        name, offset = _unpack_text(payload, offset)
+        slots.append(name)
+
+    record = struct.Struct('<q' + 'd' * len(slots))
+    buckets: Dict[str, Any] = {'slots': slots}
+    for ring in BUCKET_RINGS:
+        (count,) = BUCKET_COUNT.unpack_from(payload, offset)
+        offset += BUCKET_COUNT.size
+        end = offset + count * record.size
+        buckets[ring] = [[values[0], list(values[1:])] for values in record.iter_unpack(payload[offset:end])]
+        offset = end
+    return buckets
+
+
+def encode_save(data: Dict[str, Any]) -> bytes:
+    """
+    Упаковать данные сохранения в двоичный формат
+
+    Args:
+        data: Словарь снимка (как в GameState._snapshot_data)
+
+    Returns:
+        Содержимое файла сохранения
+    """
+    sections = [
+        (b'STAT', _encode_stats(data)),
+        (b'ACHV', _encode_achievements(data.get('achievements', {}))),
+        (b'HIST', _encode_history(data.get('session_history', []))),
+        (b'META', _encode_meta(data)),
+    ]
+    if data.get('stats_buckets'):
+        sections.append((b'BCKT', encode_buckets(data['stats_buckets'])))
+    if data.get('world_deltas'):
+        sections.append((b'WRLD', encode_world(data['world_deltas'])))
+    body = b''.join(SECTION.pack(tag, len(payload), zlib.crc32(payload)) + payload
+                    for tag, payload in sections)
+
+    seed = data.get('last_session_seed')
+    fields = [MAGIC, FORMAT_VERSION, len(sections), 0, data.get('total_score', 0),
+              data.get('sessions_played', 0), data.get('journal_seq', 0), seed is not None, seed or 0]
+    # Контрольная сумма заголовка считается с нулем на ее месте
+    fields[3] = zlib.crc32(HEADER.pack(*fields))
+    return HEADER.pack(*fields) + body
+
+
+def _parse_header(blob: bytes) -> Dict[str, Any]:
+    """Разобрать заголовок и проверить сигнатуру, версию и контрольную сумму"""
+    if len(blob) < PREFIX.size:
+        raise ValueError("Файл сохранения обрезан: нет заголовка")
+
+    magic, version = PREFIX.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Не файл сохранения THE-VOIDER-DOS (неверная сигнатура)")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Версия формата сохранения {version} новее поддерживаемой ({FORMAT_VERSION})")
+
+    header_struct = HEADER if version >= 3 else HEADER_V2
+    if len(blob) < header_struct.size:
+        raise ValueError("Файл сохранения обрезан: нет заголовка")
+
+    fields = list(header_struct.unpack_from(blob))
+    if version >= 3:
+        crc, fields[3] = fields[3], 0
+        if zlib.crc32(HEADER.pack(*fields)) != crc:
+            raise ValueError("Файл сохранения поврежден: не совпадает контрольная сумма заголовка")
+        has_seed, seed = fields[7], fields[8]
+    else:
+        crc, has_seed, seed = fields[3], False, 0
+
+    return {
+        'format_version': version,
+        'header_size': header_struct.size,
+        'sections': fields[2],
+        'crc32': crc,
+        'total_score': fields[4],
+        'sessions_played': fields[5],
+        'journal_seq': fields[6],
+        'last_session_seed': seed if has_seed else None,
+    }
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    """
+    Прочитать только заголовок файла сохранения (без разбора секций)
+
+    Значения соответствуют последнему снимку: события журнала,
+    дописанные после него, здесь не учтены.
+
+    Args:
+        path: Путь к файлу сохранения
+
+    Returns:
+        Словарь с версией формата, total_score, sessions_played, journal_seq
+        и last_session_seed
+    """
+    with open(path, 'rb') as f:
+        return _parse_header(f.read(HEADER.size))
+
+
+def iter_sections(blob: bytes, header: Dict[str, Any]) -> Iterator[Tuple[bytes, bytes]]:
+    """
+    Перебрать секции после заголовка, проверяя контрольные суммы
+
+    Args:
+        blob: Содержимое файла
+        header: Результат разбора заголовка
+
+    Returns:
+        Итератор пар (тег, данные)
+    """
+    version = header['format_version']
+    section_struct = SECTION if version >= 3 else SECTION_V2
+    if version < 3 and zlib.crc32(blob[header['header_size']:]) != header['crc32']:
+        raise ValueError("Файл сохранения поврежден: не совпадает контрольная сумма")
+
+    offset = header['header_size']
+    view = memoryview(blob)
+    for _ in range(header['sections']):
+        if offset + section_struct.size > len(blob):
+            raise ValueError("Файл сохранения обрезан: нет заголовка секции")
+        tag, length, *crc = section_struct.unpack_from(blob, offset)
+        offset += section_struct.size
+        if offset + length > len(blob):
+            raise ValueError(f"Файл сохранения обрезан в секции {tag.decode('ascii', 'replace')}")
+        payload = bytes(view[offset:offset + length])
+        if crc and zlib.crc32(payload) != crc[0]:
+            raise ValueError(f"Секция {tag.decode('ascii', 'replace')} повреждена: не совпадает контрольная сумма")
+        yield tag, payload
+        offset += length
+
+
+def _decode_achievements(payload: bytes) -> Dict[str, bool]:
+    (count,) = _LENGTH.unpack_from(payload)
+    offset = _LENGTH.size
+    achievements = {}
+    for _ in range(count):
+        name, offset = _unpack_text(payload, offset)
+        achievements[name] = payload[offset] == 1
+        offset += 1
+    return achievements
+
+
+def _decode_history(payload: bytes, version: int) -> List[Dict[str, Any]]:
+    if version == 1:
+        return [{'seed': seed if has_seed else None, 'started': started, 'minutes': minutes,
+                 'score': score, 'decrypted': decrypted, 'files': files, 'commands': 0}
+                for has_seed, seed, started, minutes, score, decrypted, files
+                in HISTORY_RECORD_V1.iter_unpack(payload)]
+    return [{'seed': seed if has_seed else None, 'started': started, 'minutes': minutes,
+             'score': score, 'decrypted': decrypted, 'files': files, 'commands': commands}
+            for has_seed, seed, started, minutes, score, decrypted, files, commands
+            in HISTORY_RECORD.iter_unpack(payload)]
+
+
+def _decode_meta(payload: bytes, version: int) -> Dict[str, Any]:
+    last_played, offset = _unpack_text(payload, 0)
+    first_play_date, offset = _unpack_text(payload, offset)
+    meta = {'last_played': last_played, 'first_play_date': first_play_date}
+    if version < 3:
+        has_seed, seed = SEED.unpack_from(payload, offset)
+        meta['last_session_seed'] = seed if has_seed else None
+    return meta
+
+
+def decode_world(payload: bytes) -> Dict[str, Any]:
+    """
+    Распаковать изменения мира
+
+    Args:
+        payload: Данные секции WRLD
+
+    Returns:
+        Словарь {'seed', 'decoded'}
+    """
+    has_seed, seed = SEED.unpack_from(payload)
+    offset = SEED.size
+    (count,) = BUCKET_COUNT.unpack_from(payload, offset)
+    offset += BUCKET_COUNT.size
+    decoded = []
+    for _ in range(count):
+        path, offset = _unpack_text(payload, offset)
+        decoded.append(path)
+    return {'seed': seed if has_seed else None, 'decoded': decoded}
+
+
+def decode_section(tag: bytes, payload: bytes, version: int = FORMAT_VERSION) -> Dict[str, Any]:
+    """
+    Распаковать одну секцию
+
+    Args:
+        tag: Тег секции
+        payload: Данные секции
+        version: Версия формата файла
+
+    Returns:
+        Часть словаря снимка (пустой словарь для неизвестных секций)
+    """
+    if tag == b'STAT':
+        return dict(zip(STAT_FIELDS, STAT.unpack(payload)))
+    if tag == b'ACHV':
+        return {'achievements': _decode_achievements(payload)}
+    if tag == b'HIST':
+        return {'session_history': _decode_history(payload, version)}
+    if tag == b'META':
+        return _decode_meta(payload, version)
+    if tag == b'BCKT':
+        return {'stats_buckets': decode_buckets(payload)}
+    if tag == b'WRLD':
+        return {'world_deltas': decode_world(payload)}
+    # Секции новых версий пропускаются
+    return {}
+
+
+def _header_data(header: Dict[str, Any]) -> Dict[str, Any]:
+    """Поля снимка, хранящиеся в заголовке"""
+    return {
+        'total_score': header['total_score'],
+        'sessions_played': header['sessions_played'],
+        'journal_seq': header['journal_seq'],
+        'last_session_seed': header['last_session_seed'],
+        'format_version': header['format_version'],
+    }
+
+
+def decode_save(blob: bytes) -> Dict[str, Any]:
+    """
+    Распаковать файл сохранения целиком
+
+    Args:
+        blob: Содержимое файла
+
+    Returns:
+        Словарь снимка (те же ключи, что принимает encode_save)
+    """
+    header = _parse_header(blob)
+    data = _header_data(header)
+
+    for tag, payload in iter_sections(blob, header):
+        data.update(decode_section(tag, payload, header['format_version']))
+
+    return data
+
+
+class SaveReader:
+    """
+    Чтение файла сохранения по секциям
+
+    При открытии читаются только заголовок и таблица секций (заголовки
+    секций, без данных). Файл остается открытым, пока не прочитаны все
+    нужные секции: снимок заменяется через os.replace, поэтому открытый
+    файл всегда соответствует прочитанному заголовку.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Путь к файлу сохранения
+        """
+        self._file: Optional[BinaryIO] = open(path, 'rb')
+        self._payloads: Dict[str, bytes] = {}        # Секции старых версий (читаются целиком)
+        self._offsets: Dict[str, Tuple[int, int, int]] = {}  # Тег -> (смещение, длина, crc32)
+        try:
+            head = self._file.read(HEADER.size)
+            self.header = _parse_header(head)
+            self.version = self.header['format_version']
+
+            if self.version < 3:
+                # Общая контрольная сумма: файл старой версии проверяется целиком
+                blob = head + self._file.read()
+                for tag, payload in iter_sections(blob, self.header):
+                    self._payloads[tag.decode('ascii', 'replace')] = payload
+                self.close()
+            else:
+                self._scan_sections()
+        except BaseException:
+            self.close()
+            raise
+
+    def _scan_sections(self) -> None:
+        """Построить таблицу секций, перескакивая через их данные"""
+        size = os.fstat(self._file.fileno()).st_size
+        offset = self.header['header_size']
+        for _ in range(self.header['sections']):
+            self._file.seek(offset)
+            raw = self._file.read(SECTION.size)
+            if len(raw) < SECTION.size:
+                raise ValueError("Файл сохранения обрезан: нет заголовка секции")
+            tag, length, crc = SECTION.unpack(raw)
+            offset += SECTION.size
+            if offset + length > size:
+                raise ValueError(f"Файл сохранения обрезан в секции {tag.decode('ascii', 'replace')}")
+            self._offsets[tag.decode('ascii', 'replace')] = (offset, length, crc)
+            offset += length
+
+    @property
+    def tags(self) -> Set[str]:
+        """Теги секций файла"""
+        return set(self._payloads) | set(self._offsets)
+
+    def read(self, tag: str) -> Dict[str, Any]:
+        """
+        Прочитать и распаковать одну секцию
+
+        Args:
+            tag: Тег секции ('STAT', 'HIST' ...)
+
+        Returns:
+            Часть словаря снимка (пустой словарь, если секции нет)
+        """
+        if tag in self._payloads:
+            payload = self._payloads[tag]
+        elif tag in self._offsets:
+            if self._file is None:
+                raise ValueError("Файл сохранения уже закрыт")
+            offset, length, crc = self._offsets[tag]
+            self._file.seek(offset)
+            payload = self._file.read(length)
+            if zlib.crc32(payload) != crc:
+                raise ValueError(f"Секция {tag} повреждена: не совпадает контрольная сумма")
+        else:
+            return {}
+        return decode_section(tag.encode('ascii'), payload, self.version)
+
+    def read_all(self) -> Dict[str, Any]:
+        """
+        Прочитать все секции
+
+        Returns:
+            Словарь снимка, как у decode_save
+        """
+        data = _header_data(self.header)
+        for tag in sorted(self.tags):
+            data.update(self.read(tag))
+        return data
+
+    def close(self) -> None:
+        """Закрыть файл"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def export_json(data: Dict[str, Any]) -> str:
+    """
+    Представить данные сохранения в виде JSON (для экспорта и отладки)
+
+    Args:
+        data: Словарь снимка
+
+    Returns:
+        JSON с отступами
+    """
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def import_json(text: str) -> Dict[str, Any]:
+    """
+    Прочитать данные сохранения из JSON (экспорт или сохранение старых версий)
+
+    Args:
+        text: Содержимое JSON-файла
+
+    Returns:
+        Словарь снимка
+    """
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("JSON сохранения должен быть объектом")
+    return data
+
+
+# Тестирование модуля (если файл запущен напрямую)
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    print("Тестирование двоичного формата сохранения...")
+
+    sample = {
+        'total_score': 1234, 'score': 1234, 'sessions_played': 3, 'play_time': 12.5,
+        'directories_decrypted': 7, 'files_opened': 21, 'easter_eggs_found': 1,
+        'special_dirs_found': 2, 'journal_seq': 99,
+        'achievements': {'first_decryption': True, 'void_explorer': True, 'master_decryptor': False},
+        'session_history': [
+            {'seed': 42, 'started': 1700000000.0, 'minutes': 4.5, 'score': 300, 'decrypted': 2, 'files': 5,
+             'commands': 40},
+            {'seed': None, 'started': 1700001000.0, 'minutes': 1.0, 'score': 0, 'decrypted': 0, 'files': 1,
+             'commands': 3},
+        ],
+        'last_played': '2024-01-01T12:00:00', 'first_play_date': None, 'last_session_seed': 42,
+        'stats_buckets': {'slots': ['total_score', 'files_opened'],
+                          'minute': [[28333333, [50.0, 1.0]]], 'day': [[19675, [300.0, 5.0]]]},
+        'world_deltas': {'seed': 42, 'decoded': ['2', '4/1/0']},
+    }
+
+    blob = encode_save(sample)
+    decoded = decode_save(blob)
+    decoded.pop('format_version')
+    print(f"  {'✓' if decoded == sample else '✗'} Данные совпадают после упаковки ({len(blob)} байт)")
+
+    path = os.path.join(tempfile.mkdtemp(), 'save.dat')
+    with open(path, 'wb') as f:
+        f.write(blob)
+    header = read_header(path)
+    print(f"  {'✓' if header['total_score'] == 1234 else '✗'} Заголовок: счет {header['total_score']}, "
+          f"версия {header['format_version']}")
+
+    reader = SaveReader(path)
+    history = reader.read('HIST')['session_history']
+    reader.close()
+    print(f"  {'✓' if history == sample['session_history'] else '✗'} Секция HIST прочитана отдельно "
+          f"(секции: {', '.join(sorted(reader.tags))})")
+
+    print(f"  {'✓' if import_json(export_json(sample)) == sample else '✗'} JSON экспорт/импорт")
+
+    broken_header = blob[:20] + b'\x00' + blob[21:]
+    for name, broken in (('обрезан', blob[:-3]), ('изменен', blob[:-1] + b'\xff'),
+                         ('заголовок изменен', broken_header), ('чужой файл', b'{"a": 1}' * 8)):
+        try:
+            decode_save(broken)
+            print(f"  ✗ Файл {name}: ошибка не обнаружена")
+        except ValueError as e:
+            print(f"  ✓ Файл {name}: {e}")
+
+    print("\nТестирование завершено!")
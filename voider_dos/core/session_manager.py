@@ -1,34 +1,69 @@
 """
-Класс GameSession: управление игровой сессией, основной игровой цикл
+Класс GameSession: терминальный интерфейс игровой сессии
+
+Игровая логика - в GameEngine (voider_dos.core.engine): сессия читает ввод,
+передает команды в engine.step и оформляет структурированный Result цветами
+colorama. Сама сессия выполняет только команды терминала (группа 'ui':
+clear, debug, history) и пакетный режим run_script.
 """
 
+import io
+import json
+import re
 import time
-import random
 import sys
 import os
+from contextlib import redirect_stdout
+from dataclasses import asdict
+from bisect import bisect_left, bisect_right
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List, TextIO, Tuple
 from colorama import init, Fore, Style
 
 # Добавляем путь для импорта config.py из корня проекта
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from config import UI, COLORS, VERSION_STRING
-from .vfs_generator import VirtualFileSystem
-from .game_state import GameState
+from config import UI, LOGGING
+from .game_states import GameState
+from .engine import GameEngine
+from .command_history import CommandHistory
+from .results import (
+    Analysis, Decryption, FileView, Listing, Message, QuickSlots, Result, Scores, SessionStats, error,
+    is_error, output_type
+)
+from voider_dos.commands.decryption import format_analysis
+from voider_dos.utils.log import get_logger, set_console_level
+
+logger = get_logger('session')
+
+# Цветовые коды colorama (ESC [ ... m) - вырезаются из вывода пакетного режима
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*m')
+
+# Оформление Message по уровню: (цвет, префикс)
+MESSAGE_STYLES = {
+    'info': (Fore.CYAN, ''),
+    'success': (Fore.GREEN, ''),
+    'notice': (Fore.YELLOW, ''),
+    'warning': (Fore.YELLOW, '⚠ '),
+    'error': (Fore.RED, '✗ '),
+}
 
-# Импортируем обработчик команд (создадим его следующим)
-try:
-    from ..commands.handler import CommandHandler
-    HAS_COMMAND_HANDLER = True
-except ImportError:
-    HAS_COMMAND_HANDLER = False
-    print(f"{Fore.YELLOW}[WARNING] CommandHandler не найден. Используется заглушка.{Style.RESET_ALL}")
+
+def strip_ansi(value: Any) -> Any:
+    """Убрать цветовые коды из строки, списка строк или значений словаря"""
+    if isinstance(value, str):
+        return ANSI_ESCAPE.sub('', value)
+    if isinstance(value, list):
+        return [strip_ansi(item) for item in value]
+    if isinstance(value, dict):
+        return {key: strip_ansi(item) for key, item in value.items()}
+    return value
 
 
 class GameSession:
-    """Класс для управления игровой сессией и основным игровым циклом"""
+    """Терминальный интерфейс игровой сессии: ввод, автодополнение и вывод результатов GameEngine"""
     
-    def __init__(self, game_state: GameState, new_game: bool = True, seed: Optional[int] = None):
+    def __init__(self, game_state: GameState, new_game: bool = True, seed: Optional[int] = None,
+                 interactive: bool = True):
         """
         Инициализация игровой сессии
         
@@ -36,39 +71,36 @@ class GameSession:
             game_state: Состояние игры
             new_game: Начинать ли новую игру
             seed: Seed для генерации VFS (если None - случайный)
+            interactive: False - пакетный режим (run_script): без очистки экрана и пауз
         """
         # Инициализация цветов
         init(autoreset=True)
         
         self.game_state = game_state
-        self.new_game = new_game
-        self.seed = seed
+        self.interactive = interactive
         
-        # Инициализация VFS
+        # Игровая логика: VFS, команды, очки, быстрые сохранения, автосохранение
         print(f"{Fore.CYAN}Инициализация виртуальной файловой системы...{Style.RESET_ALL}")
-        self.vfs = VirtualFileSystem(seed=self.seed)
+        self.engine = GameEngine(game_state, new_game=new_game, seed=seed)
+        self._register_ui_commands()
         
-        # Инициализация обработчика команд
-        if HAS_COMMAND_HANDLER:
-            self.command_handler = CommandHandler(self.vfs, self.game_state)
-        else:
-            # Заглушка для тестирования
-            self.command_handler = self._create_stub_handler()
+        # Автодополнение: имена команд не меняются за сессию, имена директории
+        # индексируются заново только при смене директории или ее версии
+        self._command_names = sorted(name for command in self.engine.registry.commands
+                                     for name in (command.name,) + command.aliases)
+        self._name_index_key: Optional[Tuple[Any, int, bool]] = None
+        self._name_index: Tuple[List[str], List[str]] = ([], [])
+        self._completion_key: Optional[Tuple[str, Any]] = None
+        self._completions: List[str] = []
         
-        # Статистика сессии
-        self.session_start_time = time.time()
-        self.commands_executed = 0
-        self.last_command_time = None
-        self.command_history = []
+        # Постоянная история: хвост файла в памяти, старые записи - при поиске
+        self.command_history = CommandHistory()
         
         # Состояние сессии
         self.is_running = True
-        self.show_hidden = False
         self.debug_mode = False
         
-        # Начинаем новую сессию в состоянии игры
         if new_game:
-            self.game_state.start_new_session(seed=self.vfs.seed)
             print(f"{Fore.GREEN}Новая игровая сессия начата!{Style.RESET_ALL}")
         else:
             print(f"{Fore.GREEN}Игровая сессия загружена.{Style.RESET_ALL}")
@@ -76,46 +108,57 @@ class GameSession:
         print(f"{Fore.YELLOW}Seed системы: {self.vfs.seed}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}Введите 'help' для списка команд, 'exit' для выхода в меню.{Style.RESET_ALL}")
     
-    def _create_stub_handler(self):
-        """Создать заглушку для обработчика команд"""
-        class StubCommandHandler:
-            def __init__(self, vfs, game_state):
-                self.vfs = vfs
-                self.game_state = game_state
-            
-            def execute(self, command):
-                return f"CommandHandler не загружен. Команда: {command}"
-        
-        return StubCommandHandler(self.vfs, self.game_state)
+    @property
+    def vfs(self):
+        """Текущая VFS движка (seed set заменяет ее)"""
+        return self.engine.vfs
+    
+    @property
+    def command_handler(self):
+        """Обработчик команд движка"""
+        return self.engine.command_handler
+    
+    @property
+    def commands_executed(self) -> int:
+        """Выполнено игровых команд за сессию"""
+        return self.engine.commands_executed
+    
+    @property
+    def session_start_time(self) -> float:
+        """Время начала сессии"""
+        return self.engine.session_start_time
+    
+    def _register_ui_commands(self) -> None:
+        """Команды терминала: выполняются сессией и не доходят до движка"""
+        register = self.engine.registry.register
+        register('clear', lambda _: self._clear_and_welcome(), aliases=('cls',), group='ui',
+                 help='Очистить экран')
+        register('debug', lambda _: self._toggle_debug(), group='ui', help='Режим отладки')
+        register('history', lambda _, text: self._show_command_history(text), args='[текст...]',
+                 group='ui', help='История команд (с текстом - поиск по всей истории)')
     
     def run(self) -> None:
         """Основной игровой цикл"""
         self._clear_screen()
         self._print_welcome_message()
+        self._setup_readline(self._tab_completer, self.command_history.recent)
         
         try:
             while self.is_running:
                 # Отображаем приглашение и получаем ввод
                 user_input = self._get_user_input()
+                self.command_history.append(user_input)
                 
-                # Обрабатываем специальные команды
+                # Обрабатываем команды терминала
                 if self._handle_special_commands(user_input):
                     continue
                 
-                # Выполняем команду через обработчик
-                result = self.command_handler.execute(user_input)
-                
-                # Обрабатываем результат
-                self._handle_command_result(user_input, result)
+                # Выполняем команду в движке и выводим результат
+                result = self.engine.step(user_input)
+                self._render(result)
                 
-                # Обновляем статистику
-                self.commands_executed += 1
-                self.last_command_time = time.time()
-                self.command_history.append(user_input)
-                
-                # Ограничиваем размер истории
-                if len(self.command_history) > UI['max_history_size']:
-                    self.command_history.pop(0)
+                if not result.running:
+                    self.is_running = False
                 
         except KeyboardInterrupt:
             self._handle_keyboard_interrupt()
@@ -124,9 +167,99 @@ class GameSession:
         finally:
             self._cleanup()
     
+    def run_script(self, lines: Iterable[str], out: TextIO) -> int:
+        """
+        Пакетный режим: выполнить команды подряд, без приглашений, очистки
+        экрана и пауз
+        
+        На каждую команду в out пишется строка JSON: номер строки скрипта,
+        команда, ok, тип и поля результата (Result.output), открытые
+        достижения, счет и текущий путь. Напечатанное командами терминала
+        (без цветовых кодов) приходит как Listing. Последняя строка -
+        итоги сессии: commands - все выполненные строки скрипта,
+        game_commands - команды, дошедшие до движка (без команд сессии и
+        терминала, как в stats). Строки скрипта попадают в историю команд,
+        как введенные вручную. Пустые строки и строки с '#' пропускаются,
+        'exit' завершает скрипт.
+        
+        Args:
+            lines: Строки скрипта (файл или sys.stdin)
+            out: Куда писать результаты
+            
+        Returns:
+            Количество команд, завершившихся ошибкой
+        """
+        errors = 0
+        executed = 0
+        try:
+            for number, line in enumerate(lines, 1):
+                command = line.strip()
+                if not command or command.startswith('#'):
+                    continue
+                
+                self.command_history.append(command)
+                record = self._run_script_command(command)
+                executed += 1
+                record['line'] = number
+                errors += not record['ok']
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                
+                if not self.is_running:
+                    break
+        finally:
+            self._cleanup()
+            summary = {
+                'type': 'summary',
+                'seed': self.vfs.seed,
+                'commands': executed,
+                'game_commands': self.commands_executed,
+                'errors': errors,
+                'session_score': self.game_state.session_score,
+                'total_score': self.game_state.total_score,
+            }
+            out.write(json.dumps(summary, ensure_ascii=False) + '\n')
+            out.flush()
+        return errors
+    
+    def _run_script_command(self, command: str) -> Dict[str, Any]:
+        """Выполнить одну команду пакетного режима и собрать ее результат"""
+        printed = io.StringIO()
+        try:
+            # Команды терминала печатают сами: их вывод попадает в результат
+            with redirect_stdout(printed):
+                handled = self._handle_special_commands(command)
+            output = None
+        except Exception as e:
+            logger.debug("Ошибка команды '%s'", command, exc_info=True)
+            handled = True
+            output = error(f"Ошибка: {e}")
+        
+        if handled:
+            # Напечатанное (без цветовых кодов) - в тех же классах вывода, что и у движка
+            lines = strip_ansi(printed.getvalue()).splitlines()
+            if output is None and lines:
+                output = Listing(lines)
+            result = Result(command, output, not is_error(output), self.game_state.score,
+                            self.vfs.get_current_path_str())
+        else:
+            result = self.engine.step(command)
+            if not result.running:
+                self.is_running = False
+        
+        return {
+            'command': command,
+            'ok': result.ok,
+            'type': output_type(result.output),
+            'result': asdict(result.output) if result.output is not None else None,
+            'achievements': [asdict(achievement) for achievement in result.achievements],
+            'score': result.score,
+            'path': result.path,
+        }
+    
     def _clear_screen(self) -> None:
         """Очистить экран"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if self.interactive:
+            os.system('cls' if os.name == 'nt' else 'clear')
     
     def _print_welcome_message(self) -> None:
         """Вывести приветственное сообщение"""
@@ -141,14 +274,7 @@ class GameSession:
             # Подготовка приглашения
             prompt = self._build_prompt()
             
-            # Получение ввода с поддержкой истории и автодополнения
-            if sys.platform != 'win32' and HAS_COMMAND_HANDLER:
-                # Для Linux/Mac используем readline для улучшения ввода
-                import readline
-                readline.set_completer(self._tab_completer)
-                readline.parse_and_bind('tab: complete')
-            
-            # Отображение приглашения и получение ввода
+            # Отображение приглашения и получение ввода (readline настроен в run)
             user_input = input(prompt).strip()
             
             return user_input
@@ -185,208 +311,242 @@ class GameSession:
         
         return prompt
     
+    @staticmethod
+    def _setup_readline(completer, history=()) -> None:
+        """
+        Настроить readline один раз на сессию: автодополнение и история для
+        стрелок и Ctrl-R (completer=None снимает настройку)
+        """
+        if sys.platform == 'win32':
+            return
+        try:
+            import readline
+        except ImportError:
+            return
+        readline.set_completer(completer)
+        readline.parse_and_bind('tab: complete')
+        # Введенные строки readline добавляет сам, загружаем только прошлые сессии
+        readline.clear_history()
+        for command in history:
+            readline.add_history(command)
+    
+    def _directory_index(self) -> Tuple[List[str], List[str]]:
+        """
+        Имена текущей директории для автодополнения
+        
+        Returns:
+            (имена в casefold по возрастанию, исходные имена в том же порядке);
+            строится заново только при смене директории или версии VFS
+        """
+        current_dir = self.vfs.current_dir
+        show_hidden = self.command_handler.show_hidden
+        cached = self._name_index_key
+        # Директорию сравниваем по идентичности: == у dataclass обходит поддеревья
+        if (cached is None or cached[0] is not current_dir or cached[1] != self.vfs.version
+                or cached[2] != show_hidden):
+            names = []
+            for item in current_dir.children:
+                if item.is_hidden and not show_hidden:
+                    continue
+                name = item.display_name if isinstance(item, DirNode) else item.get_full_name()
+                names.append((name.casefold(), name))
+            names.sort()
+            self._name_index = ([folded for folded, _ in names], [name for _, name in names])
+            self._name_index_key = (current_dir, self.vfs.version, show_hidden)
+        return self._name_index
+    
+    @staticmethod
+    def _prefix_range(folded: List[str], prefix: str) -> slice:
+        """Диапазон отсортированного списка, элементы которого начинаются с prefix"""
+        return slice(bisect_left(folded, prefix), bisect_right(folded, prefix + '\U0010ffff'))
+    
     def _tab_completer(self, text: str, state: int) -> Optional[str]:
-        """Функция автодополнения по Tab"""
-        # Получаем список возможных дополнений
-        completions = []
-        
-        # Проверяем, начинается ли текст с команд
-        possible_commands = ['dir', 'cd', 'decode', 'help', 'score', 'clear', 'cls', 'exit']
-        for cmd in possible_commands:
-            if cmd.startswith(text.lower()):
-                completions.append(cmd)
-        
-        # Ищем файлы и директории в текущей директории
-        for item in self.vfs.current_dir.children:
-            if isinstance(item, DirNode):
-                if item.name.lower().startswith(text.lower()):
-                    completions.append(item.name)
-            else:
-                full_name = item.get_full_name()
-                if full_name.lower().startswith(text.lower()):
-                    completions.append(full_name)
+        """
+        Функция автодополнения по Tab
+        
+        readline вызывает ее с state = 0, 1, 2... до первого None; список
+        вариантов строится один раз на (text, индекс директории).
+        """
+        index = self._directory_index()
+        if self._completion_key is None or self._completion_key[0] != text or self._completion_key[1] is not index:
+            prefix = text.casefold()
+            folded, names = index
+            # Команды уже в нижнем регистре
+            self._completions = (self._command_names[self._prefix_range(self._command_names, prefix)]
+                                 + names[self._prefix_range(folded, prefix)])
+            self._completion_key = (text, index)
         
         # Возвращаем соответствующее дополнение
-        if state < len(completions):
-            return completions[state]
+        if state < len(self._completions):
+            return self._completions[state]
         
         return None
     
     def _handle_special_commands(self, user_input: str) -> bool:
         """
-        Обработка специальных команд, которые не проходят через CommandHandler
+        Обработка команд терминала (группа 'ui' реестра команд): они
+        меняют только экран и историю ввода, поэтому движок их не видит
         
         Returns:
-            True если команда обработана, False если нужно передать в CommandHandler
+            True если команда обработана, False если нужно передать в GameEngine
         """
-        input_lower = user_input.lower()
+        try:
+            command, args = self.command_handler.parse(user_input)
+        except ValueError:
+            # Ошибку разбора вернет GameEngine.step
+            return False
         
-        if input_lower == 'exit' or input_lower == 'quit':
-            self.is_running = False
-            print(f"{Fore.YELLOW}Выход в главное меню...{Style.RESET_ALL}")
-            return True
+        if command.group != 'ui':
+            return False
         
-        elif input_lower == 'clear' or input_lower == 'cls':
+        command.func(self.command_handler, *args)
+        return True
+    
+    def _clear_and_welcome(self) -> None:
+        """Очистить экран и повторить приветствие"""
+        if self.interactive:
             self._clear_screen()
             self._print_welcome_message()
-            return True
-        
-        elif input_lower == 'debug':
-            self.debug_mode = not self.debug_mode
-            status = "включен" if self.debug_mode else "выключен"
-            print(f"{Fore.MAGENTA}Режим отладки {status}.{Style.RESET_ALL}")
-            return True
-        
-        elif input_lower == 'history':
-            self._show_command_history()
-            return True
-        
-        elif input_lower == 'stats':
-            self._show_session_stats()
-            return True
-        
-        elif input_lower == 'version':
-            print(f"{Fore.CYAN}{VERSION_STRING}{Style.RESET_ALL}")
-            return True
-        
-        elif input_lower.startswith('seed'):
-            parts = input_lower.split()
-            if len(parts) > 1 and parts[1] == 'set':
-                try:
-                    new_seed = int(parts[2])
-                    self.vfs = VirtualFileSystem(seed=new_seed)
-                    print(f"{Fore.GREEN}Seed изменен на {new_seed}. ФС перегенерирована.{Style.RESET_ALL}")
-                except (IndexError, ValueError):
-                    print(f"{Fore.RED}Использование: seed set <число>{Style.RESET_ALL}")
-            else:
-                print(f"{Fore.CYAN}Текущий seed: {self.vfs.seed}{Style.RESET_ALL}")
-            return True
-        
-        return False
-    
-    def _handle_command_result(self, user_input: str, result: Any) -> None:
-        """Обработка результата выполнения команды"""
-        if result is None:
+    
+    def _toggle_debug(self) -> None:
+        """Переключить режим отладки"""
+        self.debug_mode = not self.debug_mode
+        # В режиме отладки диагностика всех подсистем выводится в консоль
+        set_console_level('DEBUG' if self.debug_mode else LOGGING['level'])
+        status = "включен" if self.debug_mode else "выключен"
+        print(f"{Fore.MAGENTA}Режим отладки {status}.{Style.RESET_ALL}")
+    
+    def _render(self, result: Result) -> None:
+        """Вывести результат команды движка"""
+        output = result.output
+        if output is None and not result.achievements:
             return
         
-        # Если результат - строка, просто выводим ее
-        if isinstance(result, str):
-            print(result)
+        if isinstance(output, Message):
+            color, prefix = MESSAGE_STYLES.get(output.level, (Fore.WHITE, ''))
+            print(f"{color}{prefix}{output.text}{Style.RESET_ALL}")
+        
+        # Строки вывода (dir, find, help, ciphers)
+        elif isinstance(output, Listing):
+            if output.title:
+                print(f"{Fore.CYAN}{output.title}{Style.RESET_ALL}")
+            for line in output.lines:
+                print(line)
+        
+        elif isinstance(output, FileView):
+            self._display_file_content(output)
+        
+        elif isinstance(output, Decryption):
+            self._display_decryption(output)
         
-        # Если результат - список (например, от команды dir)
-        elif isinstance(result, list):
-            for line in result:
+        elif isinstance(output, Analysis):
+            for line in format_analysis(output.data):
                 print(line)
         
-        # Если результат - словарь (специальная обработка)
-        elif isinstance(result, dict):
-            self._handle_dict_result(result)
+        elif isinstance(output, Scores):
+            print(f"{Fore.GREEN}Счет сессии: {output.session_score}{Style.RESET_ALL}")
+            print(f"{Fore.GREEN}Общий счет: {output.total_score}{Style.RESET_ALL}")
+        
+        elif isinstance(output, QuickSlots):
+            self._show_quick_slots(output)
+        
+        elif isinstance(output, SessionStats):
+            self._show_session_stats(output)
+        
+        for achievement in result.achievements:
+            print(f"[ДОСТИЖЕНИЕ] {achievement.name}: {achievement.description}!")
         
         # Добавляем пустую строку для разделения
         print()
         
         # Отладочная информация
         if self.debug_mode:
-            print(f"{Fore.LIGHTBLACK_EX}[DEBUG] Команда: '{user_input}'{Style.RESET_ALL}")
-    
-    def _handle_dict_result(self, result: Dict[str, Any]) -> None:
-        """Обработка результата в виде словаря"""
-        if 'type' in result:
-            if result['type'] == 'file_content':
-                self._display_file_content(result)
-            elif result['type'] == 'decryption_success':
-                self._handle_decryption_success(result)
-            elif result['type'] == 'error':
-                self._display_error(result)
-    
-    def _display_file_content(self, result: Dict[str, Any]) -> None:
+            print(f"{Fore.LIGHTBLACK_EX}[DEBUG] Команда: '{result.command}'{Style.RESET_ALL}")
+    
+    def _display_file_content(self, view: FileView) -> None:
         """Отобразить содержимое файла"""
-        filename = result.get('filename', 'Неизвестный файл')
-        content = result.get('content', '')
-        is_easter_egg = result.get('is_easter_egg', False)
-        
         # Заголовок файла
-        if is_easter_egg:
+        if view.is_easter_egg:
             print(f"{Fore.MAGENTA}╔{'═'*78}╗")
             print(f"║{'🎉 ПАСХАЛКА НАЙДЕНА! 🎉':^78}║")
             print(f"╚{'═'*78}╝{Style.RESET_ALL}")
             print()
         
-        print(f"{Fore.CYAN}Файл: {filename}{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}Файл: {view.filename}{Style.RESET_ALL}")
         print(f"{Fore.WHITE}{'='*80}{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}{content}{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}{view.content}{Style.RESET_ALL}")
         print(f"{Fore.WHITE}{'='*80}{Style.RESET_ALL}")
         
-        # Информация о начисленных очках
-        if 'points' in result:
-            points = result['points']
-            reason = result.get('reason', '')
-            print(f"{Fore.GREEN}+{points} очков {reason}{Style.RESET_ALL}")
+        # Информация о начисленных очках (только при первом открытии)
+        if view.points:
+            print(f"{Fore.GREEN}+{view.points} очков {view.reason}{Style.RESET_ALL}")
     
-    def _handle_decryption_success(self, result: Dict[str, Any]) -> None:
-        """Обработка успешной расшифровки"""
-        dir_name = result.get('dir_name', 'Неизвестная директория')
-        points = result.get('points', 0)
-        
+    def _display_decryption(self, decryption: Decryption) -> None:
+        """Отобразить успешную расшифровку (очки уже учел движок)"""
         # Анимация успеха
         print(f"{Fore.GREEN}╔{'═'*78}╗")
         print(f"║{'🎯 ДИРЕКТОРИЯ РАСШИФРОВАНА! 🎯':^78}║")
         print(f"╚{'═'*78}╝{Style.RESET_ALL}")
         print()
-        print(f"{Fore.CYAN}Доступ открыт к директории: {Fore.YELLOW}{dir_name}{Style.RESET_ALL}")
-        print(f"{Fore.GREEN}+{points} очков за расшифровку!{Style.RESET_ALL}")
-        
-        # Обновляем статистику в game_state
-        self.game_state.record_decryption(points)
+        print(f"{Fore.CYAN}Доступ открыт к директории: {Fore.YELLOW}{decryption.dir_name}{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}+{decryption.points} очков за расшифровку!{Style.RESET_ALL}")
     
-    def _display_error(self, result: Dict[str, Any]) -> None:
-        """Отобразить ошибку"""
-        message = result.get('message', 'Неизвестная ошибка')
-        error_type = result.get('error_type', 'error')
-        
-        if error_type == 'warning':
-            color = Fore.YELLOW
-            prefix = '⚠'
-        else:
-            color = Fore.RED
-            prefix = '✗'
+    def _show_quick_slots(self, quick_slots: QuickSlots) -> None:
+        """Показать быстрые сохранения сессии"""
+        if not quick_slots.slots:
+            print(f"{Fore.YELLOW}Быстрых сохранений нет. Используйте: qsave [слот]{Style.RESET_ALL}")
+            return
         
-        print(f"{color}{prefix} {message}{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}Быстрые сохранения:{Style.RESET_ALL}")
+        for slot in quick_slots.slots:
+            created = datetime.fromtimestamp(slot['created']).strftime('%H:%M:%S')
+            print(f"  {Fore.YELLOW}{slot['slot']:<8}{Style.RESET_ALL} {created}  "
+                  f"счет {slot['score']:<6} {slot['path']}")
     
-    def _show_command_history(self) -> None:
-        """Показать историю команд"""
-        print(f"{Fore.CYAN}История команд ({len(self.command_history)}):{Style.RESET_ALL}")
+    def _show_command_history(self, text: Optional[str] = None) -> None:
+        """Показать последние команды или найти команды по тексту во всей истории"""
+        if text:
+            commands = self.command_history.search(text)
+            print(f"{Fore.CYAN}Найдено в истории по '{text}' ({len(commands)}):{Style.RESET_ALL}")
+        else:
+            commands = self.command_history.last(10)  # Последние 10 команд
+            print(f"{Fore.CYAN}История команд ({len(self.command_history.recent)}):{Style.RESET_ALL}")
         print(f"{Fore.LIGHTBLACK_EX}{'-'*40}{Style.RESET_ALL}")
         
-        for i, cmd in enumerate(self.command_history[-10:], 1):  # Последние 10 команд
+        for i, cmd in enumerate(commands, 1):
             print(f"{Fore.LIGHTBLACK_EX}{i:3}. {cmd}{Style.RESET_ALL}")
         
-        if len(self.command_history) > 10:
-            print(f"{Fore.LIGHTBLACK_EX}... и еще {len(self.command_history) - 10} команд{Style.RESET_ALL}")
+        hidden = len(self.command_history.recent) - len(commands)
+        if not text and hidden > 0:
+            print(f"{Fore.LIGHTBLACK_EX}... и еще {hidden} команд (поиск: history <текст>){Style.RESET_ALL}")
     
-    def _show_session_stats(self) -> None:
+    def _show_session_stats(self, stats: SessionStats) -> None:
         """Показать статистику текущей сессии"""
-        current_time = time.time()
-        session_duration = current_time - self.session_start_time
-        minutes = int(session_duration // 60)
-        seconds = int(session_duration % 60)
-        
-        # Статистика VFS
-        vfs_stats = self.vfs.get_stats()
+        minutes = int(stats.duration // 60)
+        seconds = int(stats.duration % 60)
+        vfs_stats = stats.vfs
         
         print(f"{Fore.CYAN}Статистика текущей сессии:{Style.RESET_ALL}")
         print(f"{Fore.LIGHTBLACK_EX}{'-'*40}{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}Seed системы: {Fore.YELLOW}{vfs_stats['seed']}{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}Seed системы: {Fore.YELLOW}{stats.seed}{Style.RESET_ALL}")
         print(f"{Fore.WHITE}Длительность: {Fore.YELLOW}{minutes:02d}:{seconds:02d}{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}Выполнено команд: {Fore.YELLOW}{self.commands_executed}{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}Текущий путь: {Fore.YELLOW}{vfs_stats['current_path']}{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}Элементов в директории: {Fore.YELLOW}{vfs_stats['items_in_current_dir']}{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}Выполнено команд: {Fore.YELLOW}{stats.commands}{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}Текущий путь: {Fore.YELLOW}{stats.path}{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}Элементов в директории: {Fore.YELLOW}{stats.items_in_dir}{Style.RESET_ALL}")
         print()
         print(f"{Fore.WHITE}Статистика VFS:{Style.RESET_ALL}")
         print(f"{Fore.WHITE}  Всего директорий: {Fore.YELLOW}{vfs_stats['total_dirs']}{Style.RESET_ALL}")
         print(f"{Fore.WHITE}  Всего файлов: {Fore.YELLOW}{vfs_stats['total_files']}{Style.RESET_ALL}")
         print(f"{Fore.WHITE}  Зашифрованных директорий: {Fore.YELLOW}{vfs_stats['encrypted_dirs']}{Style.RESET_ALL}")
         print(f"{Fore.WHITE}  Пасхалок: {Fore.MAGENTA}{vfs_stats['easter_eggs']}{Style.RESET_ALL}")
+        
+        # Отладочная статистика кэшей шифрования
+        if self.debug_mode:
+            print()
+            print(f"{Fore.LIGHTBLACK_EX}[DEBUG] Кэши CipherSystem и разбора команд:{Style.RESET_ALL}")
+            for name, cache in stats.caches.items():
+                print(f"{Fore.LIGHTBLACK_EX}  {name}: попаданий {cache['hits']}, промахов {cache['misses']}, "
+                      f"записей {cache['size']}/{cache['maxsize']}{Style.RESET_ALL}")
     
     def _handle_keyboard_interrupt(self) -> None:
         """Обработка прерывания клавиатуры (Ctrl+C)"""
@@ -409,14 +569,19 @@ class GameSession:
     
     def _cleanup(self) -> None:
         """Очистка ресурсов при завершении сессии"""
+        if not self.interactive:
+            self.engine.close()
+            return
+        
         print(f"{Fore.CYAN}Завершение игровой сессии...{Style.RESET_ALL}")
         
-        # Завершаем сессию в game_state
-        self.game_state.end_session()
+        # Автодополнение и история сессии больше не нужны (главное меню читает ввод без них)
+        self._setup_readline(None)
+        self.command_history.compact()
         
-        # Сохраняем прогресс
+        # Завершаем сессию в движке и сохраняем прогресс
         print(f"{Fore.YELLOW}Сохранение прогресса...{Style.RESET_ALL}")
-        self.game_state.save()
+        self.engine.close(verbose=True)
         
         # Выводим итоги сессии
         self._print_session_summary()
@@ -481,13 +646,13 @@ if __name__ == "__main__":
         print(f"  {item}")
     
     # Тестируем обработку команды
-    test_commands = ["dir", "help", "version", "stats"]
+    test_commands = ["dir", "help", "version", "stats", "clear"]
     
     for cmd in test_commands:
         print(f"\n{Fore.CYAN}Тест команды: '{cmd}'{Style.RESET_ALL}")
-        result = session.command_handler.execute(cmd)
-        if result:
-            print(result)
+        if not session._handle_special_commands(cmd):
+            session._render(session.engine.step(cmd))
     
     # Завершаем сессию
+    session.engine.close()
     print(f"\n{Fore.GREEN}Тест завершен успешно!{Style.RESET_ALL}")
\ No newline at end of file
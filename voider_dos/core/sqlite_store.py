@@ -0,0 +1,329 @@
+"""
+Класс SQLiteStore: хранение профилей, истории сессий и таблиц рекордов в SQLite
+
+Необязательный backend сохранений (SAVES['backend'] = 'sqlite'): несколько
+игроков на одной машине ведут свои профили в общей базе, каждая сессия
+хранится отдельной строкой, а рекорды по seed и динамика игрока
+выбираются по индексам за миллисекунды даже на сотнях тысяч сессий.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import SAVES
+from voider_dos.core.save_format import encode_buckets, decode_buckets, encode_world, decode_world
+
+SCHEMA_VERSION = 3
+
+# Счетчики профиля (колонки таблицы profiles)
+PROFILE_STATS = ('total_score', 'score', 'sessions_played', 'play_time', 'directories_decrypted',
+                 'files_opened', 'easter_eggs_found', 'special_dirs_found')
+PROFILE_META = ('last_played', 'last_session_seed', 'first_play_date')
+
+SESSION_FIELDS = ('seed', 'started', 'minutes', 'score', 'decrypted', 'files', 'commands')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id                    INTEGER PRIMARY KEY,
+    name                  TEXT NOT NULL UNIQUE,
+    total_score           INTEGER NOT NULL DEFAULT 0,
+    score                 INTEGER NOT NULL DEFAULT 0,
+    sessions_played       INTEGER NOT NULL DEFAULT 0,
+    play_time             REAL NOT NULL DEFAULT 0,
+    directories_decrypted INTEGER NOT NULL DEFAULT 0,
+    files_opened          INTEGER NOT NULL DEFAULT 0,
+    easter_eggs_found     INTEGER NOT NULL DEFAULT 0,
+    special_dirs_found    INTEGER NOT NULL DEFAULT 0,
+    last_played           TEXT,
+    last_session_seed     INTEGER,
+    first_play_date       TEXT,
+    stats_buckets         BLOB,
+    world_deltas          BLOB
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id         INTEGER PRIMARY KEY,
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    seed       INTEGER,
+    started    REAL NOT NULL,
+    minutes    REAL NOT NULL,
+    score      INTEGER NOT NULL,
+    decrypted  INTEGER NOT NULL,
+    files      INTEGER NOT NULL,
+    commands   INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS achievements (
+    profile_id  INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    name        TEXT NOT NULL,
+    unlocked_at REAL NOT NULL,
+    PRIMARY KEY (profile_id, name)
+) WITHOUT ROWID;
+
+-- Рекорды по seed: диапазон индекса уже отсортирован по очкам
+CREATE INDEX IF NOT EXISTS sessions_seed_score ON sessions(seed, score DESC);
+-- Общая таблица рекордов сессий
+CREATE INDEX IF NOT EXISTS sessions_score ON sessions(score DESC);
+-- Динамика игрока: его сессии по времени
+CREATE INDEX IF NOT EXISTS sessions_profile_started ON sessions(profile_id, started);
+-- Рейтинг игроков по общему счету
+CREATE INDEX IF NOT EXISTS profiles_total_score ON profiles(total_score DESC);
+"""
+
+
+class SQLiteStore:
+    """Хранилище профилей и сессий в SQLite"""
+
+    def __init__(self, path: str, profile: str = 'default'):
+        """
+        Args:
+            path: Путь к файлу базы (':memory:' - база в памяти)
+            profile: Имя профиля игрока
+        """
+        self.path = path
+        self.profile = profile
+
+        # Соединение используется и из потока автосохранения: запросы
+        # сериализуются собственной блокировкой
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+
+        with self._lock:
+            if path != ':memory:':
+                # WAL: читатели не блокируют запись, fsync только на контрольных точках
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(f"PRAGMA synchronous={'FULL' if SAVES['fsync'] else 'NORMAL'}")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            with self._conn:
+                self._migrate()
+                self._conn.executescript(SCHEMA)
+                self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _migrate(self) -> None:
+        """Обновить схему базы старой версии (вызывать под _lock до SCHEMA)"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == 1:
+            # Версия 2: корзины статистики профиля (StatsStore) в формате секции BCKT
+            self._conn.execute("ALTER TABLE profiles ADD COLUMN stats_buckets BLOB")
+        if 1 <= version <= 2:
+            # Версия 3: изменения мира последней сессии в формате секции WRLD
+            self._conn.execute("ALTER TABLE profiles ADD COLUMN world_deltas BLOB")
+
+    def close(self) -> None:
+        """Закрыть соединение"""
+        with self._lock:
+            self._conn.close()
+
+    def _profile_id(self, name: Optional[str] = None, create: bool = True) -> Optional[int]:
+        """Идентификатор профиля (создается при необходимости, вызывать под _lock)"""
+        name = name or self.profile
+        row = self._conn.execute("SELECT id FROM profiles WHERE name = ?", (name,)).fetchone()
+        if row is not None:
+            return row['id']
+        if not create:
+            return None
+        # Другой процесс мог создать профиль после SELECT
+        self._conn.execute("INSERT OR IGNORE INTO profiles (name) VALUES (?)", (name,))
+        return self._conn.execute("SELECT id FROM profiles WHERE name = ?", (name,)).fetchone()['id']
+
+    def has_profile(self, name: Optional[str] = None) -> bool:
+        """Есть ли сохраненный профиль"""
+        with self._lock:
+            return self._profile_id(name, create=False) is not None
+
+    def profiles(self) -> List[str]:
+        """Имена всех профилей"""
+        with self._lock:
+            return [row['name'] for row in self._conn.execute("SELECT name FROM profiles ORDER BY name")]
+
+    def save(self, data: Dict[str, Any], sessions: Iterable[Dict[str, Any]] = (),
+             replace_history: bool = False,
+             deltas: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """
+        Сохранить профиль одной транзакцией
+
+        Args:
+            data: Словарь снимка (как в GameState._snapshot_data)
+            sessions: Новые записи истории сессий с прошлого сохранения
+            replace_history: Заменить сессии и достижения профиля (после сброса или импорта)
+            deltas: Приращения счетчиков с прошлого сохранения. Если заданы,
+                    счетчики увеличиваются, а не перезаписываются, и сохранения
+                    нескольких процессов складываются
+
+        Returns:
+            Счетчики профиля после записи
+        """
+        if deltas is None or replace_history:
+            counters = ', '.join(f"{column} = ?" for column in PROFILE_STATS)
+            counter_values = [data.get(column, 0) for column in PROFILE_STATS]
+        else:
+            counters = ', '.join(f"{column} = {column} + ?" for column in PROFILE_STATS)
+            counter_values = [deltas.get(column, 0) for column in PROFILE_STATS]
+        meta = ', '.join(f"{column} = ?" for column in PROFILE_META)
+        buckets = encode_buckets(data['stats_buckets']) if data.get('stats_buckets') else None
+        world = encode_world(data['world_deltas']) if data.get('world_deltas') else None
+        now = time.time()
+
+        with self._lock, self._conn:
+            profile_id = self._profile_id()
+            if replace_history:
+                self._conn.execute("DELETE FROM sessions WHERE profile_id = ?", (profile_id,))
+                self._conn.execute("DELETE FROM achievements WHERE profile_id = ?", (profile_id,))
+            # Корзины и мир пишутся целиком: при одновременной игре остаются последние
+            self._conn.execute(f"UPDATE profiles SET {counters}, {meta}, stats_buckets = ?, world_deltas = ? "
+                               "WHERE id = ?",
+                               counter_values + [data.get(column) for column in PROFILE_META]
+                               + [buckets, world, profile_id])
+            self._conn.executemany(
+                f"INSERT INTO sessions (profile_id, {', '.join(SESSION_FIELDS)}) VALUES (?, {', '.join('?' * len(SESSION_FIELDS))})",
+                [[profile_id] + [record.get(field, 0) for field in SESSION_FIELDS] for record in sessions])
+            # Время открытия уже записанного достижения не меняется
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO achievements (profile_id, name, unlocked_at) VALUES (?, ?, ?)",
+                [(profile_id, name, now) for name, unlocked in data.get('achievements', {}).items() if unlocked])
+            row = self._conn.execute(f"SELECT {', '.join(PROFILE_STATS)} FROM profiles WHERE id = ?",
+                                     (profile_id,)).fetchone()
+            return dict(row)
+
+    def load(self, history_limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Загрузить профиль
+
+        Args:
+            history_limit: Сколько последних сессий вернуть в session_history
+
+        Returns:
+            Словарь снимка или None, если профиля нет
+        """
+        history_limit = SAVES['history_limit'] if history_limit is None else history_limit
+
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM profiles WHERE name = ?", (self.profile,)).fetchone()
+            if row is None:
+                return None
+
+            data = {column: row[column] for column in PROFILE_STATS + PROFILE_META}
+            if row['stats_buckets'] is not None:
+                data['stats_buckets'] = decode_buckets(row['stats_buckets'])
+            if row['world_deltas'] is not None:
+                data['world_deltas'] = decode_world(row['world_deltas'])
+            data['achievements'] = {r['name']: True for r in self._conn.execute(
+                "SELECT name FROM achievements WHERE profile_id = ?", (row['id'],))}
+
+            history = self._conn.execute(
+                f"SELECT {', '.join(SESSION_FIELDS)} FROM sessions WHERE profile_id = ? "
+                "ORDER BY started DESC LIMIT ?", (row['id'], history_limit)).fetchall()
+            data['session_history'] = [dict(record) for record in reversed(history)]
+            return data
+
+    def delete_profile(self, name: Optional[str] = None) -> None:
+        """Удалить профиль вместе с сессиями и достижениями"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM profiles WHERE name = ?", (name or self.profile,))
+
+    def top_scores(self, seed: Optional[int] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Лучшие сессии (все или по одному seed)
+
+        Args:
+            seed: Seed файловой системы (None - по всем)
+            limit: Количество записей
+
+        Returns:
+            Список {'name', 'seed', 'score', 'minutes', 'started'} по убыванию очков
+        """
+        query = ("SELECT p.name, s.seed, s.score, s.minutes, s.started "
+                 "FROM sessions AS s JOIN profiles AS p ON p.id = s.profile_id ")
+        if seed is None:
+            query += "ORDER BY s.score DESC LIMIT ?"
+            params = (limit,)
+        else:
+            query += "WHERE s.seed = ? ORDER BY s.score DESC LIMIT ?"
+            params = (seed, limit)
+
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, params)]
+
+    def leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Рейтинг игроков по общему счету
+
+        Returns:
+            Список {'name', 'total_score', 'sessions_played'}
+        """
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(
+                "SELECT name, total_score, sessions_played FROM profiles "
+                "ORDER BY total_score DESC LIMIT ?", (limit,))]
+
+    def player_trend(self, name: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Последние сессии игрока в хронологическом порядке
+
+        Args:
+            name: Имя профиля (по умолчанию текущий)
+            limit: Количество сессий
+
+        Returns:
+            Список записей сессий (старые первыми)
+        """
+        with self._lock:
+            profile_id = self._profile_id(name, create=False)
+            if profile_id is None:
+                return []
+            rows = self._conn.execute(
+                f"SELECT {', '.join(SESSION_FIELDS)} FROM sessions WHERE profile_id = ? "
+                "ORDER BY started DESC LIMIT ?", (profile_id, limit)).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+
+# Тестирование класса (если файл запущен напрямую)
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    print("Тестирование SQLiteStore...")
+
+    path = os.path.join(tempfile.mkdtemp(), 'voider.db')
+    store = SQLiteStore(path, profile='prunt')
+    print(f"  {'✓' if not store.has_profile() else '✗'} Новая база пуста")
+
+    store.save({'total_score': 150, 'sessions_played': 1, 'achievements': {'first_decryption': True}},
+               [{'seed': 42, 'started': time.time(), 'minutes': 3.5, 'score': 150,
+                 'decrypted': 2, 'files': 4, 'commands': 30}])
+    loaded = store.load()
+    print(f"  {'✓' if loaded['total_score'] == 150 and len(loaded['session_history']) == 1 else '✗'} "
+          f"Профиль загружен: {loaded['total_score']} очков, достижения {list(loaded['achievements'])}")
+
+    # Сотни тысяч сессий от нескольких игроков
+    rng = random.Random(7)
+    sessions_total = 200000
+    players = [f'player{i}' for i in range(20)]
+    start = time.perf_counter()
+    for name in players:
+        other = SQLiteStore(path, profile=name)
+        other.save({'total_score': rng.randint(0, 10 ** 6)},
+                   [{'seed': rng.randint(0, 500), 'started': 1700000000.0 + i, 'minutes': rng.random() * 30,
+                     'score': rng.randint(0, 5000), 'decrypted': 1, 'files': 2, 'commands': 10}
+                    for i in range(sessions_total // len(players))])
+        other.close()
+    print(f"  Записано {sessions_total} сессий за {time.perf_counter() - start:.2f} с")
+
+    for title, query in (("Рекорды seed 42", lambda: store.top_scores(seed=42)),
+                         ("Рекорды всех сессий", lambda: store.top_scores()),
+                         ("Рейтинг игроков", lambda: store.leaderboard()),
+                         ("Динамика игрока", lambda: store.player_trend('player3'))):
+        start = time.perf_counter()
+        rows = query()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"  {'✓' if rows and elapsed < 50 else '✗'} {title}: {len(rows)} записей за {elapsed:.2f} мс")
+
+    store.close()
+    print("\nТестирование завершено!")
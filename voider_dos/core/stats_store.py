@@ -0,0 +1,233 @@
+"""
+Класс StatsStore: счетчики статистики с поминутными и посуточными корзинами
+
+Каждый известный счетчик занимает фиксированный слот (индекс в списке),
+поэтому обновление не ищет атрибут по имени. Кроме итогов, каждое
+изменение попадает в две кольцевые очереди корзин: по минутам и по
+суткам. Скорость ("расшифровок в минуту") и скользящие окна ("очки за
+неделю") считаются за O(числа корзин), без просмотра истории сессий.
+"""
+
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Union
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import STATS
+
+# Слоты счетчиков: порядок фиксирован, в сохранении слоты хранятся по именам
+STAT_SLOTS = ('score', 'total_score', 'sessions_played', 'play_time', 'directories_decrypted',
+              'files_opened', 'easter_eggs_found', 'special_dirs_found')
+SLOT_INDEX = {name: index for index, name in enumerate(STAT_SLOTS)}
+
+MINUTE = 60
+DAY = 86400
+
+Slot = Union[int, str]
+
+
+class _Ring:
+    """Кольцо корзин одной длительности: корзина i хранит период stamps[i]"""
+
+    __slots__ = ('period', 'size', 'stamps', 'values')
+
+    def __init__(self, period: int, size: int):
+        self.period = period
+        self.size = size
+        self.stamps = [-1] * size
+        self.values = [[0] * len(STAT_SLOTS) for _ in range(size)]
+
+    def add(self, slot: int, value: float, now: float) -> None:
+        stamp = int(now // self.period)
+        index = stamp % self.size
+        if self.stamps[index] != stamp:
+            # Корзина осталась от прошлого оборота кольца - начинаем заново
+            self.stamps[index] = stamp
+            self.values[index] = [0] * len(STAT_SLOTS)
+        self.values[index][slot] += value
+
+    def window(self, slot: int, periods: int, now: float) -> float:
+        current = int(now // self.period)
+        oldest = current - min(periods, self.size) + 1
+        return sum(values[slot] for stamp, values in zip(self.stamps, self.values)
+                   if oldest <= stamp <= current)
+
+    def export(self) -> List[List[Any]]:
+        return [[stamp, list(values)] for stamp, values in zip(self.stamps, self.values) if stamp >= 0]
+
+    def load(self, buckets: List[List[Any]], slots: List[str]) -> None:
+        self.stamps = [-1] * self.size
+        self.values = [[0] * len(STAT_SLOTS) for _ in range(self.size)]
+        mapping = [(SLOT_INDEX[name], position) for position, name in enumerate(slots) if name in SLOT_INDEX]
+        for stamp, values in buckets:
+            index = stamp % self.size
+            if stamp > self.stamps[index]:
+                self.stamps[index] = stamp
+                self.values[index] = [0] * len(STAT_SLOTS)
+                for slot, position in mapping:
+                    # В двоичном сохранении значения float: целые возвращаем в int
+                    value = values[position]
+                    self.values[index][slot] = int(value) if float(value).is_integer() else value
+
+
+class StatsStore:
+    """Итоги счетчиков и кольцевые корзины по минутам и суткам"""
+
+    def __init__(self, minute_buckets: Optional[int] = None, day_buckets: Optional[int] = None):
+        """
+        Args:
+            minute_buckets: Сколько последних минут хранить (по умолчанию STATS)
+            day_buckets: Сколько последних суток хранить (по умолчанию STATS)
+        """
+        self.totals: List[float] = [0] * len(STAT_SLOTS)
+        self.minutes = _Ring(MINUTE, minute_buckets or STATS['minute_buckets'])
+        self.days = _Ring(DAY, day_buckets or STATS['day_buckets'])
+
+    @staticmethod
+    def slot(name: Slot) -> int:
+        """Индекс слота по имени счетчика"""
+        return name if isinstance(name, int) else SLOT_INDEX[name]
+
+    def add(self, name: Slot, value: float = 1, now: Optional[float] = None) -> float:
+        """
+        Увеличить счетчик
+
+        Args:
+            name: Имя счетчика или индекс слота
+            value: Приращение
+            now: Время изменения (unix time, по умолчанию текущее)
+
+        Returns:
+            Новое итоговое значение
+        """
+        slot = self.slot(name)
+        self.record(slot, value, now)
+        self.totals[slot] += value
+        return self.totals[slot]
+
+    def record(self, name: Slot, value: float = 1, now: Optional[float] = None) -> None:
+        """
+        Учесть изменение только в корзинах, не меняя итог
+
+        Нужно, когда итог уже известен из другого источника (например,
+        из заголовка сохранения), а корзины восстанавливаются отдельно.
+
+        Args:
+            name: Имя счетчика или индекс слота
+            value: Приращение
+            now: Время изменения (unix time, по умолчанию текущее)
+        """
+        slot = self.slot(name)
+        now = time.time() if now is None else now
+        self.minutes.add(slot, value, now)
+        self.days.add(slot, value, now)
+
+    def total(self, name: Slot) -> float:
+        """Итоговое значение счетчика"""
+        return self.totals[self.slot(name)]
+
+    def window(self, name: Slot, minutes: int = 0, days: int = 0, now: Optional[float] = None) -> float:
+        """
+        Сумма изменений счетчика за последние minutes минут или days суток
+
+        Текущая минута (сутки) входит в окно. Окно длиннее кольца
+        ограничивается его размером.
+
+        Args:
+            name: Имя счетчика или индекс слота
+            minutes: Длина окна в минутах
+            days: Длина окна в сутках (если minutes не задан)
+            now: Момент отсчета (по умолчанию текущее время)
+
+        Returns:
+            Сумма за окно
+        """
+        slot = self.slot(name)
+        now = time.time() if now is None else now
+        if minutes:
+            return self.minutes.window(slot, minutes, now)
+        return self.days.window(slot, days or 1, now)
+
+    def rate_per_minute(self, name: Slot, minutes: int = 60, now: Optional[float] = None) -> float:
+        """Среднее изменение счетчика в минуту за последние minutes минут"""
+        minutes = min(minutes, self.minutes.size)
+        return self.window(name, minutes=minutes, now=now) / minutes
+
+    def clear_buckets(self) -> None:
+        """Очистить корзины (итоги не меняются)"""
+        self.minutes.load([], [])
+        self.days.load([], [])
+
+    def export_buckets(self) -> Dict[str, Any]:
+        """
+        Корзины для сохранения (только заполненные)
+
+        Returns:
+            Словарь {'slots', 'minute', 'day'}; корзина - [номер периода, значения слотов]
+        """
+        return {'slots': list(STAT_SLOTS), 'minute': self.minutes.export(), 'day': self.days.export()}
+
+    def import_buckets(self, data: Optional[Dict[str, Any]]) -> None:
+        """
+        Загрузить корзины из сохранения (неизвестные слоты пропускаются)
+
+        Args:
+            data: Результат export_buckets или None
+        """
+        data = data or {}
+        slots = data.get('slots', [])
+        self.minutes.load(data.get('minute', []), slots)
+        self.days.load(data.get('day', []), slots)
+
+
+class StatField:
+    """Атрибут класса, хранящий значение в слоте StatsStore объекта (obj.stats)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.slot = SLOT_INDEX[name]
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj.stats.totals[self.slot]
+
+    def __set__(self, obj, value) -> None:
+        obj.stats.totals[self.slot] = value
+
+
+# Тестирование класса (если файл запущен напрямую)
+if __name__ == "__main__":
+    print("Тестирование StatsStore...")
+
+    store = StatsStore(minute_buckets=60, day_buckets=7)
+    start = 1700000000.0
+
+    # 3 часа игры: расшифровка каждые 2 минуты, 50 очков каждую минуту
+    for minute in range(180):
+        now = start + minute * MINUTE
+        store.add('total_score', 50, now)
+        if minute % 2 == 0:
+            store.add('directories_decrypted', 1, now)
+
+    now = start + 179 * MINUTE
+    rate = store.rate_per_minute('directories_decrypted', 60, now)
+    print(f"  {'✓' if abs(rate - 0.5) < 0.01 else '✗'} Расшифровок в минуту за час: {rate:.2f}")
+    print(f"  {'✓' if store.window('total_score', minutes=10, now=now) == 500 else '✗'} Очков за 10 минут: "
+          f"{store.window('total_score', minutes=10, now=now)}")
+    print(f"  {'✓' if store.total('total_score') == 9000 else '✗'} Всего очков: {store.total('total_score')}")
+
+    # Через 10 дней старые сутки выпадают из недельного окна
+    later = start + 10 * DAY
+    store.add('total_score', 70, later)
+    week = store.window('total_score', days=7, now=later)
+    print(f"  {'✓' if week == 70 else '✗'} Очков за неделю спустя 10 дней: {week}")
+
+    restored = StatsStore(minute_buckets=60, day_buckets=7)
+    restored.import_buckets(store.export_buckets())
+    same = restored.window('total_score', days=7, now=later) == week
+    print(f"  {'✓' if same else '✗'} Корзины восстановлены из сохранения")
+
+    print("\nТестирование завершено!")
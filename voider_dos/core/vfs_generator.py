@@ -2,20 +2,25 @@
 Класс VirtualFileSystem: процедурная генерация файловой системы
 """
 
+import os
 import random
 import time
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Tuple
+from typing import Callable, Iterable, List, Dict, Optional, Any, Tuple
 import sys
 
 # Добавляем путь для импорта config.py из корня проекта
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from config import GENERATION, CIPHERS, FILE_TYPES, DEFAULT_DATA
-from .cipher_system import CipherSystem
+from .cipher_system import CipherSystem, CipherRecord
+from .cipher_solver import solve_chain, describe_chain
+from voider_dos.utils.log import get_logger
+
+logger = get_logger('vfs')
 
 # Для случая, если cipher_system.py еще не создан
 try:
-    from .cipher_system import CipherSystem
+    from .cipher_system import CipherSystem, CipherRecord
 except ImportError:
     # Заглушка для тестирования
     class CipherSystem:
@@ -26,7 +31,7 @@ except ImportError:
             return text
         
         @staticmethod
-        def get_random_cipher():
+        def get_random_cipher(depth=None):
             return 'hex'
 
 
@@ -72,14 +77,40 @@ class DirNode:
     children: List[Any] = field(default_factory=list)
     parent: Optional['DirNode'] = None
     encrypted: bool = False
-    cipher_type: Optional[str] = None
-    cipher_text: Optional[str] = None
-    original_name: Optional[str] = None
+    cipher: Optional[CipherRecord] = None  # Шифр имени (тип и сдвиг)
     is_special: bool = False
     is_hidden: bool = False
     score_value: int = 50
     decoded: bool = False
     
+    @property
+    def cipher_type(self) -> Optional[str]:
+        """Тип шифра имени директории"""
+        return self.cipher.cipher_type if self.cipher else None
+    
+    @property
+    def cipher_text(self) -> Optional[str]:
+        """Зашифрованное имя (строится по требованию)"""
+        return self.cipher.render(self.name) if self.cipher else None
+    
+    @property
+    def original_name(self) -> Optional[str]:
+        """Оригинальное имя зашифрованной директории"""
+        return self.name if self.cipher else None
+    
+    @property
+    def display_name(self) -> str:
+        """Имя для отображения: зашифрованное, пока директория не расшифрована"""
+        if self.encrypted and self.cipher:
+            return self.cipher.render(self.name)
+        return self.name
+    
+    def get_full_path(self) -> str:
+        """Путь для отображения (имена зашифрованных директорий строятся по требованию)"""
+        if self.parent is None:
+            return self.path
+        return f"{self.parent.get_full_path()}{self.display_name}\\"
+    
     def get_child_count(self) -> Tuple[int, int]:
         """Получить количество файлов и директорий в текущей директории"""
         dirs = files = 0
@@ -101,10 +132,8 @@ class DirNode:
                 continue
             
             if isinstance(child, DirNode):
-                # Для директорий проверяем имя или зашифрованное имя
-                if child.name.lower() == name_lower:
-                    return child
-                if child.encrypted and child.cipher_text and child.cipher_text.lower() == name_lower:
+                # Для директорий проверяем отображаемое (возможно, зашифрованное) имя
+                if child.display_name.lower() == name_lower:
                     return child
             else:
                 # Для файлов проверяем полное имя
@@ -144,12 +173,19 @@ class VirtualFileSystem:
             'special_items': 0
         }
         
+        # Вызывается с ключом (node_key) каждой расшифрованной директории
+        self.on_decoded: Optional[Callable[[str], None]] = None
+        
+        # Растет при каждой смене отображаемых имен (расшифровка и обратно):
+        # по нему кэши имен директорий (автодополнение) понимают, что устарели
+        self.version = 0
+        
         # Генерация структуры
         self._generate_structure()
         
-        print(f"[DEBUG] VFS сгенерирована. Seed: {self.seed}")
-        print(f"[DEBUG] Директорий: {self.generation_stats['total_dirs']}, "
-              f"Файлов: {self.generation_stats['total_files']}")
+        logger.debug("VFS сгенерирована. Seed: %s", self.seed)
+        logger.debug("Директорий: %s, Файлов: %s",
+                     self.generation_stats['total_dirs'], self.generation_stats['total_files'])
     
     def _generate_structure(self) -> None:
         """Генерация полной структуры файловой системы"""
@@ -230,10 +266,10 @@ class VirtualFileSystem:
                 name += str(random.randint(1, 99))
         else:
             # Генерируем "техническое" имя
-            prefixes = ["DIR", "FOLDER", "CAT", "MOD", "SEC", "DATA"]
+            prefixes = DEFAULT_DATA['directory_prefixes']
             suffixes = ["", "_" + str(random.randint(1, 999)), 
                        "_V" + str(random.randint(1, 9)),
-                       "_" + random.choice(["ALPHA", "BETA", "RC", "FINAL"])]
+                       "_" + random.choice(DEFAULT_DATA['directory_suffixes'])]
             name = random.choice(prefixes) + random.choice(suffixes)
         
         # Создаем путь
@@ -251,30 +287,30 @@ class VirtualFileSystem:
         
         # Шифруем директорию с определенной вероятностью
         if random.random() < GENERATION['encryption_chance']:
-            self._encrypt_directory(dir_node)
+            self._encrypt_directory(dir_node, depth)
             self.generation_stats['encrypted_dirs'] += 1
         
         return dir_node
     
-    def _encrypt_directory(self, dir_node: DirNode) -> None:
-        """Зашифровать директорию"""
-        # Сохраняем оригинальное имя
-        dir_node.original_name = dir_node.name
-        
-        # Выбираем случайный тип шифра
-        cipher_type = CipherSystem.get_random_cipher()
-        dir_node.cipher_type = cipher_type
-        
-        # Шифруем имя
-        dir_node.cipher_text = CipherSystem.encrypt(dir_node.name, cipher_type)
-        
-        # Меняем отображаемое имя на зашифрованное
-        dir_node.name = dir_node.cipher_text
+    def _encrypt_directory(self, dir_node: DirNode, depth: int = 0) -> None:
+        """
+        Зашифровать директорию
+        
+        Чем глубже директория, тем больше слоев в цепочке шифров
+        (один слой на каждые CIPHERS['chain']['depth_step'] уровней).
+        """
+        chain_config = CIPHERS['chain']
+        layers = min(chain_config['max_layers'], 1 + depth // chain_config['depth_step'])
+        
+        if layers == 1:
+            # Ключ (сдвиг для Caesar) выбирается сейчас и сохраняется в записи,
+            # сам зашифрованный текст строится при первом обращении
+            cipher_type = CipherSystem.get_random_cipher(depth)
+            shift = CipherSystem.random_key(cipher_type)
+            dir_node.cipher = CipherRecord(cipher_type, shift)
+        else:
+            dir_node.cipher = CipherSystem.create_chain(dir_node.name, layers, depth)
         dir_node.encrypted = True
-        
-        # Обновляем путь
-        if dir_node.parent:
-            dir_node.path = f"{dir_node.parent.path}{dir_node.name}\\"
     
     def _add_files_to_dir(self, dir_node: DirNode, is_system: bool = False) -> None:
         """Добавить файлы в директорию"""
@@ -345,8 +381,9 @@ class VirtualFileSystem:
         # Выбираем случайный шаблон
         template = random.choice(file_type_config['templates'])
         
-        # Заменяем плейсхолдеры
+        # Заменяем плейсхолдеры ({content} - одна из строк content_variants)
         content = template.format(
+            content=random.choice(file_type_config['content_variants']),
             filename=filename + extension,
             date=self._generate_timestamp(),
             version=f"{random.randint(1, 9)}.{random.randint(0, 9)}",
@@ -403,7 +440,7 @@ class VirtualFileSystem:
                     continue
                 
                 prefix = "[E] " if child.encrypted else "[S] " if child.is_special else "<DIR> "
-                dirs.append(f"{prefix}   {child.name}")
+                dirs.append(f"{prefix}   {child.display_name}")
             else:
                 file_info = child.display_info(show_hidden)
                 if file_info:
@@ -472,34 +509,164 @@ class VirtualFileSystem:
                     # Проверяем расшифровку
                     if self._check_decryption(attempt, child):
                         # Расшифровка успешна
-                        child.decoded = True
-                        child.encrypted = False
-                        child.name = child.original_name or attempt
-                        
-                        # Обновляем путь
-                        if child.parent:
-                            child.path = f"{child.parent.path}{child.name}\\"
-                        
-                        # Обновляем статистику
-                        self.generation_stats['encrypted_dirs'] -= 1
-                        
+                        self._mark_decoded(child, attempt)
                         return True, child, f"Директория расшифрована: {child.name}"
                     else:
                         return False, None, "Неверная расшифровка. Попробуйте еще раз."
         
         return False, None, f"Зашифрованная директория '{cipher_text}' не найдена"
     
-    def _check_decryption(self, attempt: str, dir_node: DirNode) -> bool:
-        """Проверить правильность расшифровки"""
-        if dir_node.original_name:
-            return attempt.lower() == dir_node.original_name.lower()
+    def auto_decode_directory(self, cipher_text: str) -> Tuple[bool, Optional[DirNode], str]:
+        """
+        Попытаться расшифровать директорию без указания шифра (decode auto)
+        
+        Цепочка слоев подбирается решателем cipher_solver, каждый вариант
+        открытого текста сверяется с именем директории.
+        
+        Args:
+            cipher_text: Зашифрованное имя директории
+            
+        Returns:
+            Кортеж (успех, директория, сообщение)
+        """
+        dir_node = self._find_encrypted_child(cipher_text)
+        if dir_node is None:
+            return False, None, f"Зашифрованная директория '{cipher_text}' не найдена"
+        
+        result = solve_chain(dir_node.cipher_text,
+                             is_goal=lambda attempt: self._check_decryption(attempt, dir_node))
+        if result is None:
+            return False, None, "Не удалось определить шифр автоматически."
+        
+        self._mark_decoded(dir_node, result['text'])
+        return True, dir_node, f"Директория расшифрована ({describe_chain(result['chain'])}): {dir_node.name}"
+    
+    def hint_directory(self, cipher_text: str) -> Tuple[bool, str]:
+        """
+        Подсказка: какими шифрами и в каком порядке зашифрована директория
         
-        # Если оригинальное имя не сохранено, пытаемся расшифровать
+        Открытое имя и ключи не раскрываются, показывается только цепочка слоев.
+        
+        Args:
+            cipher_text: Зашифрованное имя директории
+            
+        Returns:
+            Кортеж (успех, сообщение)
+        """
+        dir_node = self._find_encrypted_child(cipher_text)
+        if dir_node is None:
+            return False, f"Зашифрованная директория '{cipher_text}' не найдена"
+        
+        # Снимать слои нужно в обратном порядке
+        layers = [(name, None) for name in reversed(dir_node.cipher.cipher_types)]
+        return True, f"Слоев: {len(layers)}. Расшифровывайте по порядку: {describe_chain(layers)}"
+    
+    def _find_encrypted_child(self, cipher_text: str) -> Optional[DirNode]:
+        """Найти зашифрованную директорию в текущей директории по шифру имени"""
+        for child in self.current_dir.children:
+            if isinstance(child, DirNode) and child.encrypted and not child.decoded:
+                if child.cipher_text.lower() == cipher_text.lower():
+                    return child
+        return None
+    
+    def _mark_decoded(self, dir_node: DirNode, attempt: str) -> None:
+        """Отметить директорию как расшифрованную"""
+        dir_node.decoded = True
+        dir_node.encrypted = False
+        if not dir_node.cipher:
+            dir_node.name = attempt
+        
+        # Обновляем путь
+        if dir_node.parent:
+            dir_node.path = f"{dir_node.parent.path}{dir_node.name}\\"
+        
+        # Обновляем статистику
+        self.generation_stats['encrypted_dirs'] -= 1
+        self.version += 1
+        
+        if self.on_decoded is not None:
+            self.on_decoded(self.node_key(dir_node))
+    
+    def node_key(self, dir_node: DirNode) -> str:
+        """
+        Ключ директории, не зависящий от имен: индексы в списках children от корня
+        
+        Генерация по seed детерминирована, поэтому ключ указывает на ту же
+        директорию в мире, заново построенном из того же seed.
+        
+        Args:
+            dir_node: Директория
+            
+        Returns:
+            Индексы через '/' (например, '3/0/2')
+        """
+        indices = []
+        while dir_node.parent is not None:
+            # Сравнение по идентичности: == у dataclass сравнивает поддеревья целиком
+            index = next(i for i, child in enumerate(dir_node.parent.children) if child is dir_node)
+            indices.append(str(index))
+            dir_node = dir_node.parent
+        return '/'.join(reversed(indices))
+    
+    def find_by_key(self, key: str) -> Optional[DirNode]:
+        """Директория по ключу node_key (None, если такой нет)"""
+        node = self.root
+        for index in key.split('/') if key else []:
+            children = node.children if isinstance(node, DirNode) else []
+            if not index.isdigit() or int(index) >= len(children):
+                return None
+            node = children[int(index)]
+        return node if isinstance(node, DirNode) else None
+    
+    def apply_decoded(self, keys: Iterable[str]) -> int:
+        """
+        Повторить расшифровки сохраненной сессии (без вызова on_decoded)
+        
+        Args:
+            keys: Ключи директорий (node_key)
+            
+        Returns:
+            Количество восстановленных директорий
+        """
+        callback, self.on_decoded = self.on_decoded, None
+        restored = 0
         try:
-            decrypted = CipherSystem.decrypt(dir_node.cipher_text, dir_node.cipher_type)
-            return attempt.lower() == decrypted.lower()
-        except:
+            for key in keys:
+                node = self.find_by_key(key)
+                if node is not None and node.encrypted and not node.decoded:
+                    self._mark_decoded(node, node.name)
+                    restored += 1
+        finally:
+            self.on_decoded = callback
+        return restored
+    
+    def apply_encrypted(self, keys: Iterable[str]) -> int:
+        """
+        Вернуть шифрование расшифрованным директориям (быстрая загрузка)
+        
+        Args:
+            keys: Ключи директорий (node_key)
+            
+        Returns:
+            Количество снова зашифрованных директорий
+        """
+        restored = 0
+        for key in keys:
+            node = self.find_by_key(key)
+            if node is not None and node.decoded and node.cipher:
+                node.decoded = False
+                node.encrypted = True
+                self.generation_stats['encrypted_dirs'] += 1
+                self.version += 1
+                restored += 1
+        return restored
+    
+    def _check_decryption(self, attempt: str, dir_node: DirNode) -> bool:
+        """Проверить правильность расшифровки"""
+        # Запись шифра хранится вместе с открытым именем, расшифровывать не нужно
+        if dir_node.original_name is None:
             return False
+        return attempt.lower() == dir_node.original_name.lower()
     
     def find_item(self, search_term: str, search_type: str = "any") -> List[Dict[str, Any]]:
         """Поиск файлов и директорий по имени"""
@@ -508,7 +675,9 @@ class VirtualFileSystem:
         
         def search_recursive(node: DirNode, path: str):
             for child in node.children:
-                current_path = f"{path}{child.name}{'\\' if isinstance(child, DirNode) else ''}"
+                separator = '\\' if isinstance(child, DirNode) else ''
+                display_name = child.display_name if isinstance(child, DirNode) else child.name
+                current_path = f"{path}{display_name}{separator}"
                 
                 # Проверяем соответствие типу поиска
                 if search_type == "dir" and not isinstance(child, DirNode):
@@ -518,7 +687,7 @@ class VirtualFileSystem:
                 
                 # Проверяем имя
                 if isinstance(child, DirNode):
-                    name_to_check = child.original_name if child.encrypted else child.name
+                    name_to_check = child.name
                 else:
                     name_to_check = child.get_full_name()
                 
@@ -573,8 +742,9 @@ if __name__ == "__main__":
     if vfs.root.children:
         first_dir = vfs.root.children[0]
         if isinstance(first_dir, DirNode):
-            success, message = vfs.change_directory(first_dir.name)
+            success, message = vfs.change_directory(first_dir.display_name)
             print(f"\n{message}")
+            print(f"Путь узла: {first_dir.get_full_path()}")
             
             # Показываем содержимое новой директории
             print("Содержимое:")
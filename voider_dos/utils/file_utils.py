@@ -0,0 +1,191 @@
+"""
+Утилиты для работы с файлами: атомарная запись, дозапись с fsync, жесткие
+ссылки и блокировки между процессами
+"""
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: advisory-блокировок flock нет
+    fcntl = None
+
+
+def atomic_write(path: str, data: Union[str, bytes], fsync: bool = True) -> None:
+    """
+    Атомарно записать файл: временный файл в той же директории,
+    fsync и os.replace поверх старого
+
+    При сбое во время записи на диске остается либо старый, либо новый
+    файл целиком, но никогда не обрезанный.
+
+    Args:
+        path: Путь к файлу
+        data: Содержимое (строка записывается в UTF-8)
+        fsync: Сбрасывать ли данные на диск перед заменой
+    """
+    temp_path = prepare_write(path, data, fsync)
+    try:
+        os.replace(temp_path, path)
+    except BaseException:
+        discard_write(temp_path)
+        raise
+
+    if fsync:
+        fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def prepare_write(path: str, data: Union[str, bytes], fsync: bool = True) -> str:
+    """
+    Первая половина atomic_write: записать данные во временный файл рядом с path
+
+    Позволяет подготовить файл заранее, а под блокировкой сделать только
+    os.replace(temp_path, path).
+
+    Args:
+        path: Путь к итоговому файлу
+        data: Содержимое (строка записывается в UTF-8)
+        fsync: Сбрасывать ли данные на диск
+
+    Returns:
+        Путь к временному файлу
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        discard_write(temp_path)
+        raise
+    return temp_path
+
+
+def discard_write(temp_path: str) -> None:
+    """Удалить временный файл prepare_write, который не понадобился"""
+    try:
+        os.remove(temp_path)
+    except OSError:
+        pass
+
+
+def append_line(path: str, line: str, fsync: bool = True) -> None:
+    """
+    Дописать строку в конец файла (одна запись O_APPEND)
+
+    Args:
+        path: Путь к файлу
+        line: Строка без перевода строки
+        fsync: Сбрасывать ли данные на диск
+    """
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(line + '\n')
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def fsync_file(path: str) -> None:
+    """Сбросить на диск уже записанные данные файла (например, после снятия блокировки)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def file_stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Отпечаток файла: (inode, время изменения в нс, размер) или None, если файла нет
+
+    Замена файла через os.replace меняет inode, поэтому по отпечатку видно,
+    что файл переписал другой процесс.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+@contextmanager
+def file_lock(path: str, shared: bool = False) -> Iterator[None]:
+    """
+    Advisory-блокировка между процессами (fcntl.flock) на файле path
+
+    Каждый вызов открывает файл заново, поэтому блокировки разных потоков
+    одного процесса тоже исключают друг друга. Закрытие файла снимает
+    блокировку, даже если процесс упал. На платформах без fcntl (Windows)
+    блокировка не выполняется.
+
+    Args:
+        path: Файл блокировки (создается при необходимости)
+        shared: Разделяемая блокировка (чтение) вместо исключительной (запись)
+    """
+    if fcntl is None:
+        yield
+        return
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def link_or_copy(source: str, destination: str) -> None:
+    """
+    Поставить на место destination жесткую ссылку на source (копию, если
+    файловая система не поддерживает ссылки)
+
+    Существующий destination заменяется атомарно.
+
+    Args:
+        source: Исходный файл
+        destination: Путь результата
+    """
+    temp_path = destination + '.tmp'
+    try:
+        os.remove(temp_path)
+    except FileNotFoundError:
+        pass
+
+    try:
+        os.link(source, temp_path)
+    except (OSError, AttributeError, NotImplementedError):
+        shutil.copy2(source, temp_path)
+    os.replace(temp_path, destination)
+
+
+def fsync_directory(directory: str) -> None:
+    """Сбросить на диск запись директории (переименование файла), где это поддерживается"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        # Windows не позволяет открыть директорию для fsync
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,170 @@
+"""
+Журналирование THE-VOIDER-DOS
+
+Все диагностические сообщения идут через logging в иерархию логгеров
+'voider.<подсистема>' (voider.state, voider.vfs, voider.session ...).
+Уровень задается в config.LOGGING; отключенные сообщения отсекаются
+проверкой уровня до форматирования, поэтому вызывать их нужно с
+ленивыми %-аргументами:
+
+    logger.debug("Начата новая сессия (Seed: %s)", seed)
+
+Запись в файл идет через QueueHandler/QueueListener в отдельном потоке,
+игровой цикл только кладет запись в очередь. Предупреждения и ошибки
+выводятся в stderr сразу.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Optional, Union
+
+# Добавляем путь для импорта config.py из корня проекта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import LOGGING
+
+ROOT_LOGGER = 'voider'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """
+    Логгер подсистемы
+
+    Args:
+        subsystem: Имя подсистемы ('state', 'vfs', 'session' ...)
+
+    Returns:
+        Логгер 'voider.<subsystem>'
+    """
+    return logging.getLogger(f'{ROOT_LOGGER}.{subsystem}')
+
+
+def _level(value: Union[str, int]) -> int:
+    """Уровень logging по имени ('DEBUG') или числу"""
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(value.upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Неизвестный уровень журналирования: {value}")
+    return level
+
+
+def setup_logging(level: Optional[Union[str, int]] = None, log_file: Optional[str] = None) -> None:
+    """
+    Настроить журналирование (повторный вызов перенастраивает)
+
+    Args:
+        level: Уровень вывода в консоль (по умолчанию LOGGING['level'])
+        log_file: Файл журнала (по умолчанию LOGGING['file'], None - без файла)
+    """
+    shutdown_logging()
+
+    console_level = _level(LOGGING['level'] if level is None else level)
+    log_file = LOGGING['file'] if log_file is None else log_file
+    formatter = logging.Formatter(LOGGING['format'])
+
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.propagate = False
+
+    console = logging.StreamHandler(sys.stderr)
+    console.setLevel(console_level)
+    console.setFormatter(formatter)
+    root.addHandler(console)
+    root_level = console_level
+
+    if log_file:
+        directory = os.path.dirname(log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_level = _level(LOGGING['file_level'])
+        file_handler.setLevel(file_level)
+        file_handler.setFormatter(formatter)
+
+        # Игровой поток только кладет запись в очередь, файл пишет поток слушателя
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(records)
+        queue_handler.setLevel(file_level)
+        root.addHandler(queue_handler)
+
+        global _listener
+        _listener = logging.handlers.QueueListener(records, file_handler, respect_handler_level=True)
+        _listener.start()
+        root_level = min(root_level, file_level)
+
+    # Уровень корневого логгера - самый подробный из обработчиков: все, что
+    # ниже, отсекается в logger.isEnabledFor без форматирования
+    root.setLevel(root_level)
+
+
+def set_console_level(level: Union[str, int]) -> None:
+    """
+    Изменить уровень вывода в консоль (например, командой debug)
+
+    Args:
+        level: Новый уровень
+    """
+    level = _level(level)
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in root.handlers:
+        if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+            handler.setLevel(level)
+    file_levels = [handler.level for handler in root.handlers
+                   if isinstance(handler, logging.handlers.QueueHandler)]
+    root.setLevel(min([level] + file_levels))
+
+
+def shutdown_logging() -> None:
+    """Остановить поток записи в файл, дописав очередь"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+# Тестирование модуля (если файл запущен напрямую)
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    print("Тестирование журналирования...")
+
+    path = os.path.join(tempfile.mkdtemp(), 'voider.log')
+    setup_logging(level='WARNING', log_file=path)
+    logger = get_logger('test')
+
+    logger.debug("Отладка в файл: %s", 42)
+    logger.warning("Предупреждение в консоль и файл")
+    shutdown_logging()
+
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    print(f"  {'✓' if len(lines) == 2 else '✗'} В файле {len(lines)} записи")
+
+    # Отключенный уровень: аргументы не форматируются
+    setup_logging(level='WARNING', log_file='')
+
+    class Expensive:
+        def __str__(self):
+            raise AssertionError("форматирование отключенного сообщения")
+
+    logger.debug("Не форматируется: %s", Expensive())
+    start = time.perf_counter()
+    for _ in range(100000):
+        logger.debug("Очки: %s", 10)
+    elapsed = time.perf_counter() - start
+    print(f"  ✓ 100000 отключенных debug за {elapsed * 1000:.1f} мс")
+
+    print("\nТестирование завершено!")